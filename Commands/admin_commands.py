@@ -6,19 +6,46 @@ Funktionen:
 - resetStatusCommand: Setzt den Status des Bots auf Streaming mit einer vordefinierten URL zurück.
 - setStatusCommand: Setzt den Status des Bots basierend auf Benutzereingaben.
 - setMoneyCommand: Setzt das Geld für einen angegebenen Benutzer.
+- dbStatsCommand: Zeigt die Latenzen der Datenbankabfragen an.
+- sessionsCommand: Zeigt die laufenden Spielsitzungen an.
+- exportCommand: Exportiert die Wirtschaftstabellen als CSV- oder JSON-Lines-Datei.
+- importCommand: Importiert eine exportierte Datei.
+- scaleMoneyCommand: Multipliziert alle Kontostände über einer Grenze mit einem Faktor.
+- capMoneyCommand: Begrenzt alle Kontostände auf eine Obergrenze.
+- roleBonusCommand: Schreibt allen Mitgliedern einer Rolle einen Betrag gut.
+- resetStreaksCommand: Setzt alle Daily-Streaks zurück.
 
 Importierte Module:
+- asyncio: Zeitlimit beim Warten auf Antworten.
 - logging: Protokollierung von Ereignissen.
+- gzip, io, tempfile: Komprimierte temporäre Dateien für Export und Import.
+- aiohttp: Herunterladen angehängter Dateien.
 - discord: Discord-Bibliothek für die Bot-Interaktion.
+- Database.economy_export: Export und Import der Wirtschaftstabellen.
 - Util.util_commands: Hilfsfunktionen und Variablen für den Bot.
 - Util.variables: Variablen für den Bot.
 """
 
+import asyncio
+import datetime
+import gzip
+import io
 import logging
-from discord import Interaction, Streaming, Activity, ActivityType, Status, Member, Embed, Colour
+import tempfile
+import aiohttp
+from discord import Interaction, Streaming, Activity, ActivityType, Status, Member, Embed, Colour, \
+    File, Role
 from discord.ext.commands import Context
+from Database.economy_export import FORMATS, export_economy, import_economy
 from Util.util_commands import db, check_admin, send_message, get_money_for_user, return_author
-from Util.variables import bot, streamURL
+from Util.variables import bot, game_sessions, interaction_router
+from config_loader import config
+
+EXPORT_CHUNK_SIZE = 500
+# Seconds set_status waits for each answer
+STATUS_ANSWER_TIMEOUT = 60
+# Upload limit of Discord outside of guilds in bytes
+DEFAULT_FILESIZE_LIMIT = 25 * 1024 * 1024
 
 
 #region General
@@ -48,7 +75,7 @@ async def reset_status_command(ctx: Context | Interaction):
     """
     if check_admin(ctx):
         await bot.change_presence(
-            activity=Streaming(name=".help", url=streamURL))
+            activity=Streaming(name=".help", url=config.current.stream_url))
     else:
         await send_message(ctx, "Piss dich ", ephemeral=True, delete_after=5)
 
@@ -67,27 +94,34 @@ async def set_status_command(ctx: Context | Interaction):
         await send_message(ctx, "Piss dich ", ephemeral=True, delete_after=5)
         return
 
-    await send_message(ctx, "Wie lautet der neue Status")
-    content = (await bot.wait_for('message')).content
-    if not content:
-        await send_message(ctx, "Ändern abgebrochen")
-        return
+    async with interaction_router.conversation(ctx.channel.id, return_author(ctx).id) as answers:
+        try:
+            await send_message(ctx, "Wie lautet der neue Status")
+            content = (await asyncio.wait_for(answers.get(), STATUS_ANSWER_TIMEOUT)).content
+            if not content:
+                await send_message(ctx, "Ändern abgebrochen")
+                return
 
-    await send_message(ctx, "Wie soll der Status sein (dnd,online,offline,idle,streaming)")
-    status = (await bot.wait_for("message")).content.lower()
-    if status not in ["dnd", "online", "offline", "idle", "streaming"]:
-        await send_message(ctx, "Ändern abgebrochen")
-        return
+            await send_message(ctx, "Wie soll der Status sein (dnd,online,offline,idle,streaming)")
+            status = (await asyncio.wait_for(answers.get(),
+                                             STATUS_ANSWER_TIMEOUT)).content.lower()
+            if status not in ["dnd", "online", "offline", "idle", "streaming"]:
+                await send_message(ctx, "Ändern abgebrochen")
+                return
 
-    if status == "streaming":
-        await bot.change_presence(activity=Streaming(name=content, url=streamURL))
-        return
+            if status == "streaming":
+                await bot.change_presence(activity=Streaming(name=content,
+                                                             url=config.current.stream_url))
+                return
 
-    await send_message(ctx, "Art des Status (listening,playing)")
-    art = (await bot.wait_for("message")).content.lower()
-    if art not in ["listening", "playing"]:
-        await send_message(ctx, "Ändern abgebrochen")
-        return
+            await send_message(ctx, "Art des Status (listening,playing)")
+            art = (await asyncio.wait_for(answers.get(), STATUS_ANSWER_TIMEOUT)).content.lower()
+            if art not in ["listening", "playing"]:
+                await send_message(ctx, "Ändern abgebrochen")
+                return
+        except asyncio.TimeoutError:
+            await send_message(ctx, "Ändern abgebrochen")
+            return
 
     activity_type = ActivityType.listening if art == "listening" else ActivityType.playing
     act = Activity(type=activity_type, name=content)
@@ -101,6 +135,152 @@ async def set_status_command(ctx: Context | Interaction):
 
 #endregion
 
+async def db_stats_command(ctx: Context | Interaction, action: str = None):
+    """
+    Shows the latency statistics of the slowest query templates.
+
+    Parameters:
+    ctx (Context | Interaction): The context or interaction that triggered the command.
+    action (str, optional): "reset" drops the recorded statistics. Defaults to None.
+
+    Returns:
+    None
+    """
+    stats = db.backend.stats if db.backend else None
+    if stats is None:
+        await send_message(ctx, "Für dieses Backend werden keine Abfragen gemessen")
+        return
+    if action == "reset":
+        stats.reset()
+        await send_message(ctx, "Statistiken zurückgesetzt")
+        return
+    embed = Embed(title="Datenbank", colour=Colour(0x0446b0),
+                  description=f"Wartezeit auf Verbindungen: "
+                              f"⌀ {stats.acquire.mean():.2f} ms, "
+                              f"p95 {stats.acquire.percentile(0.95):g} ms, "
+                              f"max {stats.acquire.max:.2f} ms")
+    for name, pool in (db.backend.pool_status() or {}).items():
+        embed.add_field(name=f"Pool ({name})",
+                        value=f"{pool['in_use']} in Benutzung | {pool['idle']} frei | "
+                              f"{pool['waiters']} wartend | {pool['size']}/{pool['limit']} "
+                              f"Verbindungen",
+                        inline=False)
+    for template, timing in stats.top(10):
+        embed.add_field(
+            name=template if len(template) <= 250 else template[:247] + "...",
+            value=f"{timing.execute.count}x | ⌀ {timing.execute.mean():.2f} ms | "
+                  f"p95 {timing.execute.percentile(0.95):g} ms | "
+                  f"max {timing.execute.max:.2f} ms | "
+                  f"Wartezeit ⌀ {timing.acquire.mean():.2f} ms | "
+                  f"{timing.rows} Zeilen",
+            inline=False
+        )
+    await send_message(ctx, embed=embed)
+
+
+async def sessions_command(ctx: Context | Interaction):
+    """
+    Shows the running game sessions per game and the oldest one.
+
+    Parameters:
+    ctx (Context | Interaction): The context or interaction that triggered the command.
+
+    Returns:
+    None
+    """
+    embed = Embed(title="Spielsitzungen", colour=Colour(0x0446b0),
+                  description=f"{game_sessions.active_count()} aktiv")
+    for game, count in game_sessions.per_game().most_common():
+        embed.add_field(name=game, value=str(count), inline=True)
+    oldest = game_sessions.oldest()
+    if oldest is not None:
+        embed.add_field(name="Älteste",
+                        value=f"{oldest.game} seit {oldest.age:.0f} s: "
+                              + ", ".join(f"<@{userid}>" for userid in oldest.userids),
+                        inline=False)
+    await send_message(ctx, embed=embed)
+
+
+def format_counts(counts):
+    """
+    Formats the amount of rows per table for a status message.
+
+    Parameters:
+    counts (dict): The amount of rows per table.
+
+    Returns:
+    str: The formatted counts.
+    """
+    return ", ".join(f"{count} {table}" for table, count in counts.items())
+
+
+async def export_command(ctx: Context, fmt: str = "jsonl"):
+    """
+    Exports the money, daily and robbing tables as a gzip compressed CSV or JSON Lines file.
+    The rows are streamed into a temporary file, so the memory used stays constant.
+
+    Parameters:
+    ctx (Context): The context that triggered the command.
+    fmt (str, optional): "csv" or "jsonl". Defaults to "jsonl".
+
+    Returns:
+    None
+    """
+    if fmt not in FORMATS:
+        await send_message(ctx, f"Format muss {' oder '.join(FORMATS)} sein")
+        return
+    with tempfile.TemporaryFile() as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb") as compressed, \
+                io.TextIOWrapper(compressed, encoding="utf-8", newline="") as file:
+            counts = await export_economy(db, file, fmt, EXPORT_CHUNK_SIZE)
+        limit = ctx.guild.filesize_limit if ctx.guild else DEFAULT_FILESIZE_LIMIT
+        if raw.tell() > limit:
+            await send_message(ctx, "Export ist zu groß für Discord")
+            return
+        raw.seek(0)
+        filename = f"economy-{datetime.date.today().isoformat()}.{fmt}.gz"
+        await ctx.channel.send(content=f"Exportiert: {format_counts(counts)}",
+                               file=File(raw, filename=filename))
+
+
+async def import_command(ctx: Context):
+    """
+    Imports a file created by the export command, attached to the command message.
+    Existing rows are replaced, the file is validated completely before anything is written.
+    The attachment is downloaded in blocks into a temporary file and imported chunk by chunk.
+
+    Parameters:
+    ctx (Context): The context that triggered the command.
+
+    Returns:
+    None
+    """
+    if not ctx.message.attachments:
+        await send_message(ctx, "Keine Datei angehängt")
+        return
+    attachment = ctx.message.attachments[0]
+    name = attachment.filename.removesuffix(".gz")
+    fmt = name.rsplit(".", 1)[-1]
+    if fmt not in FORMATS:
+        await send_message(ctx, f"Dateiendung muss {' oder '.join(FORMATS)} (optional .gz) sein")
+        return
+    with tempfile.TemporaryFile() as raw:
+        async with aiohttp.ClientSession() as session, session.get(attachment.url) as response:
+            response.raise_for_status()
+            async for block in response.content.iter_chunked(64 * 1024):
+                raw.write(block)
+        raw.seek(0)
+        source = gzip.GzipFile(fileobj=raw, mode="rb") \
+            if attachment.filename.endswith(".gz") else raw
+        with io.TextIOWrapper(source, encoding="utf-8", newline="") as file:
+            try:
+                counts = await import_economy(db, file, fmt, EXPORT_CHUNK_SIZE)
+            except (ValueError, OSError) as e:
+                await send_message(ctx, f"Import abgebrochen: {e}")
+                return
+    logging.info("Imported %s by %s", format_counts(counts), ctx.author.global_name)
+    await send_message(ctx, f"Importiert: {format_counts(counts)}")
+
 #region Gaming
 async def set_money_command(ctx: Context | Interaction, member: Member, user_money=None):
     """
@@ -136,4 +316,101 @@ async def set_money_command(ctx: Context | Interaction, member: Member, user_mon
             await send_message(ctx, embed=embed)
     except ValueError:
         await send_message(ctx, "Falsche Parameter übergeben")
+
+
+async def run_bulk_command(ctx: Context, operation, confirm: str, command: str):
+    """
+    Runs a set-based economy update, or only previews the affected users without "confirm".
+
+    Parameters:
+    ctx (Context): The context that triggered the command.
+    operation: A coroutine function taking dry_run and returning the amount of users.
+    confirm (str): "confirm" to run the update, anything else previews it.
+    command (str): The command line that runs the update when "confirm" is appended.
+
+    Returns:
+    None
+    """
+    if confirm != "confirm":
+        count = await operation(True)
+        await send_message(ctx, f"Vorschau: {count} Konten betroffen. "
+                                f"Ausführen mit `{command} confirm`")
+        return
+    count = await operation(False)
+    logging.info("%s changed %s accounts by %s", command, count, ctx.author.global_name)
+    await send_message(ctx, f"{count} Konten geändert")
+
+
+async def scale_money_command(ctx: Context, above: int, factor: float, confirm: str = None):
+    """
+    Multiplies every balance above a threshold by a factor, e.g. 0.9 for an inflation tax.
+
+    Parameters:
+    ctx (Context): The context that triggered the command.
+    above (int): Only balances greater than this are changed.
+    factor (float): The factor the balances are multiplied by.
+    confirm (str, optional): "confirm" to run the update. Defaults to None (preview).
+
+    Returns:
+    None
+    """
+    if above < 0 or factor < 0:
+        await send_message(ctx, "Grenze und Faktor müssen positiv sein")
+        return
+    await run_bulk_command(ctx, lambda dry_run: db.scale_money(above, factor, dry_run),
+                           confirm, f".scale {above} {factor}")
+
+
+async def cap_money_command(ctx: Context, cap: int, confirm: str = None):
+    """
+    Lowers every balance above a cap to the cap.
+
+    Parameters:
+    ctx (Context): The context that triggered the command.
+    cap (int): The highest balance a user can have.
+    confirm (str, optional): "confirm" to run the update. Defaults to None (preview).
+
+    Returns:
+    None
+    """
+    if cap < 0:
+        await send_message(ctx, "Obergrenze muss positiv sein")
+        return
+    await run_bulk_command(ctx, lambda dry_run: db.cap_money(cap, dry_run),
+                           confirm, f".cap {cap}")
+
+
+async def role_bonus_command(ctx: Context, role: Role, amount: int, confirm: str = None):
+    """
+    Adds an amount to the balance of every member of a role, bots are skipped.
+
+    Parameters:
+    ctx (Context): The context that triggered the command.
+    role (discord.Role): The role whose members receive the bonus.
+    amount (int): The amount added to every balance.
+    confirm (str, optional): "confirm" to run the update. Defaults to None (preview).
+
+    Returns:
+    None
+    """
+    if amount <= 0:
+        await send_message(ctx, "Betrag muss positiv sein")
+        return
+    userids = [member.id for member in role.members if not member.bot]
+    await run_bulk_command(ctx, lambda dry_run: db.credit_money(userids, amount, dry_run),
+                           confirm, f".bonus {role.id} {amount}")
+
+
+async def reset_streaks_command(ctx: Context, confirm: str = None):
+    """
+    Resets the daily streak of every user.
+
+    Parameters:
+    ctx (Context): The context that triggered the command.
+    confirm (str, optional): "confirm" to run the update. Defaults to None (preview).
+
+    Returns:
+    None
+    """
+    await run_bulk_command(ctx, db.reset_streaks, confirm, ".resetstreaks")
 #endregion
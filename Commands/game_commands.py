@@ -1,24 +1,35 @@
-import time
 from discord import Interaction, Member, Embed, Colour, ButtonStyle, ui
 from discord.ext.commands import Context
 from discord.ui import Button
-from Game.blackjack import Blackjack
+from Game.blackjack import Blackjack, CARD_ICONS
 from Game.higher_lower import HigherLower
 from Game.rob import Rob
 
 from Game.roulette import validate_entry, spinning, play_roulette
 from Util.util_commands import return_author, db, send_message, \
-    get_daily, get_money_for_user, can_play, create_embed, get_first_card, load_config
-from Util.variables import currentlyGaming, bot
+    get_money_for_user, can_play, create_embed, get_first_card
+from Util.variables import game_sessions, interaction_router, animations, bot
+from View.game_renderer import GameRenderer
+from config_loader import config
 
 embed_view, message = None, None
+scoreboard_cache = {"version": None, "embed": None}
+# Sekunden zwischen zwei Karten des Dealers
+DEALER_DRAW_DELAY = 2.0
+# Überschrift, Text, Auszahlungsfaktor und Farbe je Ausgang einer Blackjack-Runde
+BLACKJACK_RESULTS = {
+    "draw": ("Unentschieden", "Du hast {money} :coin: zurückerhalten", 1, 0xd6b22f),
+    "player": ("Gewonnen", "Du hast {bet} :coin: erhalten", 2, 0x06660b),
+    "dealer": ("Verloren", "Du hast deinen Einsatz von {bet} :coin: verloren", 0, 0xb50909),
+    "doppelt": ("Natural Blackjack", "Du hast {money} :coin: erhalten", 2.5, 0x5f09b5)
+}
 
 async def rob_command(ctx: Context | Interaction, player: Member):
     """Handles the rob command."""
     author = return_author(ctx)
     can_rob, next_robbing = await db.can_rob(author.id)
     if can_rob:
-        if str(author.id) not in currentlyGaming:
+        if not game_sessions.is_busy(author.id):
             robbing = Rob()
             await robbing.rob(player, ctx)
         else:
@@ -43,14 +54,27 @@ async def rob_command(ctx: Context | Interaction, player: Member):
 
 async def scoreboard_command(ctx: Context | Interaction):
     """Displays the scoreboard."""
-    scorelist = await db.get_users_with_money()
-    loaded_config = load_config("embed")
+    scorelist = await db.get_leaderboard()
+    if scoreboard_cache["version"] != db.leaderboard.version:
+        scoreboard_cache["embed"] = await build_scoreboard_embed(scorelist)
+        scoreboard_cache["version"] = db.leaderboard.version
+    embed = scoreboard_cache["embed"].copy()
+    embed.set_footer(text="Asked by " + return_author(ctx).name,
+                     icon_url=return_author(ctx).avatar)
+    await send_message(ctx, embed=embed)
+
+@config.subscribe
+def invalidate_scoreboard(old, new):
+    """Verwirft das zwischengespeicherte Scoreboard, wenn sich die Embed-Konfiguration ändert."""
+    if old.embed != new.embed:
+        scoreboard_cache["version"] = None
+
+async def build_scoreboard_embed(scorelist) -> Embed:
+    """Erstellt das Scoreboard-Embed ohne Footer."""
     embed = Embed(title="Scoreboard",
                           colour=Colour(0x6b0b04),
                           description="Hier ist das Scoreboard für die Games")
-    embed.set_thumbnail(url=loaded_config["embeds_thumbnail"])
-    embed.set_footer(text="Asked by " + return_author(ctx).name,
-                     icon_url=return_author(ctx).avatar)
+    embed.set_thumbnail(url=config.current.embed.thumbnail)
 
     for i, score in enumerate(scorelist):
         user = (bot.get_user(int(score[0]))
@@ -64,22 +88,16 @@ async def scoreboard_command(ctx: Context | Interaction):
         else:
             embed.add_field(name=f"{i + 1}. {username}",
                             value=f"{score[1]} :coin:", inline=False)
-        if i == 9:
-            break
-    await send_message(ctx, embed=embed)
+    return embed
 
 async def daily_command(ctx: Context | Interaction):
     """Verarbeitet den täglichen Befehl."""
     author = return_author(ctx)
-    if await get_daily(author):
-        money_user = int(await get_money_for_user(author)) + 300
-        bonus = await db.get_streak_bonus(author.id)
-        money_user += bonus
-        await db.set_money_for_user(author.id, money_user)
+    claimed, bonus, money_user = await db.claim_daily(author.id)
+    if claimed:
         await send_message(ctx,
                            f"Du hast {300 + bonus} Coins erhalten.\n" +
                            f"**Total: {money_user} Coins**")
-        await db.set_daily(author.id)
     else:
         await send_message(ctx,
                            "**Du hast dein Daily heute schon geclaimed**")
@@ -107,20 +125,16 @@ async def send_command(ctx: Context | Interaction, member: Member, set_money=Non
                 await send_message(ctx,
                                    "Kein Spieler angegeben",
                                    ephemeral=True, delete_after=5)
-            elif str(member.id) in currentlyGaming:
+            elif game_sessions.is_busy(member.id):
                 await send_message(ctx,
                                    "Dieser Spiel ist gerade beschäftigt",
                                    ephemeral=True, delete_after=5)
             else:
-                money_user = await get_money_for_user(return_author(ctx))
-                money_other = await get_money_for_user(member)
-                if set_money > money_user:
+                balances = await db.transfer(return_author(ctx).id, member.id, set_money)
+                if balances is None:
                     await send_message(ctx, "Nicht genügend :coin: zum senden")
                 else:
-                    money_user -= set_money
-                    money_other += set_money
-                    await db.set_money_for_user(return_author(ctx).id, money_user)
-                    await db.set_money_for_user(member.id, money_other)
+                    money_user, money_other = balances
                     embed = Embed(title="Bank", colour=Colour(0xc6c910))
                     embed.add_field(name=author,
                                     value=f"Money: {money_user} :coin:",
@@ -152,108 +166,106 @@ async def money_command(ctx: Context | Interaction, may_member: Member = None):
         await send_message(ctx,
                            f"Du hast aktuell {user_money} :coin:")
 
+HISTORY_PAGE_SIZE = 10
+
+async def history_command(ctx: Context | Interaction, may_member: Member = None,
+                          before: int = None):
+    """Zeigt eine Seite der Kontobewegungen eines Benutzers an, neueste zuerst."""
+    member = may_member or return_author(ctx)
+    if member.bot:
+        await send_message(ctx, "Bitte nicht die Bots pingen", delete_after=20)
+        return
+    entries = await db.get_history(member.id, before, HISTORY_PAGE_SIZE + 1)
+    embed = Embed(title="Verlauf", colour=Colour(0xc6c910),
+                  description=f"Kontobewegungen von {member.name}")
+    if not entries:
+        embed.description += "\nKeine Einträge"
+    for entry_id, delta, balance, game, reference, created_at in entries[:HISTORY_PAGE_SIZE]:
+        embed.add_field(
+            name=f"{delta:+} :coin: | {game}",
+            value=f"Kontostand {balance} :coin: | {created_at.strftime('%d.%m.%Y %H:%M')}"
+                  + (f" | {reference}" if reference else "") + f" | #{entry_id}",
+            inline=False)
+    if len(entries) > HISTORY_PAGE_SIZE:
+        embed.set_footer(text=f"Ältere Einträge: .history {member.name} "
+                              f"{entries[HISTORY_PAGE_SIZE - 1][0]}")
+    await send_message(ctx, embed=embed)
+
 async def blackjack_command(ctx: Context | Interaction, bet: int):
     """Verarbeitet den Blackjack-Befehl."""
     playable = await can_play(ctx, bet)
     if playable[0] and playable[1]:
         user = str(return_author(ctx).id)
-        if user not in currentlyGaming:
-            money_user = await get_money_for_user(return_author(ctx))
-            currentlyGaming.append(user)
+        async with game_sessions.session("blackjack", user) as session:
+            if session is None:
+                await send_message(ctx,
+                                   f"{return_author(ctx).mention}. Du spielst schon!!!",
+                                   ephemeral=True,
+                                   delete_after=5)
+                return
+            bet_hold = await db.reserve_bet(return_author(ctx).id, bet, "blackjack")
+            if bet_hold is None:
+                await handle_invalid_bet(ctx, [True, False])
+                return
             draw_id = "draw_" + user
             hold_id = "hold_" + user
-            draw_button = Button(label="Draw",
-                                 style=ButtonStyle.green,
-                                 custom_id=draw_id)
-            hold_button = Button(label="Stand",
-                                 style=ButtonStyle.red,
-                                 custom_id=hold_id)
-            embed = create_embed(ctx, 0xb59809, "Blackjack")
-            firstplayer = True
-            has_interaction = True
-            responded = False
+            blackjack_view = create_blackjack_view(Button(label="Draw",
+                                                          style=ButtonStyle.green,
+                                                          custom_id=draw_id),
+                                                   Button(label="Stand",
+                                                          style=ButtonStyle.red,
+                                                          custom_id=hold_id))
+            renderer = GameRenderer()
             bj = Blackjack(bet)
             bj.firstdraw()
             dealerpoints = get_first_card(bj.dealerdrawn)
-            dealershown = ""
-            playerausgabe = ""
-            while not bj.is_over():
-                if not bj.playerstand:
-                    blackjack_view = ui.View(timeout=None)
-                    blackjack_view.add_item(draw_button)
-                    blackjack_view.add_item(hold_button)
-                    if firstplayer:
-                        dealercard = bj.dealerdrawn[0]
-                        dealershown = get_card_icon(dealercard[0])
-                    else:
-                        embed = create_embed(ctx, 0xb59809, "Blackjack")
-                    cardshow = [get_card_icon(card[0]) for card in bj.playerdrawn]
-                    playerausgabe = ", ".join(cardshow)
-                    embed.add_field(name=str(return_author(ctx).name) + f" | ```{bj.player}```",
-                                    value=f"{playerausgabe}", inline=True)
-                    embed.add_field(name="Dealer" + f" | ```{dealerpoints}```",
-                                    value=f"{dealershown}", inline=True)
-                    if firstplayer:
-                        blackjack_msg = await send_message(ctx, embed=embed, view=blackjack_view)
-                        firstplayer = not firstplayer
+            dealershown = get_card_icon(bj.dealerdrawn[0][0])
+            response = None
+            pause = 0.0
+            async with interaction_router.buttons(user, draw_id, hold_id) as clicks:
+                initial = renderer.changes(embed=blackjack_embed(ctx, bj, dealerpoints,
+                                                                 dealershown),
+                                           view=blackjack_view)
+                blackjack_msg = await send_message(ctx, **initial)
+                renderer.commit(initial)
+                animation = animations.animate(blackjack_msg, renderer)
+                if bj.natural_player:
+                    bj.stand("player")
+                while not bj.playerstand:
+                    response = await clicks.get()
+                    if response.data["custom_id"] == draw_id:
+                        bj.draw_another("player")
+                        if bj.is_overbought("player"):
+                            bj.stand("player")
                     else:
-                        await response.response.edit_message(embed=embed, view=blackjack_view)
-                    checkin = False
-                    if bj.natural_player:
                         bj.stand("player")
-                        has_interaction = False
+                    if not bj.playerstand:
+                        await renderer.respond(response,
+                                               embed=blackjack_embed(ctx, bj, dealerpoints,
+                                                                     dealershown),
+                                               view=blackjack_view)
+                while not bj.dealerstand:
+                    if bj.is_overbought("player"):
+                        bj.stand("dealer")
+                        break
+                    embed = blackjack_embed(ctx, bj, bj.dealer, bj.dealercards)
+                    if response is not None:
+                        # Der erste Zug des Dealers beantwortet den letzten Klick
+                        await renderer.respond(response, embed=embed, view=None)
+                        response = None
                     else:
-                        while not checkin:
-                            response: Interaction = await bot.wait_for('interaction',
-                                                                       check=lambda
-                                  interaction: interaction.user == return_author(ctx))
-                            if (
-                                ("component_type" in response.data
-                                and "custom_id" in response.data)
-                                and (user == str(response.user.id)
-                                    and response.data["component_type"] == 2
-                                and "custom_id" in response.data.keys())
-                            ):
-                                checkin = True
-                        action = response.data["custom_id"]
-                        if action == draw_id:
-                            bj.draw_another("player")
-                            if bj.is_overbought("player"):
-                                bj.stand("player")
-                        elif action == hold_id:
-                            bj.stand("player")
-                else:
-                    blackjack_view.clear_items()
-                    if not bj.is_overbought("player"):
-                        embed = create_embed(ctx, 0xb59809, "Blackjack")
-                        cardshow = [get_card_icon(card[0]) for card in bj.dealerdrawn]
-                        dealerausgabe = ", ".join(cardshow)
-                        embed.add_field(name=str(return_author(ctx).name) +
-                                             f" | ```{bj.player}```",
-                                        value=f"{playerausgabe}", inline=True)
-                        embed.add_field(name="Dealer" + f" | ```{bj.dealer}```",
-                                        value=f"{dealerausgabe}", inline=True)
-                        if not responded and has_interaction:
-                            await response.response.edit_message(embed=embed, view=blackjack_view)
-                            responded = not responded
-                        else:
-                            await blackjack_msg.edit(embed=embed, view=blackjack_view)
-                        if bj.dealer_draw() and not bj.dealerstand:
-                            bj.draw_another("dealer")
-                            if bj.is_overbought("dealer"):
-                                bj.stand("dealer")
-                            time.sleep(2)
-                        else:
+                        renderer.frame(animation, pause, embed=embed, view=None)
+                    pause = 0.0
+                    if bj.dealer_draw():
+                        bj.draw_another("dealer")
+                        if bj.is_overbought("dealer"):
                             bj.stand("dealer")
+                        pause = DEALER_DRAW_DELAY
                     else:
                         bj.stand("dealer")
-                        await response.response.edit_message(embed=embed, view=blackjack_view)
-            await finalize_blackjack(ctx, bj, bet, money_user, user, blackjack_msg, embed)
-        else:
-            await send_message(ctx,
-                                f"{return_author(ctx).mention}. Du spielst schon!!!",
-                               ephemeral=True,
-                               delete_after=5)
+                if response is not None:
+                    await renderer.respond(response, view=None)
+            await finalize_blackjack(ctx, bj, bet, bet_hold, animation, renderer, pause)
     else:
         await handle_invalid_bet(ctx, playable)
 
@@ -262,59 +274,68 @@ async def roulette_command(ctx: Context | Interaction, bet: int, entry: str):
     playable = await can_play(ctx, bet)
     user = str(return_author(ctx).id)
     if playable[0] and playable[1]:
-        if user not in currentlyGaming:
+        async with game_sessions.session("roulette", user) as session:
+            if session is None:
+                await send_message(ctx,
+                                   f"{return_author(ctx).mention}. Du spielst schon!!!",
+                                   ephemeral=True, delete_after=5)
+                return
             validator = validate_entry(entry)
             if validator[0]:
-                money_user = await get_money_for_user(return_author(ctx))
-                currentlyGaming.append(user)
-                roulette_message = await spinning(ctx)
+                bet_hold = await db.reserve_bet(return_author(ctx).id, bet, "roulette")
+                if bet_hold is None:
+                    await handle_invalid_bet(ctx, [True, False])
+                    return
+                roulette_animation = await spinning(ctx)
                 if isinstance(validator[1], int):
                     multiplication = 20
-                    result = await play_roulette(entry, "number", roulette_message)
+                    result = await play_roulette(entry, "number", roulette_animation)
                 else:
                     if validator[1] == "green":
                         multiplication = 20
                     else:
                         multiplication = 0.5
-                    result = await play_roulette(entry, "color", roulette_message)
+                    result = await play_roulette(entry, "color", roulette_animation)
                 if result:
-                    money_user += int(bet * multiplication)
-                    await db.set_money_for_user(return_author(ctx).id, money_user)
+                    money_user = await db.settle_bet(bet_hold, 1 + multiplication)
                     await send_message(ctx,
                                        f"Du hast {str(int(bet * multiplication))} "
                                        f":coin: gewonnen.\n"
                                        f"Aktueller Kontostand: {money_user} :coin:")
                 else:
-                    money_user -= bet
-                    await db.set_money_for_user(return_author(ctx).id, money_user)
+                    money_user = await db.settle_bet(bet_hold, 0)
                     await send_message(ctx,
                                        f"Du hast {str(bet)} :coin: verloren.\n"
                                         f"Aktueller Kontostand: {money_user} :coin:")
-                currentlyGaming.remove(str(return_author(ctx).id))
             else:
                 await send_message(ctx,
                                    "Eingabe ungülltig. Gültig: 0-36, red, black, green",
                                    ephemeral=True, delete_after=5)
-        else:
-            await send_message(ctx,
-                               f"{return_author(ctx).mention}. Du spielst schon!!!",
-                               ephemeral=True, delete_after=5)
     else:
         await handle_invalid_bet(ctx, playable)
 
 async def higher_lower_command(ctx: Context | Interaction, bet: int):
     """Verarbeitet den Higher-Lower-Befehl."""
     playable = await can_play(ctx, bet)
-    money_user = await get_money_for_user(return_author(ctx))
     if playable[0] and playable[1]:
-        if str(return_author(ctx).id) not in currentlyGaming:
-            currentlyGaming.append(str(return_author(ctx).id))
+        async with game_sessions.session("higher_lower", return_author(ctx).id) as session:
+            if session is None:
+                await send_message(ctx,
+                                   f"{return_author(ctx).mention}. Du spielst schon!!!",
+                                   delete_after=5)
+                return
+            bet_hold = await db.reserve_bet(return_author(ctx).id, bet, "higher_lower")
+            if bet_hold is None:
+                await handle_invalid_bet(ctx, [True, False])
+                return
+            higher_id = f"higher_{return_author(ctx).id}"
+            lower_id = f"lower_{return_author(ctx).id}"
             higher_button = Button(label="Higher",
                                    style=ButtonStyle.green,
-                                   custom_id="higher")
+                                   custom_id=higher_id)
             lower_button = Button(label="Lower",
                                   style=ButtonStyle.green,
-                                  custom_id="lower")
+                                  custom_id=lower_id)
             higher_lower_view = ui.View(timeout=None)
             higher_lower_view.add_item(higher_button)
             higher_lower_view.add_item(lower_button)
@@ -323,27 +344,31 @@ async def higher_lower_command(ctx: Context | Interaction, bet: int):
             embed.add_field(name="Ist die Zahl kleiner oder größer?",
                             value=f"Die gegebene Zahl ist: {game.shown}",
                             inline=False)
-            higher_lower_message = await send_message(ctx, embed=embed, view=higher_lower_view)
-            response_object: Interaction = await bot.wait_for('interaction',
-                  check=lambda
-                      interaction: interaction.user == return_author(ctx))
-            if game.is_identical():
-                await handle_identical_numbers(ctx, game, embed,
-                                               higher_lower_view, higher_lower_message)
-            if game.won(str(response_object.data["custom_id"])):
+            async with interaction_router.buttons(return_author(ctx).id,
+                                                  higher_id, lower_id) as clicks:
+                higher_lower_message = await send_message(ctx, embed=embed,
+                                                          view=higher_lower_view)
+                response_object: Interaction = await clicks.get()
+                if game.is_identical():
+                    response_object = await handle_identical_numbers(ctx, game, embed,
+                                                                     higher_lower_view,
+                                                                     higher_lower_message,
+                                                                     clicks)
+            if game.won(response_object.data["custom_id"].split("_")[0]):
                 game_response = "Gewonnen"
                 bet = int(bet * 0.2)
                 description = (f"Gegebener Wert: {game.shown}. "
                                f"Versteckter Wert: {game.hidden}.\n{bet} :coin: gewonnen")
-                money_user += bet
+                payout = 1.2
                 embed_color = 0x06660b
             else:
                 game_response = "Verloren"
                 description = (f"Gegebener Wert: {game.shown}. "
                                f"Versteckter Wert: {game.hidden}.\n{bet} :coin: verloren")
-                money_user -= bet
+                payout = 0
                 embed_color = 0xb50909
             higher_lower_view.clear_items()
+            money_user = await db.settle_bet(bet_hold, payout)
             embed = create_embed(ctx, embed_color, "Blackjack")
             embed.add_field(name=game_response,
                             value=description,
@@ -351,122 +376,37 @@ async def higher_lower_command(ctx: Context | Interaction, bet: int):
             embed.add_field(name="Aktueller Kontostand",
                             value=f"{money_user} :coin:",
                             inline=False)
-            currentlyGaming.remove(str(return_author(ctx).id))
-            await db.set_money_for_user(return_author(ctx).id, money_user)
             await response_object.response.edit_message(embed=embed, view=higher_lower_view)
-        else:
-            await send_message(ctx,
-                               f"{return_author(ctx).mention}. Du spielst schon!!!",
-                               delete_after=5)
     else:
         await handle_invalid_bet(ctx, playable)
 
 def get_card_icon(card):
     """Gibt das Symbol für eine Karte zurück."""
-    icons = {"König": "K", "Bube": "B", "Dame": "D", "Ass": "A"}
-    return icons.get(card, str(card))
+    return CARD_ICONS.get(card, str(card))
 
-async def finalize_blackjack(ctx, bj, bet, money_user, user, sending_message, embed):
-    """Beendet das Blackjack-Spiel."""
-    name = ""
-    value = ""
-    color = None
-    if bj.won() == "draw":
-        name = "Unentschieden"
-        value = f"Du hast {str(bj.get_money())} :coin: zurückerhalten"
-        color = 0xd6b22f
-    elif bj.won() == "player":
-        name = "Gewonnen"
-        value = f"Du hast {str(bet)} :coin: erhalten"
-        money_user += bet
-        color = 0x06660b
-    elif bj.won() == "dealer":
-        name = "Verloren"
-        value = f"Du hast deinen Einsatz von {str(bet)} :coin: verloren"
-        money_user -= bet
-        color = 0xb50909
-    elif bj.won() == "doppelt":
-        name = "Natural Blackjack"
-        value = f"Du hast {str(bj.get_money())} :coin: erhalten"
-        money_user += bj.get_money()
-        color = 0x5f09b5
-    embed.color = color
-    cardshow = [get_card_icon(card[0]) for card in bj.playerdrawn]
-    playerausgabe = ", ".join(cardshow)
-    dealercardshow = [get_card_icon(card[0]) for card in bj.dealerdrawn]
-    dealerausgabe = ", ".join(dealercardshow)
-    embed.clear_fields()
-    embed.add_field(name=str(return_author(ctx).name) + f" | ```{bj.player}```",
-                    value=f"{playerausgabe}",
-                    inline=True)
-    embed.add_field(name="Dealer" + f" | ```{bj.dealer}```",
-                    value=f"{dealerausgabe}",
-                    inline=True)
+def blackjack_embed(ctx, bj, dealerpoints, dealercards, colorcode=0xb59809) -> Embed:
+    """Erstellt das Blackjack-Embed mit den Karten von Spieler und Dealer."""
+    embed = create_embed(ctx, colorcode, "Blackjack")
+    embed.add_field(name=f"{return_author(ctx).name} | ```{bj.player}```",
+                    value=bj.playercards, inline=True)
+    embed.add_field(name=f"Dealer | ```{dealerpoints}```",
+                    value=dealercards, inline=True)
+    return embed
+
+async def finalize_blackjack(ctx, bj, bet, bet_hold, animation, renderer, delay=0.0):
+    """Beendet das Blackjack-Spiel und zeigt das Ergebnis als letzten Frame der Animation."""
+    winner = bj.won()
+    name, value, payout, color = BLACKJACK_RESULTS[winner]
+    money_user = await db.settle_bet(bet_hold, payout)
+    embed = blackjack_embed(ctx, bj, bj.dealer, bj.dealercards, color)
     embed.add_field(name=name,
-                    value=value,
+                    value=value.format(bet=bet, money=bj.get_money(winner)),
                     inline=False)
     embed.add_field(name="Aktueller Kontostand",
                     value=f"{money_user} :coin:",
                     inline=False)
-    currentlyGaming.remove(user)
-    await db.set_money_for_user(return_author(ctx).id, money_user)
-    await sending_message.edit(embed=embed)
-
-
-async def play_blackjack(ctx, bj, user, draw_id, hold_id, embed, msg,
-                         money_user, bet, playerausgabe):
-    """Spielt das Blackjack-Spiel."""
-    draw_button = Button(label="Draw",
-                         style=ButtonStyle.green,
-                         custom_id=draw_id)
-    hold_button = Button(label="Stand",
-                         style=ButtonStyle.red,
-                         custom_id=hold_id)
-    firstplayer = True
-    while not bj.is_over():
-        if not bj.playerstand:
-            if firstplayer:
-                firstplayer = False
-            else:
-                await res.response.edit_message(embed=embed,
-                                                  view=create_blackjack_view(draw_button,
-                                                                             hold_button))
-            res = await bot.wait_for('interaction', check=
-                                     lambda interaction: interaction.user == return_author(ctx))
-            action = res.data["custom_id"]
-            if action == draw_id:
-                bj.draw_another("player")
-                if bj.is_overbought("player"):
-                    bj.stand("player")
-            elif action == hold_id:
-                bj.stand("player")
-        else:
-            await handle_dealer_turn(ctx, bj, embed, msg, money_user, bet, user, playerausgabe)
-            break
+    await renderer.finish(animation, delay, embed=embed)
 
-async def handle_dealer_turn(ctx, bj, embed, msg, money_user, bet, user, playerausgabe):
-    """Verarbeitet den Zug des Dealers."""
-    while not bj.is_over():
-        if not bj.is_overbought("player"):
-            embed = create_embed(ctx, 0xb59809, "Blackjack")
-            cardshow = [get_card_icon(card[0]) for card in bj.dealerdrawn]
-            dealerausgabe = ", ".join(cardshow)
-            embed.add_field(name=str(return_author(ctx).name) + f" | ```{bj.player}```",
-                            value=f"{playerausgabe}", inline=True)
-            embed.add_field(name="Dealer" + f" | ```{bj.dealer}```", value=f"{dealerausgabe}",
-                            inline=True)
-            await msg.edit(embed=embed, view=None)
-            if bj.dealer_draw() and not bj.dealerstand:
-                bj.draw_another("dealer")
-                if bj.is_overbought("dealer"):
-                    bj.stand("dealer")
-                time.sleep(2)
-            else:
-                bj.stand("dealer")
-        else:
-            bj.stand("dealer")
-            await msg.edit(embed=embed, view=None)
-    await finalize_blackjack(ctx, bj, bet, money_user, user, msg, embed)
 
 def create_blackjack_view(draw_button, hold_button):
     """Erstellt die Blackjack-Ansicht."""
@@ -484,8 +424,9 @@ async def handle_invalid_bet(ctx, playable):
         await send_message(ctx,
                         f"Du hast nur {await get_money_for_user(return_author(ctx))} :coin:")
 
-async def handle_identical_numbers(ctx, game, embed, view, msg):
-    """Handles identical numbers in higher lower game."""
+async def handle_identical_numbers(ctx, game, embed, view, msg, clicks):
+    """Handles identical numbers in higher lower game and returns the last click."""
+    response = None
     while game.is_identical():
         await msg.delete()
         msg = await send_message(ctx,
@@ -496,5 +437,5 @@ async def handle_identical_numbers(ctx, game, embed, view, msg):
                         value=f"Die gegebene Zahl ist: {game.shown}",
                         inline=False)
         await send_message(ctx, embed=embed, view=view)
-        await bot.wait_for('interaction',
-                           check=lambda interaction: interaction.user == return_author(ctx))
+        response = await clicks.get()
+    return response
@@ -15,7 +15,7 @@ from Dropdowns.alias_select import AliasSelectView
 from Dropdowns.help_select import HelpSelectView
 from Dropdowns.rules_select import RuleSelectView
 from Util.util_commands import send_message, return_author
-from Util.variables import inviteLink, streamURL
+from config_loader import config
 
 
 async def help_command(ctx: Context | Interaction):
@@ -68,7 +68,7 @@ async def invite_command(ctx: Context | Interaction):
     Args:
         ctx (Context | Interaction): The context or interaction that triggered the command.
     """
-    await send_message(ctx, inviteLink)
+    await send_message(ctx, config.current.invite_link)
 
 
 async def stream_command(ctx: Context | Interaction):
@@ -78,4 +78,4 @@ async def stream_command(ctx: Context | Interaction):
     Args:
         ctx (Context | Interaction): The context or interaction that triggered the command.
     """
-    await send_message(ctx, streamURL)
+    await send_message(ctx, config.current.stream_url)
@@ -0,0 +1,255 @@
+"""
+Write-behind cache for user balances.
+
+This module provides a BalanceCache class that keeps balances in memory and writes
+changed balances back to the database in batches from a background task.
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from contextlib import asynccontextmanager
+
+
+class BalanceCache:
+    """
+        In-memory balances with a periodic, batched flush of the dirty ones.
+
+        Money held for running games is kept in memory as well and is written back as
+        part of the balance, so a crash never loses a bet that was not settled yet.
+    """
+    def __init__(self, db, interval=0.5, batch_size=100, max_dirty=1000):
+        """
+        Initialize an empty cache.
+
+        :param db: The DbController used to load and write balances.
+        :param interval: Seconds between two flushes.
+        :param batch_size: Amount of dirty balances that triggers an early flush.
+        :param max_dirty: Amount of dirty balances at which writers wait for a flush.
+        """
+        self.db = db
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_dirty = max_dirty
+        self.balances = {}
+        self.held = defaultdict(int)
+        self.dirty = set()
+        self.locks = defaultdict(asyncio.Lock)
+        # Cleared while a bulk update holds the cache, see exclusive()
+        self._open = asyncio.Event()
+        self._open.set()
+        self._exclusive = asyncio.Lock()
+        # Bumped on every eviction, so loads that started before are not cached
+        self.generation = 0
+        self._wakeup = asyncio.Event()
+        self._flushed = asyncio.Condition()
+        self._flush_lock = asyncio.Lock()
+        self._task = None
+        self._closed = False
+
+    def start(self):
+        """
+        Start the background flush task.
+        """
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        """
+        Stop the background flush task and write all remaining dirty balances.
+        """
+        self._closed = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush()
+
+    @asynccontextmanager
+    async def lock(self, userid):
+        """
+        Hold the lock serialising the balance changes of a given user ID.
+
+        :param userid: The ID of the user.
+        """
+        await self._open.wait()
+        async with self.locks[int(userid)]:
+            yield
+
+    @asynccontextmanager
+    async def locked(self, userids):
+        """
+        Hold the locks of several users, acquired in the order of their ID.
+
+        :param userids: The IDs of the users.
+        """
+        await self._open.wait()
+        async with self._holding(userids):
+            yield
+
+    @asynccontextmanager
+    async def _holding(self, userids):
+        """
+        Acquire the locks of several users in the order of their ID.
+
+        :param userids: The IDs of the users.
+        """
+        locks = [self.locks[userid] for userid in sorted({int(userid) for userid in userids})]
+        for lock in locks:
+            await lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    @asynccontextmanager
+    async def exclusive(self):
+        """
+        Hold the whole cache, e.g. while the money table is updated in bulk.
+        New balance changes wait until the block finishes, changes that already passed
+        lock() or locked() are finished first. Cache misses are not gated, as they may
+        run under a held user lock; a load that overlaps an eviction is not cached.
+        """
+        async with self._exclusive:
+            self._open.clear()
+            try:
+                async with self._holding(list(self.locks)):
+                    yield
+            finally:
+                self._open.set()
+
+    async def get(self, userid):
+        """
+        Return the balance of a given user ID, loading it from the database on a miss.
+
+        :param userid: The ID of the user.
+        :return: The amount of money the user has.
+        """
+        userid = int(userid)
+        while userid not in self.balances:
+            generation = self.generation
+            money = await self.db.read_money_for_user(userid)
+            if generation == self.generation:
+                self.balances.setdefault(userid, money)
+        return self.balances[userid]
+
+    async def get_many(self, userids):
+        """
+        Return the balances of several user IDs, loading all misses with a single query.
+
+        :param userids: The IDs of the users.
+        :return: A dict mapping the user IDs to the amount of money they have.
+        """
+        userids = [int(userid) for userid in userids]
+        missing = [userid for userid in userids if userid not in self.balances]
+        while missing:
+            generation = self.generation
+            loaded = await self.db.read_money_for_users(missing)
+            if generation == self.generation:
+                for userid, money in loaded.items():
+                    self.balances.setdefault(userid, money)
+            missing = [userid for userid in userids if userid not in self.balances]
+        return {userid: self.balances[userid] for userid in userids}
+
+    async def set(self, userid, money):
+        """
+        Store a new balance for a given user ID and mark it for the next flush.
+        Waits for a flush if too many balances are dirty.
+
+        :param userid: The ID of the user.
+        :param money: The new amount of money the user has.
+        """
+        userid = int(userid)
+        while userid not in self.dirty and len(self.dirty) >= self.max_dirty:
+            self._wakeup.set()
+            async with self._flushed:
+                await self._flushed.wait()
+        self.balances[userid] = money
+        self.dirty.add(userid)
+        if len(self.dirty) >= self.batch_size:
+            self._wakeup.set()
+
+    def hold(self, userid, amount):
+        """
+        Move an amount from the balance of a given user ID into the held money.
+        The caller has to check the balance while holding the lock of the user.
+
+        :param userid: The ID of the user.
+        :param amount: The amount to hold.
+        :return: The remaining amount of money the user has.
+        """
+        userid = int(userid)
+        self.balances[userid] -= amount
+        self.held[userid] += amount
+        return self.balances[userid]
+
+    async def release(self, userid, amount, payout):
+        """
+        Release held money of a given user ID and credit the payout.
+
+        :param userid: The ID of the user.
+        :param amount: The amount that was held.
+        :param payout: The amount credited to the balance.
+        :return: The new amount of money the user has.
+        """
+        userid = int(userid)
+        self.held[userid] -= amount
+        if not self.held[userid]:
+            del self.held[userid]
+        await self.set(userid, self.balances[userid] + payout)
+        return self.balances[userid]
+
+    def evict(self, userids):
+        """
+        Drop the cached balances of several user IDs that were overwritten in the database.
+        Balances with held money are kept, their bets are still settled through the cache.
+
+        :param userids: The IDs of the users.
+        """
+        self.generation += 1
+        for userid in userids:
+            if int(userid) not in self.held:
+                self.balances.pop(int(userid), None)
+                self.dirty.discard(int(userid))
+
+    async def reload(self):
+        """
+        Drop all cached balances after the money table was updated in bulk.
+        Balances with held money are read again, minus the money that is still held.
+        Has to run inside exclusive(), after the cache was flushed.
+        """
+        self.evict(list(self.balances))
+        if self.held:
+            for userid, money in (await self.db.read_money_for_users(list(self.held))).items():
+                self.balances[userid] = money - self.held[userid]
+
+    async def flush(self):
+        """
+        Write all dirty balances to the database with a single statement.
+        """
+        async with self._flush_lock:
+            if self.dirty:
+                rows = {userid: self.balances[userid] + self.held.get(userid, 0)
+                        for userid in self.dirty}
+                self.dirty.clear()
+                try:
+                    await self.db.write_balances(rows)
+                except Exception:
+                    self.dirty.update(rows)
+                    raise
+            async with self._flushed:
+                self._flushed.notify_all()
+
+    async def _run(self):
+        """
+        Flush every interval or as soon as enough balances are dirty.
+        """
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logging.error("Flushing balances failed: %s", e)
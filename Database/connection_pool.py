@@ -0,0 +1,260 @@
+"""
+Adaptive connection pool with health checks.
+
+This module provides an AdaptivePool class that pre-warms connections, pings idle
+connections in the background and grows or shrinks its size limit based on the
+observed time callers wait for a connection.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from Database.query_stats import Histogram
+from config_loader import config
+
+POOL_DEFAULTS = {
+    "min": 1,
+    "max": 10,
+    "target": 2,
+    "ping_interval": 30.0,
+    "resize_interval": 10.0,
+    "grow_wait_ms": 5.0,
+    "shrink_wait_ms": 1.0
+}
+
+
+def load_pool_config():
+    """
+    Load the pool settings from the "database" section of jsons/config.json.
+    Every setting can be overridden with a DB_POOL_<NAME> environment variable,
+    e.g. DB_POOL_MAX, missing settings fall back to POOL_DEFAULTS.
+
+    :return: A dict with the keys of POOL_DEFAULTS.
+    """
+    try:
+        settings = config.section("database").get("pool", {})
+    except (KeyError, OSError, json.JSONDecodeError):
+        settings = {}
+    return {key: type(default)(os.getenv(f"DB_POOL_{key.upper()}", settings.get(key, default)))
+            for key, default in POOL_DEFAULTS.items()}
+
+
+class AdaptivePool:
+    """
+        Pool of database connections with an adaptive size limit.
+
+        The limit starts at the target size and moves between the minimum and maximum:
+        it grows while the 95th percentile of the acquire wait exceeds grow_wait_ms and
+        shrinks again once it stays at or below shrink_wait_ms without waiting callers.
+    """
+    def __init__(self, connect, config):
+        """
+        Initialize an empty pool.
+
+        :param connect: A coroutine function opening a new connection.
+        :param config: A dict with the keys of POOL_DEFAULTS.
+        """
+        self.connect = connect
+        self.minsize = config["min"]
+        self.maxsize = config["max"]
+        self.limit = min(max(config["target"], self.minsize), self.maxsize)
+        self.ping_interval = config["ping_interval"]
+        self.resize_interval = config["resize_interval"]
+        self.grow_wait_ms = config["grow_wait_ms"]
+        self.shrink_wait_ms = config["shrink_wait_ms"]
+        self.idle = deque()
+        self.in_use = set()
+        self.opening = 0
+        self.waiters = 0
+        self.waits = Histogram()
+        self._cond = asyncio.Condition()
+        self._task = None
+        self._closed = False
+
+    @property
+    def size(self):
+        """
+        Count the connections of the pool.
+
+        :return: The amount of open and opening connections.
+        """
+        return len(self.idle) + len(self.in_use) + self.opening
+
+    def status(self):
+        """
+        Return the current counters of the pool.
+
+        :return: A dict with the in-use, idle, waiter, size and limit counts.
+        """
+        return {"in_use": len(self.in_use), "idle": len(self.idle), "waiters": self.waiters,
+                "size": self.size, "limit": self.limit}
+
+    async def start(self):
+        """
+        Open connections up to the size limit and start the background maintenance.
+        """
+        await self._fill(self.limit)
+        self._task = asyncio.create_task(self._maintain())
+
+    @asynccontextmanager
+    async def acquire(self):
+        """
+        Borrow a connection from the pool.
+
+        :return: A connection that is given back when the block finishes.
+        """
+        conn = await self._acquire()
+        try:
+            yield conn
+        finally:
+            await self._release(conn)
+
+    def close(self):
+        """
+        Stop the maintenance and close all idle connections.
+        Connections in use are closed when they are given back.
+        """
+        self._closed = True
+        if self._task is not None:
+            self._task.cancel()
+        while self.idle:
+            self.idle.popleft()[0].close()
+
+    async def wait_closed(self):
+        """
+        Wait until every borrowed connection was given back.
+        """
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        async with self._cond:
+            self._cond.notify_all()
+            await self._cond.wait_for(lambda: not self.in_use and not self.opening)
+
+    async def _acquire(self):
+        """
+        Take an idle connection or open a new one while the pool is below its limit.
+
+        :return: A connection.
+        """
+        started = time.perf_counter()
+        async with self._cond:
+            while not self.idle and self.size >= self.limit:
+                if self._closed:
+                    raise RuntimeError("Cannot acquire a connection from a closed pool")
+                self.waiters += 1
+                try:
+                    await self._cond.wait()
+                finally:
+                    self.waiters -= 1
+            if self._closed:
+                raise RuntimeError("Cannot acquire a connection from a closed pool")
+            if self.idle:
+                conn = self.idle.pop()[0]
+                self.in_use.add(conn)
+                self.waits.add((time.perf_counter() - started) * 1000)
+                return conn
+            self.opening += 1
+        try:
+            conn = await self.connect()
+        except BaseException:
+            async with self._cond:
+                self.opening -= 1
+                self._cond.notify()
+            raise
+        async with self._cond:
+            self.opening -= 1
+            self.in_use.add(conn)
+        self.waits.add((time.perf_counter() - started) * 1000)
+        return conn
+
+    async def _release(self, conn):
+        """
+        Give a connection back, closing it if it is broken or the pool shrank.
+
+        :param conn: The connection.
+        """
+        async with self._cond:
+            self.in_use.discard(conn)
+            if (self._closed or conn.closed or conn.get_transaction_status()
+                    or self.size >= self.limit):
+                conn.close()
+            else:
+                self.idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    async def _fill(self, size):
+        """
+        Open connections concurrently until the pool has the given size.
+
+        :param size: The size to reach.
+        """
+        async with self._cond:
+            missing = max(size - self.size, 0)
+            self.opening += missing
+        results = await asyncio.gather(*[self.connect() for _ in range(missing)],
+                                       return_exceptions=True)
+        async with self._cond:
+            self.opening -= missing
+            for conn in results:
+                if isinstance(conn, Exception):
+                    logging.warning("Opening a pooled connection failed: %s", conn)
+                elif self._closed:
+                    conn.close()
+                else:
+                    self.idle.append((conn, time.monotonic()))
+            self._cond.notify_all()
+
+    async def _ping_idle(self):
+        """
+        Ping the connections that were idle for a full ping interval and drop dead ones.
+        """
+        deadline = time.monotonic() - self.ping_interval
+        async with self._cond:
+            stale = [conn for conn, last_used in self.idle if last_used < deadline]
+            self.idle = deque((conn, last_used) for conn, last_used in self.idle
+                              if last_used >= deadline)
+            self.in_use.update(stale)
+        for conn in stale:
+            try:
+                await conn.ping(reconnect=False)
+            except Exception as e:
+                logging.info("Dropped a dead pooled connection: %s", e)
+                conn.close()
+            await self._release(conn)
+
+    def _resize(self):
+        """
+        Move the size limit based on the acquire waits since the last resize.
+        """
+        p95 = self.waits.percentile(0.95)
+        if self.waits.count and p95 > self.grow_wait_ms and self.limit < self.maxsize:
+            self.limit = min(self.limit + max(self.waiters, 1), self.maxsize)
+            logging.info("Pool limit raised to %s (p95 acquire wait %s ms)", self.limit, p95)
+        elif p95 <= self.shrink_wait_ms and not self.waiters and self.limit > self.minsize \
+                and len(self.idle) > 1:
+            self.limit -= 1
+            self.idle.popleft()[0].close()
+            logging.info("Pool limit lowered to %s", self.limit)
+        self.waits = Histogram()
+
+    async def _maintain(self):
+        """
+        Ping idle connections, resize the limit and keep the minimum size open.
+        """
+        last_resize = time.monotonic()
+        while not self._closed:
+            await asyncio.sleep(min(self.ping_interval, self.resize_interval))
+            try:
+                await self._ping_idle()
+                if time.monotonic() - last_resize >= self.resize_interval:
+                    async with self._cond:
+                        self._resize()
+                        self._cond.notify_all()
+                    last_resize = time.monotonic()
+                await self._fill(self.minsize)
+            except Exception as e:
+                logging.error("Pool maintenance failed: %s", e)
@@ -0,0 +1,90 @@
+"""
+In-memory cache for the daily and robbing cooldowns.
+
+This module provides a CooldownCache class that remembers when users last claimed
+their daily reward and when they may rob again, so eligibility checks need no query.
+"""
+import datetime
+
+
+def as_date(value):
+    """
+    Convert a DATE or DATETIME value returned by the database to a date.
+
+    :param value: A datetime.date or datetime.datetime.
+    :return: A datetime.date.
+    """
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    return value
+
+
+class CooldownCache:
+    """
+        Cooldown dates per user, valid until the date rolls over.
+
+        Dates are compared against the local date, which follows the timezone
+        configured with the TZ environment variable.
+    """
+    def __init__(self):
+        """
+        Initialize an empty cache for the current date.
+        """
+        self.day = datetime.date.today()
+        self.last_daily = {}
+        self.next_robbing = {}
+
+    def today(self):
+        """
+        Return the current date and drop entries that expired with the last rollover.
+
+        :return: A datetime.date.
+        """
+        today = datetime.date.today()
+        if today != self.day:
+            self.day = today
+            self.last_daily.clear()
+            self.next_robbing = {userid: next_robbing
+                                 for userid, next_robbing in self.next_robbing.items()
+                                 if next_robbing > today}
+        return today
+
+    def daily_claimable(self, userid):
+        """
+        Check if a given user ID can claim the daily reward.
+
+        :param userid: The ID of the user.
+        :return: True or False, or None if the user is not cached.
+        """
+        today = self.today()
+        last_daily = self.last_daily.get(int(userid))
+        return None if last_daily is None else last_daily < today
+
+    def set_daily(self, userid, last_daily):
+        """
+        Remember the last daily claim of a given user ID.
+
+        :param userid: The ID of the user.
+        :param last_daily: The date of the last claim.
+        """
+        self.last_daily[int(userid)] = as_date(last_daily)
+
+    def can_rob(self, userid):
+        """
+        Check if a given user ID can rob.
+
+        :param userid: The ID of the user.
+        :return: A tuple (can_rob, next_robbing_date), or None if the user is not cached.
+        """
+        today = self.today()
+        next_robbing = self.next_robbing.get(int(userid))
+        return None if next_robbing is None else (today >= next_robbing, next_robbing)
+
+    def set_robbing(self, userid, next_robbing):
+        """
+        Remember the next robbing date of a given user ID.
+
+        :param userid: The ID of the user.
+        :param next_robbing: The date the user may rob again.
+        """
+        self.next_robbing[int(userid)] = as_date(next_robbing)
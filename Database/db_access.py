@@ -1,79 +1,231 @@
 """
-Database access module using aiomysql for asynchronous MySQL operations.
+Database access module for the money, daily, robbing and users tables.
 
-This module provides a DbController class to manage database connections and execute queries.
+This module provides a DbController class that serves the bot's queries from in-memory
+caches and a pluggable storage backend (MySQL, SQLite or in-memory).
 """
 import os
 import datetime
+import itertools
 import logging
-import aiomysql
-
+from Database.balance_cache import BalanceCache
+from Database.cooldown_cache import CooldownCache
+from Database.leaderboard import Leaderboard
+from Database.ledger import LedgerWriter
+from Database.memory_backend import MemoryBackend
+from Database.mysql_backend import MySqlBackend
+from Database.sqlite_backend import SqliteBackend
+from Database.storage import USER_TABLES, INITIAL_MONEY, DAILY_REWARD, daily_bonus, \
+    apply_transfers
+
+def create_backend(name):
+    """
+    Create the storage backend with a given name.
 
+    :param name: "mysql", "sqlite" (file from DB_PATH) or "memory".
+    :return: A StorageBackend.
+    """
+    if name == "mysql":
+        return MySqlBackend()
+    if name == "sqlite":
+        return SqliteBackend(os.getenv('DB_PATH', 'bot.db'))
+    if name == "memory":
+        return MemoryBackend()
+    raise ValueError(f"Unknown storage backend: {name}")
 
 class DbController:
     """
-        Controller for managing database connections and executing queries.
+        Controller for managing the storage backend and serving queries.
     """
-    def __init__(self):
+    def __init__(self, backend=None):
         """
-        Initialize the DbController with a connection pool set to None.
+        Initialize the DbController with an empty index of already provisioned users
+        per table. Without a backend, DB_BACKEND selects one when the pool is initialized.
+
+        :param backend: An optional StorageBackend to use.
         """
-        self.pool = None
+        self.backend = backend
+        self.known_users = {table: set() for table in USER_TABLES}
+        self.leaderboard = Leaderboard()
+        self.cooldowns = CooldownCache()
+        self.open_bets = {}
+        self.hold_ids = itertools.count(1)
+        self.balance_cache = None
+        self.ledger = None
+        self.opened = False
 
     async def init_pool(self):
         """
-        Initialize the connection pool using aiomysql
-        with parameters from environment variables.
-        """
-        self.pool = await aiomysql.create_pool(
-            user=os.getenv('DB_USER'),
-            password=os.getenv('DB_PASSWORD'),
-            host=os.getenv('DB_HOST'),
-            port=3306,
-            db=os.getenv('DB_NAME'),
-            minsize=1,
-            maxsize=10,
-            autocommit=True
+        Open the storage backend selected with DB_BACKEND (mysql by default)
+        and migrate its schema to the latest version.
+        If DB_WRITE_BEHIND_MS is set, balances are cached and flushed in that interval.
+        Ledger entries are appended every DB_LEDGER_MS (default 1000) and the changed
+        balances are snapshotted every DB_LEDGER_SNAPSHOT_S (default 3600).
+        Repeated calls, e.g. from on_ready after a reconnect, do nothing while the pool is
+        open, so bets of running games are not swept as orphaned.
+        """
+        if self.opened:
+            return
+        self.opened = True
+        try:
+            await self._open_pool()
+        except BaseException:
+            self.opened = False
+            raise
+
+    async def _open_pool(self):
+        """
+        Open the backend, sweep orphaned bets and start the cache and ledger tasks.
+        """
+        if self.backend is None:
+            self.backend = create_backend(os.getenv('DB_BACKEND', 'mysql'))
+        await self.backend.open()
+        await self.backend.migrate()
+        await self.load_known_users()
+        await self.sweep_bets()
+        if self.balance_cache:
+            # Held money is flushed with the balances, so the cached bets are refunded
+            await self.balance_cache.close()
+            self.balance_cache = None
+            self.open_bets.clear()
+        if os.getenv('DB_WRITE_BEHIND_MS'):
+            self.balance_cache = BalanceCache(
+                self,
+                interval=int(os.getenv('DB_WRITE_BEHIND_MS')) / 1000,
+                batch_size=int(os.getenv('DB_WRITE_BEHIND_ROWS', '100')),
+                max_dirty=int(os.getenv('DB_WRITE_BEHIND_MAX', '1000'))
+            )
+            self.balance_cache.start()
+        if self.ledger:
+            await self.ledger.close()
+        self.ledger = LedgerWriter(
+            self,
+            interval=int(os.getenv('DB_LEDGER_MS', '1000')) / 1000,
+            snapshot_interval=float(os.getenv('DB_LEDGER_SNAPSHOT_S', '3600'))
         )
+        self.ledger.start()
 
     async def close_pool(self):
         """
-        Close the connection pool.
+        Write all cached balances and ledger entries and close the storage backend.
         """
-        self.pool.close()
-        await self.pool.wait_closed()
+        if self.backend is None or not self.opened:
+            return
+        self.opened = False
+        if self.ledger:
+            await self.ledger.close()
+        if self.balance_cache:
+            await self.balance_cache.close()
+        await self.backend.close()
 
-    async def execute_query(self, query, params=None):
+    async def load_known_users(self):
+        """
+        Load the identifiers of all provisioned users per table with a single query.
         """
-        Execute a SQL query with optional parameters.
+        for table in self.known_users.values():
+            table.clear()
+        for table, identifier in await self.backend.load_known_users():
+            self.known_users[table].add(int(identifier))
 
-        :param query: The SQL query to execute.
-        :param params: Optional parameters for the SQL query.
-        :return: The result of the query.
+    def user_exists_in_table(self, table, userid):
         """
-        async with self.pool.acquire() as conn, conn.cursor() as cur:
-            await cur.execute(query, params)
-            result = await cur.fetchall()
-            return result
+        Check if a user exists in a given table using the in-memory index.
 
-    async def get_users_with_money(self):
+        :param table: The table to check.
+        :param userid: The ID of the user.
+        :return: True if the user exists, False otherwise.
+        """
+        return int(userid) in self.known_users[table]
+
+    async def provision_user(self, userid, *tables):
         """
-        Retrieve all users ordered by their money in descending order.
+        Create the rows for a given user ID in the users table and the given tables.
+        Existing rows are left untouched, all inserts run in a single round trip.
 
-        :return: The result of the query.
+        :param userid: The ID of the user.
+        :param tables: The tables the user needs a row in.
         """
-        query = "SELECT * FROM `money` ORDER BY money DESC"
-        return await self.execute_query(query)
+        await self.provision_users([userid], *tables)
+
+    async def provision_users(self, userids, *tables):
+        """
+        Create the rows for several user IDs in the users table and the given tables.
+        Existing rows are left untouched, all inserts run in a single round trip.
+
+        :param userids: The IDs of the users.
+        :param tables: The tables the users need a row in.
+        """
+        missing = [(name, userid) for userid in dict.fromkeys(int(userid) for userid in userids)
+                   for name in ("users", *tables)
+                   if not self.user_exists_in_table(name, userid)]
+        if missing:
+            await self.backend.provision(missing)
+        for name, userid in missing:
+            self.known_users[name].add(userid)
+            if name == "money":
+                self.leaderboard.update(userid, INITIAL_MONEY)
+
+    async def get_users_with_money(self, limit):
+        """
+        Retrieve the richest users ordered by their money in descending order.
+
+        :param limit: The maximum amount of users to retrieve.
+        :return: A list of (identifier, money) rows.
+        """
+        return await self.backend.top_money(limit)
+
+    async def stream_rows(self, table, chunk_size=500):
+        """
+        Read all rows of an exported table chunk by chunk, ordered by their identifier.
+        Only one chunk is held in memory at a time, cached balances are flushed first.
+
+        :param table: "money", "daily" or "robbing".
+        :param chunk_size: The maximum amount of rows per chunk.
+        :return: An async generator of lists of rows with the columns of EXPORT_COLUMNS.
+        """
+        if table == "money" and self.balance_cache:
+            await self.balance_cache.flush()
+        async for chunk in self.backend.stream_rows(table, chunk_size):
+            yield chunk
+
+    async def import_rows(self, table, rows):
+        """
+        Write a chunk of exported rows, replacing existing rows.
+        Missing users are provisioned and the caches of the written users are updated.
+
+        :param table: "money", "daily" or "robbing".
+        :param rows: A list of rows with the columns of EXPORT_COLUMNS.
+        """
+        rows = [(int(row[0]), *row[1:]) for row in rows]
+        userids = [row[0] for row in rows]
+        await self.provision_users(userids)
+        await self.backend.import_rows(table, rows)
+        self.known_users[table].update(userids)
+        if table == "money":
+            if self.balance_cache:
+                self.balance_cache.evict(userids)
+            self.leaderboard.seeded = False
+        elif table == "daily":
+            for userid, last_daily, _ in rows:
+                if userid in self.cooldowns.last_daily:
+                    self.cooldowns.set_daily(userid, last_daily)
+        else:
+            for userid, next_robbing in rows:
+                if userid in self.cooldowns.next_robbing:
+                    self.cooldowns.set_robbing(userid, next_robbing)
 
-    async def create_new_user(self, userid):
+    async def get_leaderboard(self):
         """
-        Create a new user with the given user ID.
+        Retrieve the top users from the in-memory leaderboard.
+        The leaderboard is only seeded from the database when it is stale.
 
-        :param userid: The ID of the user to create.
-        :return: The result of the query.
+        :return: A list of (identifier, money) tuples ordered by money in descending order.
         """
-        query = 'insert into users values (%s, "user")'
-        return await self.execute_query(query, (userid,))
+        if not self.leaderboard.seeded:
+            if self.balance_cache:
+                await self.balance_cache.flush()
+            self.leaderboard.seed(await self.get_users_with_money(self.leaderboard.depth))
+        return self.leaderboard.top()
 
     async def get_money_for_user(self, userid):
         """
@@ -83,17 +235,51 @@ class DbController:
         :param userid: The ID of the user.
         :return: The amount of money the user has.
         """
-        if await self.user_exists_in_table('money', userid):
-            query = "SELECT money FROM money WHERE identifier = %s"
-            result = await self.execute_query(query, (userid,))
-            if result:
-                return result[0][0]
-        else:
-            if not await self.user_exists_in_table("users", userid):
-                await self.create_new_user(userid)
-            query = "INSERT INTO money (identifier, money) VALUES (%s, %s)"
-            await self.execute_query(query, (userid, 1000))
-            return 1000
+        if self.balance_cache:
+            return await self.balance_cache.get(userid)
+        return await self.read_money_for_user(userid)
+
+    async def read_money_for_user(self, userid):
+        """
+        Read the amount of money for a given user ID from the database,
+        bypassing the balance cache.
+
+        :param userid: The ID of the user.
+        :return: The amount of money the user has.
+        """
+        return (await self.read_money_for_users([userid]))[int(userid)]
+
+    async def get_money_for_users(self, userids):
+        """
+        Retrieve the amount of money for several user IDs at once.
+        Users that do not exist yet are created with the initial money.
+
+        :param userids: The IDs of the users.
+        :return: A dict mapping the user IDs to the amount of money they have.
+        """
+        if self.balance_cache:
+            return await self.balance_cache.get_many(userids)
+        return await self.read_money_for_users(userids)
+
+    async def read_money_for_users(self, userids):
+        """
+        Read the amount of money for several user IDs from the database with a single
+        query, bypassing the balance cache. Missing users are provisioned in one batch.
+
+        :param userids: The IDs of the users.
+        :return: A dict mapping the user IDs to the amount of money they have.
+        """
+        userids = list(dict.fromkeys(int(userid) for userid in userids))
+        known = [userid for userid in userids if self.user_exists_in_table('money', userid)]
+        balances = {}
+        if known:
+            balances = await self.backend.read_money(known)
+        missing = [userid for userid in userids if userid not in balances]
+        if missing:
+            self.known_users['money'].difference_update(missing)
+            await self.provision_users(missing, 'money')
+            balances.update(dict.fromkeys(missing, INITIAL_MONEY))
+        return balances
 
     async def set_money_for_user(self, userid, money):
         """
@@ -102,111 +288,388 @@ class DbController:
         :param userid: The ID of the user.
         :param money: The amount of money to set.
         """
-        query = "UPDATE money SET money = %s WHERE identifier = %s"
-        await self.execute_query(query, (money, userid))
+        userid = int(userid)
+        if self.balance_cache:
+            await self.provision_user(userid, 'money')
+            async with self.balance_cache.lock(userid):
+                previous = await self.balance_cache.get(userid)
+                await self.balance_cache.set(userid, money)
+        else:
+            if not self.user_exists_in_table('money', userid):
+                await self.provision_user(userid, 'money')
+            previous = await self.backend.set_money(userid, money)
+            if previous is None:
+                self.known_users['money'].discard(userid)
+                await self.provision_user(userid, 'money')
+                previous = await self.backend.set_money(userid, money)
+        self.leaderboard.update(userid, money)
+        self.record(userid, money - previous, money, "admin")
 
-    async def get_daily(self, userid):
+    async def write_balances(self, balances):
         """
-        Check if the user can receive a daily reward.
-        If the user does not exist, create the user and set initial daily data.
+        Write several balances with a single multi-row upsert.
+
+        :param balances: A dict mapping user IDs to their amount of money.
+        """
+        await self.backend.write_balances(balances)
+
+    async def adjust_money(self, userid, delta, floor=0, game="adjust", reference=None):
+        """
+        Atomically add a delta to the money of a given user ID.
+        The balance never drops below the given floor.
 
         :param userid: The ID of the user.
-        :return: True if the user can receive a daily reward, False otherwise.
+        :param delta: The amount to add (negative to subtract).
+        :param floor: The lowest balance the user can end up with (not negative).
+        :param game: The game or action recorded in the ledger.
+        :param reference: An optional reference recorded in the ledger.
+        :return: The new amount of money the user has.
+        """
+        if self.balance_cache:
+            async with self.balance_cache.lock(userid):
+                previous = await self.balance_cache.get(userid)
+                money = max(previous + delta, floor)
+                await self.balance_cache.set(userid, money)
+            self.leaderboard.update(userid, money)
+            self.record(userid, money - previous, money, game, reference)
+            return money
+        userid = int(userid)
+        if not self.user_exists_in_table('money', userid):
+            await self.provision_user(userid, 'money')
+        adjusted = await self.backend.adjust_money(userid, delta, floor)
+        if adjusted is None:
+            self.known_users['money'].discard(userid)
+            await self.provision_user(userid, 'money')
+            adjusted = await self.backend.adjust_money(userid, delta, floor)
+        previous, money = adjusted
+        self.leaderboard.update(userid, money)
+        self.record(userid, money - previous, money, game, reference)
+        return money
+
+    async def debit_money(self, userid, amount, game="debit", reference=None):
+        """
+        Atomically withdraw an amount from a given user ID if the user can cover it.
+
+        :param userid: The ID of the user.
+        :param amount: The amount to withdraw.
+        :param game: The game or action recorded in the ledger.
+        :param reference: An optional reference recorded in the ledger.
+        :return: The new amount of money the user has, or None if the funds are short.
+        """
+        if self.balance_cache:
+            async with self.balance_cache.lock(userid):
+                money = await self.balance_cache.get(userid)
+                if money < amount:
+                    return None
+                money -= amount
+                await self.balance_cache.set(userid, money)
+            self.leaderboard.update(userid, money)
+            self.record(userid, -amount, money, game, reference)
+            return money
+        userid = int(userid)
+        if not self.user_exists_in_table('money', userid):
+            await self.provision_user(userid, 'money')
+        money = await self.backend.debit_money(userid, amount)
+        if money is None and await self.get_money_for_user(userid) >= amount:
+            money = await self.backend.debit_money(userid, amount)
+        if money is None:
+            return None
+        self.leaderboard.update(userid, money)
+        self.record(userid, -amount, money, game, reference)
+        return money
+
+    async def transfer(self, from_id, to_id, amount, game="transfer"):
+        """
+        Atomically move an amount of money from one user ID to another.
+
+        :param from_id: The ID of the paying user.
+        :param to_id: The ID of the receiving user.
+        :param amount: The amount to move.
+        :param game: The game or action recorded in the ledger.
+        :return: A tuple (from_money, to_money), or None if the payer cannot cover the amount.
+        """
+        return (await self.transfer_many([(from_id, to_id, amount)], game))[0]
+
+    async def transfer_many(self, transfers, game="transfer"):
+        """
+        Settle several transfers in a single transaction.
+        All involved rows are locked at once in the order of their identifier,
+        so concurrent transfers cannot deadlock each other. Transfers are applied in
+        the given order, a transfer the payer cannot cover is skipped.
+
+        :param transfers: A list of (from_id, to_id, amount) tuples.
+        :param game: The game or action recorded in the ledger.
+        :return: A list with a tuple (from_money, to_money) or None per transfer.
+        """
+        userids = sorted({int(userid) for from_id, to_id, _ in transfers
+                          for userid in (from_id, to_id)})
+        if self.balance_cache:
+            async with self.balance_cache.locked(userids):
+                balances = await self.balance_cache.get_many(userids)
+                results = apply_transfers(balances, transfers)
+                for userid, money in balances.items():
+                    await self.balance_cache.set(userid, money)
+        else:
+            await self.provision_users(userids, 'money')
+            balances, results = await self.backend.transfer_many(userids, transfers)
+        for userid, money in balances.items():
+            self.leaderboard.update(userid, money)
+        for (from_id, to_id, amount), result in zip(transfers, results):
+            if result is not None:
+                self.record(from_id, -amount, result[0], game, f"to:{to_id}")
+                self.record(to_id, amount, result[1], game, f"from:{from_id}")
+        return results
+
+    async def reserve_bet(self, userid, amount, game):
         """
-        if await self.user_exists_in_table('daily', userid):
-            query = """
-                SELECT CASE WHEN EXISTS (
-                    SELECT * FROM daily
-                    WHERE identifier = %s
-                    AND last_daily < CURDATE()
-                )
-                THEN 1
-                ELSE 0 END;
-            """
-            result = await self.execute_query(query, (userid,))
-            return bool(result[0][0]) if result else False
-        if not await self.user_exists_in_table("users", userid):
-            await self.create_new_user(userid)
-        query = "INSERT INTO daily (identifier, last_daily, streak) VALUES (%s, CURDATE(), 0)"
-        await self.execute_query(query, (userid,))
-        return True
+        Atomically move a bet from the balance of a user ID into escrow.
+        With the balance cache the hold is kept in memory only.
+
+        :param userid: The ID of the user.
+        :param amount: The amount to hold.
+        :param game: The name of the game the bet is placed in.
+        :return: The ID of the hold, or None if the user cannot cover the bet.
+        """
+        if self.balance_cache:
+            async with self.balance_cache.lock(userid):
+                if await self.balance_cache.get(userid) < amount:
+                    return None
+                money = self.balance_cache.hold(userid, amount)
+            hold_id = next(self.hold_ids)
+        else:
+            await self.provision_user(userid, 'money')
+            reserved = await self.backend.reserve_bet(int(userid), amount, game)
+            if reserved is None:
+                return None
+            hold_id, money = reserved
+        self.open_bets[hold_id] = (int(userid), amount, game)
+        self.leaderboard.update(userid, money)
+        self.record(userid, -amount, money, game, f"hold:{hold_id}")
+        return hold_id
+
+    async def settle_bet(self, hold_id, multiplier):
+        """
+        Release a hold and credit the payout to its user.
+
+        :param hold_id: The ID of the hold.
+        :param multiplier: The payout as a multiple of the bet (0 lost, 1 refunded).
+        :return: The new amount of money the user has, or None if the hold is already released.
+        """
+        if self.balance_cache:
+            if hold_id not in self.open_bets:
+                return None
+            userid, amount, game = self.open_bets.pop(hold_id)
+            async with self.balance_cache.lock(userid):
+                money = await self.balance_cache.release(userid, amount,
+                                                         int(amount * multiplier))
+        else:
+            _, amount, game = self.open_bets.pop(hold_id, (None, 0, "bet"))
+            settled = await self.backend.settle_bet(hold_id, multiplier)
+            if settled is None:
+                return None
+            userid, money = settled
+        self.leaderboard.update(userid, money)
+        self.record(userid, int(amount * multiplier), money, game, f"hold:{hold_id}")
+        return money
+
+    async def refund_bet(self, hold_id):
+        """
+        Release a hold and give the bet back to its user.
 
-    async def set_streak(self, userid, streak):
+        :param hold_id: The ID of the hold.
+        :return: The new amount of money the user has, or None if the hold is already released.
         """
-        Set the streak for a given user ID.
-        If the streak is less than or equal to 61, update the streak, otherwise reset it.
+        return await self.settle_bet(hold_id, 1)
+
+    async def refund_open_bets(self, userid):
+        """
+        Refund every hold of a given user ID that has not been settled yet.
 
         :param userid: The ID of the user.
-        :param streak: The streak value to set.
         """
-        query = """
-            SELECT CASE WHEN EXISTS (
-                SELECT * FROM daily
-                WHERE identifier = %s
-                AND last_daily + INTERVAL 1 DAY = CURDATE()
-            )
-            THEN 1
-            ELSE 0 END;
-        """
-        result = await self.execute_query(query, (userid,))
-        update = bool(result[0][0]) if result else False
-        if update:
-            if streak <= 61:
-                query = "UPDATE daily SET streak = %s WHERE identifier = %s"
-                await self.execute_query(query, (streak, userid))
+        for hold_id in [hold for hold, (owner, *_) in self.open_bets.items()
+                        if owner == int(userid)]:
+            await self.refund_bet(hold_id)
+
+    async def sweep_bets(self):
+        """
+        Refund all holds left over from a previous run, e.g. after a crash.
+        """
+        orphaned = await self.backend.sweep_bets()
+        if not orphaned:
+            return
+        self.leaderboard.seeded = False
+        logging.info("Refunded %s orphaned bets", orphaned)
+
+    async def bulk_update_money(self, update, dry_run):
+        """
+        Run a set-based update of the money table.
+        The balance cache is held for the whole update, so no balance changes in between.
+        It is flushed before and reloaded after the update,
+        the leaderboard is seeded again on the next read.
+
+        :param update: A coroutine function taking dry_run and returning the matched rows.
+        :param dry_run: Whether to only count the rows that would change.
+        :return: The amount of matched rows.
+        """
+        if dry_run:
+            return await update(True)
+        if self.balance_cache:
+            async with self.balance_cache.exclusive():
+                await self.balance_cache.flush()
+                matched = await update(False)
+                await self.balance_cache.reload()
         else:
-            query = "UPDATE daily SET streak = 0 WHERE identifier = %s"
-            await self.execute_query(query, (userid,))
+            matched = await update(False)
+        self.leaderboard.seeded = False
+        return matched
+
+    async def scale_money(self, above, factor, dry_run=True):
+        """
+        Multiply every balance above a threshold by a factor, rounding down.
+
+        :param above: Only balances greater than this are changed.
+        :param factor: The factor, e.g. 0.9 for a tax of 10 percent.
+        :param dry_run: Whether to only count the users that would change.
+        :return: The amount of matched users.
+        """
+        return await self.bulk_update_money(
+            lambda dry: self.backend.scale_money(above, factor, dry), dry_run)
+
+    async def cap_money(self, cap, dry_run=True):
+        """
+        Lower every balance above a cap to the cap.
+
+        :param cap: The highest balance a user can have.
+        :param dry_run: Whether to only count the users that would change.
+        :return: The amount of matched users.
+        """
+        return await self.bulk_update_money(
+            lambda dry: self.backend.cap_money(cap, dry), dry_run)
+
+    async def credit_money(self, userids, amount, dry_run=True):
+        """
+        Add an amount to the balances of several user IDs.
+        Users that do not exist yet are created with the initial money first.
+
+        :param userids: The IDs of the users.
+        :param amount: The amount to add.
+        :param dry_run: Whether to only count the users that would change.
+        :return: The amount of matched users.
+        """
+        userids = list(dict.fromkeys(int(userid) for userid in userids))
+        if dry_run:
+            known = [userid for userid in userids if self.user_exists_in_table('money', userid)]
+            return await self.backend.credit_money(known, amount, True) \
+                + len(userids) - len(known)
+        await self.provision_users(userids, 'money')
+        return await self.bulk_update_money(
+            lambda dry: self.backend.credit_money(userids, amount, dry), dry_run)
 
-    async def get_streak_bonus(self, userid: int):
+    async def reset_streaks(self, dry_run=True):
         """
-        Retrieve the streak bonus for a given user ID. Update the streak accordingly.
+        Reset every daily streak to zero.
+
+        :param dry_run: Whether to only count the users that would change.
+        :return: The amount of matched users.
+        """
+        return await self.backend.reset_streaks(dry_run)
+
+    def record(self, userid, delta, balance, game, reference=None):
+        """
+        Record a balance change in the ledger.
 
         :param userid: The ID of the user.
-        :return: The streak bonus.
+        :param delta: The amount the balance changed by.
+        :param balance: The balance after the change.
+        :param game: The game or action that changed the balance.
+        :param reference: An optional reference, e.g. the hold or the other user.
         """
-        query = """
-            SELECT CASE WHEN EXISTS (
-                SELECT * FROM daily
-                WHERE identifier = %s
-                AND last_daily + INTERVAL 1 DAY = CURDATE()
-            )
-            THEN (SELECT streak + 1 FROM daily WHERE identifier = %s)
-            ELSE 0 END;
+        if self.ledger:
+            self.ledger.record(userid, delta, balance, game, reference)
+
+    async def append_ledger(self, entries):
+        """
+        Append a batch of ledger entries with a single insert.
+
+        :param entries: A list of (identifier, delta, balance, game, reference, created_at)
+            tuples.
+        """
+        await self.backend.append_ledger(entries)
+
+    async def snapshot_ledger(self, userids):
         """
-        result = await self.execute_query(query, (userid, userid))
-        streak = int(result[0][0]) if result else 0
-        bonus = min(streak * 5, 300)
-        await self.set_streak(userid, streak)
-        return bonus
+        Snapshot the balances of several user IDs, writing cached balances first.
 
-    async def set_daily(self, userid):
+        :param userids: The IDs of the users.
         """
-        Set the last daily date to the current date for a given user ID.
+        if self.balance_cache:
+            await self.balance_cache.flush()
+        await self.backend.snapshot_ledger(userids)
+
+    async def get_history(self, userid, before=None, limit=10):
+        """
+        Retrieve a page of the ledger of a given user ID, newest entries first.
+        Pages are addressed by the ID of the last entry of the previous page,
+        so every page costs a single index range scan.
 
         :param userid: The ID of the user.
+        :param before: The ID of the last entry of the previous page, None for the first page.
+        :param limit: The maximum amount of entries.
+        :return: A list of (id, delta, balance, game, reference, created_at) tuples.
         """
-        query = "UPDATE daily SET last_daily = CURDATE() WHERE identifier = %s"
-        await self.execute_query(query, (userid,))
+        if self.ledger:
+            await self.ledger.flush()
+        return await self.backend.read_ledger(int(userid), before, limit)
 
-    async def user_exists_in_table(self, table, userid):
+    async def get_daily(self, userid):
         """
-        Check if a user exists in a given table.
+        Check if the user can receive a daily reward.
+        If the user does not exist, create the user and set initial daily data.
+        The answer is served from the cooldown cache after the first read.
 
-        :param table: The table to check.
         :param userid: The ID of the user.
-        :return: True if the user exists, False otherwise.
+        :return: True if the user can receive a daily reward, False otherwise.
         """
-        query = f"""
-            SELECT CASE WHEN EXISTS (
-                SELECT * FROM {table}
-                WHERE identifier = %s
-            )
-            THEN 1
-            ELSE 0 END;
+        claimable = self.cooldowns.daily_claimable(userid)
+        if claimable is not None:
+            return claimable
+        if self.user_exists_in_table('daily', userid):
+            last_daily = await self.backend.read_daily(int(userid))
+            if last_daily is None:
+                return False
+            self.cooldowns.set_daily(userid, last_daily)
+            return self.cooldowns.daily_claimable(userid)
+        await self.provision_user(userid, 'daily')
+        self.cooldowns.set_daily(userid, self.cooldowns.today() - datetime.timedelta(days=2))
+        return True
+
+    async def claim_daily(self, userid):
         """
-        result = await self.execute_query(query, (userid,))
-        return bool(result[0][0]) if result else False
+        Claim the daily reward for a given user ID in a single transaction.
+        Checks the eligibility, advances or resets the streak (at most 61),
+        credits 300 coins plus the streak bonus (at most 300) and stamps the current date.
+        With the balance cache the reward is credited to the cache after the commit.
+        Users that already claimed today are rejected by the cooldown cache without a query.
+
+        :param userid: The ID of the user.
+        :return: A tuple (claimed, bonus, money).
+        """
+        if self.cooldowns.daily_claimable(userid) is False:
+            return False, 0, None
+        await self.provision_user(userid, 'daily', 'money')
+        claimed = await self.backend.claim_daily(int(userid), credit=self.balance_cache is None)
+        self.cooldowns.set_daily(userid, self.cooldowns.today())
+        if claimed is None:
+            return False, 0, None
+        streak, money = claimed
+        bonus = daily_bonus(streak)
+        if self.balance_cache:
+            return True, bonus, await self.adjust_money(userid, DAILY_REWARD + bonus,
+                                                        game="daily")
+        self.leaderboard.update(userid, money)
+        self.record(userid, DAILY_REWARD + bonus, money, "daily")
+        return True, bonus, money
 
     async def set_robbing_timeout(self, userid, auszeit):
         """
@@ -219,15 +682,6 @@ class DbController:
         next_robbing = date + datetime.timedelta(days=auszeit)
         await self.update_robbing(userid, next_robbing)
 
-    async def insert_robbing(self, userid):
-        """
-        Insert a new robbing record for a given user ID.
-
-        :param userid: The ID of the user.
-        """
-        query = "INSERT INTO robbing (identifier, next_robbing) VALUES (%s, CURDATE())"
-        await self.execute_query(query, userid)
-
     async def update_robbing(self, userid, next_robbing):
         """
         Update the robbing date for a given user ID.
@@ -235,25 +689,29 @@ class DbController:
         :param userid: The ID of the user.
         :param next_robbing: The next robbing date.
         """
-        formatted_date = next_robbing.strftime('%Y-%m-%d') if next_robbing else 'CURDATE()'
-        query = "UPDATE robbing SET next_robbing = %s WHERE identifier = %s"
-        await self.execute_query(query, (formatted_date, userid))
+        next_robbing = next_robbing or self.cooldowns.today()
+        await self.backend.write_robbing(int(userid), next_robbing)
+        self.cooldowns.set_robbing(userid, next_robbing)
 
     async def can_rob(self, userid):
         """
         Check if a user can rob.
         If the user does not exist in the robbing table, insert a new record.
+        The answer is served from the cooldown cache after the first read.
 
         :param userid: The ID of the user.
         :return: A tuple (can_rob, next_robbing_date).
         """
-        if await self.user_exists_in_table('robbing', userid):
-            query = "SELECT next_robbing FROM robbing WHERE identifier = %s"
-            result = await self.execute_query(query, (userid,))
-            if result:
-                next_robbing_date = result[0][0]
-                return not (datetime.date.today() < next_robbing_date), next_robbing_date
+        cached = self.cooldowns.can_rob(userid)
+        if cached is not None:
+            return cached
+        if self.user_exists_in_table('robbing', userid):
+            next_robbing = await self.backend.read_robbing(int(userid))
+            if next_robbing is not None:
+                self.cooldowns.set_robbing(userid, next_robbing)
+                return self.cooldowns.can_rob(userid)
             logging.error("The Check Rob made an Error")
             return False, None
-        await self.insert_robbing(userid)
+        await self.provision_user(userid, 'robbing')
+        self.cooldowns.set_robbing(userid, self.cooldowns.today())
         return True, None
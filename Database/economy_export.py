@@ -0,0 +1,128 @@
+"""
+Export and import of the economy tables.
+
+This module streams the money, daily and robbing tables chunk by chunk between the
+DbController and a text file in CSV or JSON Lines format, so the memory used stays
+constant no matter how many users there are.
+"""
+import csv
+import datetime
+import json
+from Database.storage import EXPORT_COLUMNS
+
+FORMATS = ("csv", "jsonl")
+# Header of the CSV format, every line fills the columns of its table
+CSV_COLUMNS = ("table", *dict.fromkeys(column for columns in EXPORT_COLUMNS.values()
+                                       for column in columns))
+
+
+def to_json(value):
+    """
+    Convert a column value to a JSON compatible value.
+
+    :param value: The value as read from the database.
+    :return: Dates as ISO strings, everything else unchanged.
+    """
+    return value.isoformat() if isinstance(value, datetime.date) else value
+
+
+def parse_row(table, record):
+    """
+    Convert an exported record back to a row of its table.
+
+    :param table: A table of EXPORT_COLUMNS.
+    :param record: A dict mapping the columns of the table to their exported values.
+    :return: A tuple with the columns of EXPORT_COLUMNS.
+    :raises ValueError: If a column is missing or has an invalid value.
+    """
+    row = []
+    for column in EXPORT_COLUMNS[table]:
+        value = record.get(column)
+        if value is None or value == "":
+            raise ValueError(f"Column {column} of table {table} is missing")
+        if column in ("last_daily", "next_robbing"):
+            row.append(datetime.date.fromisoformat(value))
+        else:
+            row.append(int(value))
+    return tuple(row)
+
+
+def read_records(file, fmt):
+    """
+    Read the records of an export file line by line.
+
+    :param file: A text file opened for reading.
+    :param fmt: "csv" or "jsonl".
+    :return: A generator of (line, table, row) tuples.
+    :raises ValueError: If a line is not a valid record.
+    """
+    records = csv.DictReader(file) if fmt == "csv" else file
+    for line, record in enumerate(records, start=2 if fmt == "csv" else 1):
+        try:
+            if fmt != "csv":
+                if not record.strip():
+                    continue
+                record = json.loads(record)
+            table = record.get("table")
+            if table not in EXPORT_COLUMNS:
+                raise ValueError(f"unknown table {table}")
+            yield line, table, parse_row(table, record)
+        except (AttributeError, TypeError, ValueError) as e:
+            raise ValueError(f"Line {line}: {e}") from e
+
+
+async def export_economy(db, file, fmt, chunk_size=500):
+    """
+    Write all rows of the exported tables to a text file.
+
+    :param db: The DbController to read from.
+    :param file: A text file opened for writing.
+    :param fmt: "csv" or "jsonl".
+    :param chunk_size: The amount of rows read per chunk.
+    :return: A dict mapping the tables to the amount of exported rows.
+    """
+    counts = dict.fromkeys(EXPORT_COLUMNS, 0)
+    writer = csv.writer(file) if fmt == "csv" else None
+    if writer:
+        writer.writerow(CSV_COLUMNS)
+    for table, columns in EXPORT_COLUMNS.items():
+        async for chunk in db.stream_rows(table, chunk_size):
+            records = [{"table": table, **dict(zip(columns, map(to_json, row)))}
+                       for row in chunk]
+            if writer:
+                writer.writerows([[record.get(column, "") for column in CSV_COLUMNS]
+                                  for record in records])
+            else:
+                file.writelines(json.dumps(record) + "\n" for record in records)
+            counts[table] += len(chunk)
+    return counts
+
+
+async def import_economy(db, file, fmt, chunk_size=500):
+    """
+    Read an export file and write its rows chunk by chunk, replacing existing rows.
+    The whole file is validated before the first row is written.
+
+    :param db: The DbController to write to.
+    :param file: A seekable text file opened for reading.
+    :param fmt: "csv" or "jsonl".
+    :param chunk_size: The amount of rows written per chunk.
+    :return: A dict mapping the tables to the amount of imported rows.
+    :raises ValueError: If a line is not a valid record.
+    """
+    for _ in read_records(file, fmt):
+        pass
+    file.seek(0)
+    counts = dict.fromkeys(EXPORT_COLUMNS, 0)
+    chunks = {table: [] for table in EXPORT_COLUMNS}
+    for _, table, row in read_records(file, fmt):
+        chunks[table].append(row)
+        if len(chunks[table]) >= chunk_size:
+            await db.import_rows(table, chunks[table])
+            counts[table] += len(chunks[table])
+            chunks[table] = []
+    for table, rows in chunks.items():
+        if rows:
+            await db.import_rows(table, rows)
+            counts[table] += len(rows)
+    return counts
@@ -0,0 +1,133 @@
+"""
+Group commit for write statements.
+
+This module provides a GroupCommitter class that coalesces write statements arriving
+within a short window into a single transaction on a single pooled connection.
+"""
+import asyncio
+import logging
+
+WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+def is_write(query):
+    """
+    Check if a SQL statement is a plain data-changing statement.
+
+    :param query: The SQL statement.
+    :return: True if the statement writes rows, False otherwise.
+    """
+    return query.lstrip()[:7].upper().startswith(WRITE_STATEMENTS)
+
+
+class GroupCommitter:
+    """
+        Coalesces concurrent write statements into one transaction.
+
+        Every caller waits until the transaction containing its statement is committed,
+        so callers keep durable, synchronous semantics.
+    """
+    def __init__(self, pool, window=0.003, max_batch=100):
+        """
+        Initialize the committer.
+
+        :param pool: The aiomysql pool to take connections from.
+        :param window: Seconds to wait for more statements after the first one arrived.
+        :param max_batch: Amount of statements that are committed without waiting.
+        """
+        self.pool = pool
+        self.window = window
+        self.max_batch = max_batch
+        self.pending = []
+        self._timer = None
+        self._tasks = set()
+
+    async def submit(self, query, params=None):
+        """
+        Queue a write statement for the next group commit and wait for the commit.
+
+        :param query: The SQL statement to execute.
+        :param params: Optional parameters for the SQL statement.
+        :return: A tuple (result, matched_rows, last_insert_id).
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((query, params, future))
+        if len(self.pending) >= self.max_batch:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._dispatch)
+        return await future
+
+    async def close(self):
+        """
+        Commit all queued statements and wait for running commits.
+        """
+        self._dispatch()
+        while self._tasks:
+            await asyncio.gather(*self._tasks)
+
+    def _dispatch(self):
+        """
+        Hand the queued statements to a new commit task.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self.pending = self.pending, []
+        if batch:
+            task = asyncio.create_task(self._commit(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _commit(self, batch):
+        """
+        Execute a batch in one transaction and a single round trip.
+        If a statement fails, the transaction is rolled back and every statement
+        is executed on its own, so only the failing caller gets the error.
+
+        :param batch: A list of (query, params, future) tuples.
+        """
+        try:
+            async with self.pool.acquire() as conn, conn.cursor() as cur:
+                try:
+                    statements = [cur.mogrify(query, params) for query, params, _ in batch]
+                    await cur.execute(";\n".join(["START TRANSACTION", *statements, "COMMIT"]))
+                    results = []
+                    for _ in batch:
+                        await cur.nextset()
+                        results.append((await cur.fetchall(), cur.rowcount, cur.lastrowid))
+                    while await cur.nextset():
+                        pass
+                except Exception as e:
+                    logging.warning("Group commit of %s statements failed: %s", len(batch), e)
+                    await conn.rollback()
+                    await self._execute_each(cur, batch)
+                    return
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, _, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    @staticmethod
+    async def _execute_each(cur, batch):
+        """
+        Execute every statement of a batch on its own with autocommit.
+
+        :param cur: The cursor to execute the statements with.
+        :param batch: A list of (query, params, future) tuples.
+        """
+        for query, params, future in batch:
+            try:
+                await cur.execute(query, params)
+                result = (await cur.fetchall(), cur.rowcount, cur.lastrowid)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                continue
+            if not future.done():
+                future.set_result(result)
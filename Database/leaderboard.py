@@ -0,0 +1,88 @@
+"""
+In-memory leaderboard for the richest users.
+
+This module provides a Leaderboard class that keeps the top balances in memory
+and is updated incrementally on every balance change made through the DbController.
+"""
+
+
+class Leaderboard:
+    """
+        Incrementally maintained top-N of the money table.
+
+        Besides the shown entries a few more rows are tracked, so users dropping out of
+        the top do not immediately require a new query. Every user that is not tracked
+        has a balance of at most ``floor``.
+    """
+    def __init__(self, size=10, depth=50):
+        """
+        Initialize an empty, unseeded leaderboard.
+
+        :param size: The amount of entries shown on the scoreboard.
+        :param depth: The amount of entries tracked in memory.
+        """
+        self.size = size
+        self.depth = depth
+        self.entries = {}
+        self.floor = None
+        self.complete = False
+        self.seeded = False
+        self.version = 0
+        self._top = []
+        self._dirty = True
+
+    def seed(self, rows):
+        """
+        Replace the tracked entries with the result of a top-``depth`` query.
+
+        :param rows: (identifier, money) rows ordered by money in descending order.
+        """
+        self.entries = {int(identifier): money for identifier, money in rows}
+        self.complete = len(self.entries) < self.depth
+        self.floor = None if self.complete else min(self.entries.values())
+        self.seeded = True
+        self._dirty = True
+
+    def update(self, userid, money):
+        """
+        Apply a new balance of a user to the tracked entries.
+
+        :param userid: The ID of the user.
+        :param money: The new balance of the user.
+        """
+        if not self.seeded:
+            return
+        userid = int(userid)
+        if userid in self.entries:
+            if self.complete or money >= self.floor:
+                if self.entries[userid] == money:
+                    return
+                self.entries[userid] = money
+            else:
+                del self.entries[userid]
+                if len(self.entries) < self.size:
+                    self.seeded = False
+        elif self.complete or money > self.floor:
+            self.entries[userid] = money
+            if len(self.entries) > self.depth:
+                lowest = min(self.entries, key=self.entries.get)
+                self.floor = self.entries.pop(lowest)
+                self.complete = False
+        else:
+            return
+        self._dirty = True
+
+    def top(self):
+        """
+        Return the shown entries. The version is increased whenever they change.
+
+        :return: A list of (identifier, money) tuples ordered by money in descending order.
+        """
+        if self._dirty:
+            top = sorted(self.entries.items(), key=lambda entry: entry[1],
+                         reverse=True)[:self.size]
+            if top != self._top:
+                self._top = top
+                self.version += 1
+            self._dirty = False
+        return self._top
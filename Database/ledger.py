@@ -0,0 +1,124 @@
+"""
+Append-only ledger of balance changes.
+
+This module provides a LedgerWriter class that buffers ledger entries in memory,
+appends them to the database in batched inserts from a background task and
+periodically snapshots the balances of the users that changed since the last snapshot.
+"""
+import asyncio
+import datetime
+import logging
+import time
+
+
+class LedgerWriter:
+    """
+        Buffered writer for the ledger table.
+
+        Entries are only ever inserted, so a flush is a single multi-row INSERT that
+        does not contend with the row locks of the money table.
+    """
+    def __init__(self, db, interval=1.0, batch_size=500, snapshot_interval=3600.0):
+        """
+        Initialize an empty buffer.
+
+        :param db: The DbController used to write entries and snapshots.
+        :param interval: Seconds between two flushes.
+        :param batch_size: Amount of buffered entries that triggers an early flush.
+        :param snapshot_interval: Seconds between two balance snapshots.
+        """
+        self.db = db
+        self.interval = interval
+        self.batch_size = batch_size
+        self.snapshot_interval = snapshot_interval
+        self.entries = []
+        self.touched = set()
+        self.last_snapshot = time.monotonic()
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = None
+        self._closed = False
+
+    def start(self):
+        """
+        Start the background flush task.
+        """
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        """
+        Stop the background flush task and write all remaining entries.
+        """
+        self._closed = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def record(self, userid, delta, balance, game, reference=None):
+        """
+        Buffer a balance change. Changes of zero are not recorded.
+
+        :param userid: The ID of the user.
+        :param delta: The amount the balance changed by.
+        :param balance: The balance after the change.
+        :param game: The game or action that changed the balance.
+        :param reference: An optional reference, e.g. the hold or the other user.
+        """
+        if not delta:
+            return
+        self.entries.append((int(userid), delta, balance, game, reference,
+                             datetime.datetime.now().replace(microsecond=0)))
+        self.touched.add(int(userid))
+        if len(self.entries) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self):
+        """
+        Append all buffered entries with a single insert.
+        """
+        async with self._flush_lock:
+            if not self.entries:
+                return
+            entries, self.entries = self.entries, []
+            try:
+                await self.db.append_ledger(entries)
+            except Exception:
+                self.entries[:0] = entries
+                raise
+
+    async def snapshot(self):
+        """
+        Write all buffered entries and snapshot the balances of every user
+        that changed since the last snapshot.
+        """
+        await self.flush()
+        self.last_snapshot = time.monotonic()
+        if not self.touched:
+            return
+        userids, self.touched = sorted(self.touched), set()
+        try:
+            await self.db.snapshot_ledger(userids)
+        except Exception:
+            self.touched.update(userids)
+            raise
+
+    async def _run(self):
+        """
+        Flush every interval or as soon as enough entries are buffered,
+        and snapshot every snapshot interval.
+        """
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                if time.monotonic() - self.last_snapshot >= self.snapshot_interval:
+                    await self.snapshot()
+                else:
+                    await self.flush()
+            except Exception as e:
+                logging.error("Writing the ledger failed: %s", e)
@@ -0,0 +1,364 @@
+"""
+In-memory storage backend for microbenchmarks and offline tests.
+
+This module provides a MemoryBackend class that keeps all tables in dictionaries.
+Nothing is persisted, all data is lost when the bot stops.
+"""
+import bisect
+import datetime
+import itertools
+import math
+from Database.storage import StorageBackend, INITIAL_MONEY, DAILY_REWARD, daily_bonus, \
+    apply_transfers
+
+
+class MemoryBackend(StorageBackend):
+    """
+        Storage backend keeping every table in a dictionary.
+
+        No method awaits anything, so every method runs atomically on the event loop.
+    """
+    def __init__(self):
+        """
+        Initialize empty tables.
+        """
+        self.users = {}
+        self.money = {}
+        self.daily = {}
+        self.robbing = {}
+        self.escrow = {}
+        self.escrow_ids = itertools.count(1)
+        self.ledger = {}
+        self.ledger_ids = itertools.count(1)
+        self.ledger_snapshots = {}
+
+    async def open(self):
+        """
+        Nothing to connect to, the tables already exist.
+        """
+
+    async def migrate(self):
+        """
+        Nothing to migrate, the tables have no schema.
+        """
+
+    async def close(self):
+        """
+        Nothing to release, the tables are kept until the backend is dropped.
+        """
+
+    async def load_known_users(self):
+        """
+        List the identifiers of all provisioned users per table.
+
+        :return: A list of (table, identifier) tuples.
+        """
+        tables = {"users": self.users, "money": self.money,
+                  "daily": self.daily, "robbing": self.robbing}
+        return [(name, identifier) for name, table in tables.items() for identifier in table]
+
+    async def provision(self, rows):
+        """
+        Create the given rows with their initial values.
+
+        :param rows: A list of (table, identifier) tuples.
+        """
+        today = datetime.date.today()
+        for table, userid in rows:
+            if table == "users":
+                self.users.setdefault(userid, "user")
+            elif table == "money":
+                self.money.setdefault(userid, INITIAL_MONEY)
+            elif table == "daily":
+                # New daily rows are claimable right away and start without a streak
+                self.daily.setdefault(userid, (today - datetime.timedelta(days=2), 0))
+            else:
+                self.robbing.setdefault(userid, today)
+
+    async def top_money(self, limit):
+        """
+        Retrieve the richest users ordered by their money in descending order.
+
+        :param limit: The maximum amount of users to retrieve.
+        :return: A list of (identifier, money) tuples.
+        """
+        return sorted(self.money.items(), key=lambda row: row[1], reverse=True)[:limit]
+
+    async def read_money(self, userids):
+        """
+        Read the amount of money for several user IDs.
+
+        :param userids: The IDs of the users.
+        :return: A dict mapping the found user IDs to the amount of money they have.
+        """
+        return {userid: self.money[userid] for userid in userids if userid in self.money}
+
+    async def stream_rows(self, table, chunk_size):
+        """
+        Read all rows of an exported table ordered by their identifier, chunk by chunk.
+
+        :param table: A table of EXPORT_COLUMNS.
+        :param chunk_size: The maximum amount of rows per chunk.
+        :return: An async generator of lists of rows.
+        """
+        rows = getattr(self, table)
+        identifiers = sorted(rows)
+        for start in range(0, len(identifiers), chunk_size):
+            chunk = []
+            for identifier in identifiers[start:start + chunk_size]:
+                value = rows[identifier]
+                chunk.append((identifier, *value) if isinstance(value, tuple)
+                             else (identifier, value))
+            yield chunk
+
+    async def import_rows(self, table, rows):
+        """
+        Write a chunk of rows of an exported table, replacing existing rows.
+
+        :param table: A table of EXPORT_COLUMNS.
+        :param rows: A list of rows.
+        """
+        target = getattr(self, table)
+        for identifier, *values in rows:
+            target[identifier] = tuple(values) if len(values) > 1 else values[0]
+
+    async def set_money(self, userid, money):
+        """
+        Set the amount of money for a given user ID.
+
+        :param userid: The ID of the user.
+        :param money: The amount of money to set.
+        :return: The previous amount of money the user had, or None if the user has no row.
+        """
+        if userid not in self.money:
+            return None
+        previous, self.money[userid] = self.money[userid], money
+        return previous
+
+    async def write_balances(self, balances):
+        """
+        Write several balances at once, creating missing rows.
+
+        :param balances: A dict mapping user IDs to their amount of money.
+        """
+        self.money.update(balances)
+
+    async def adjust_money(self, userid, delta, floor):
+        """
+        Add a delta to the money of a given user ID.
+
+        :param userid: The ID of the user.
+        :param delta: The amount to add (negative to subtract).
+        :param floor: The lowest balance the user can end up with.
+        :return: A tuple (previous, money) with the balance before and after the change,
+                 or None if the user has no row.
+        """
+        if userid not in self.money:
+            return None
+        previous = self.money[userid]
+        self.money[userid] = max(previous + delta, floor)
+        return previous, self.money[userid]
+
+    async def debit_money(self, userid, amount):
+        """
+        Withdraw an amount from a given user ID if the user can cover it.
+
+        :param userid: The ID of the user.
+        :param amount: The amount to withdraw.
+        :return: The new amount of money the user has, or None if nothing was withdrawn.
+        """
+        if userid not in self.money or self.money[userid] < amount:
+            return None
+        self.money[userid] -= amount
+        return self.money[userid]
+
+    async def transfer_many(self, userids, transfers):
+        """
+        Settle several transfers at once.
+
+        :param userids: The sorted IDs of all involved users.
+        :param transfers: A list of (from_id, to_id, amount) tuples.
+        :return: A tuple (balances, results) as produced by apply_transfers.
+        """
+        balances = {userid: self.money[userid] for userid in userids}
+        results = apply_transfers(balances, transfers)
+        self.money.update(balances)
+        return balances, results
+
+    async def reserve_bet(self, userid, amount, game):
+        """
+        Move a bet from the balance of a user ID into escrow.
+
+        :param userid: The ID of the user.
+        :param amount: The amount to hold.
+        :param game: The name of the game the bet is placed in.
+        :return: A tuple (hold_id, money), or None if the user cannot cover the bet.
+        """
+        money = await self.debit_money(userid, amount)
+        if money is None:
+            return None
+        hold_id = next(self.escrow_ids)
+        self.escrow[hold_id] = (userid, amount, game)
+        return hold_id, money
+
+    async def settle_bet(self, hold_id, multiplier):
+        """
+        Release a hold and credit the payout to its user.
+
+        :param hold_id: The ID of the hold.
+        :param multiplier: The payout as a multiple of the bet.
+        :return: A tuple (userid, money), or None if the hold is already released.
+        """
+        if hold_id not in self.escrow:
+            return None
+        userid, amount, _ = self.escrow.pop(hold_id)
+        self.money[userid] += int(amount * multiplier)
+        return userid, self.money[userid]
+
+    async def sweep_bets(self):
+        """
+        Refund and remove all holds.
+
+        :return: The amount of refunded holds.
+        """
+        orphaned = len(self.escrow)
+        for userid, amount, _ in self.escrow.values():
+            self.money[userid] += amount
+        self.escrow.clear()
+        return orphaned
+
+    async def scale_money(self, above, factor, dry_run):
+        """
+        Multiply every balance above a threshold by a factor, rounding down.
+
+        :param above: Only balances greater than this are changed.
+        :param factor: The factor.
+        :param dry_run: Whether to only count the rows that would change.
+        :return: The amount of matched rows.
+        """
+        matched = [userid for userid, money in self.money.items() if money > above]
+        if not dry_run:
+            for userid in matched:
+                self.money[userid] = math.floor(self.money[userid] * factor)
+        return len(matched)
+
+    async def cap_money(self, cap, dry_run):
+        """
+        Lower every balance above a cap to the cap.
+
+        :param cap: The highest balance a user can have.
+        :param dry_run: Whether to only count the rows that would change.
+        :return: The amount of matched rows.
+        """
+        matched = [userid for userid, money in self.money.items() if money > cap]
+        if not dry_run:
+            self.money.update(dict.fromkeys(matched, cap))
+        return len(matched)
+
+    async def credit_money(self, userids, amount, dry_run):
+        """
+        Add an amount to the balances of several user IDs.
+
+        :param userids: The IDs of the users.
+        :param amount: The amount to add.
+        :param dry_run: Whether to only count the rows that would change.
+        :return: The amount of matched rows.
+        """
+        matched = [userid for userid in userids if userid in self.money]
+        if not dry_run:
+            for userid in matched:
+                self.money[userid] += amount
+        return len(matched)
+
+    async def reset_streaks(self, dry_run):
+        """
+        Reset every daily streak to zero.
+
+        :param dry_run: Whether to only count the rows that would change.
+        :return: The amount of matched rows.
+        """
+        matched = [userid for userid, (_, streak) in self.daily.items() if streak > 0]
+        if not dry_run:
+            for userid in matched:
+                self.daily[userid] = (self.daily[userid][0], 0)
+        return len(matched)
+
+    async def append_ledger(self, entries):
+        """
+        Append entries to the ledger, kept per user in the order of their ID.
+
+        :param entries: A list of (identifier, delta, balance, game, reference, created_at)
+            tuples.
+        """
+        for identifier, *entry in entries:
+            self.ledger.setdefault(identifier, []).append((next(self.ledger_ids), *entry))
+
+    async def snapshot_ledger(self, userids):
+        """
+        Record the current balances of several user IDs.
+
+        :param userids: The IDs of the users.
+        """
+        for userid in userids:
+            if self.ledger.get(userid) and userid in self.money:
+                self.ledger_snapshots[(userid, self.ledger[userid][-1][0])] = self.money[userid]
+
+    async def read_ledger(self, userid, before, limit):
+        """
+        Read the latest ledger entries of a given user ID older than a given entry.
+
+        :param userid: The ID of the user.
+        :param before: Only entries with a smaller ID are read, None to start at the newest.
+        :param limit: The maximum amount of entries.
+        :return: A list of (id, delta, balance, game, reference, created_at) tuples.
+        """
+        entries = self.ledger.get(userid, [])
+        end = len(entries) if before is None else bisect.bisect_left(entries, (before,))
+        return entries[max(end - limit, 0):end][::-1]
+
+    async def read_daily(self, userid):
+        """
+        Read the date of the last daily claim of a given user ID.
+
+        :param userid: The ID of the user.
+        :return: The date, or None if the user has no row.
+        """
+        return self.daily[userid][0] if userid in self.daily else None
+
+    async def claim_daily(self, userid, credit):
+        """
+        Claim the daily reward for a given user ID.
+
+        :param userid: The ID of the user.
+        :param credit: Whether the reward is credited to the money row as well.
+        :return: A tuple (streak, money), or None if already claimed.
+        """
+        today = datetime.date.today()
+        last_daily, streak = self.daily[userid]
+        if last_daily >= today:
+            return None
+        streak = min(streak + 1, 61) if last_daily == today - datetime.timedelta(days=1) else 0
+        self.daily[userid] = (today, streak)
+        if not credit:
+            return streak, None
+        self.money[userid] += DAILY_REWARD + daily_bonus(streak)
+        return streak, self.money[userid]
+
+    async def read_robbing(self, userid):
+        """
+        Read the next robbing date of a given user ID.
+
+        :param userid: The ID of the user.
+        :return: The date, or None if the user has no row.
+        """
+        return self.robbing.get(userid)
+
+    async def write_robbing(self, userid, next_robbing):
+        """
+        Set the next robbing date of a given user ID.
+
+        :param userid: The ID of the user.
+        :param next_robbing: The next robbing date.
+        """
+        if userid in self.robbing:
+            self.robbing[userid] = next_robbing
@@ -0,0 +1,35 @@
+"""
+Versioned schema migrations.
+
+This module provides the runner that brings a database up to the latest schema version.
+The migrations themselves are defined per storage backend, since their SQL differs.
+"""
+import logging
+
+
+async def run_migrations(execute, migrations, record_query):
+    """
+    Apply all migrations that were not applied yet, in the order of their version.
+    A migration step is either a SQL statement or a coroutine function that gets
+    the execute function, for changes that depend on the current state of the schema.
+
+    :param execute: A coroutine function (query, params=None) returning the result rows.
+    :param migrations: A list of (version, description, steps) tuples.
+    :param record_query: The statement that records a version and its description.
+    :return: The list of applied versions.
+    """
+    applied = {version for (version,) in
+               await execute("SELECT version FROM schema_migrations")}
+    new_versions = []
+    for version, description, steps in sorted(migrations, key=lambda migration: migration[0]):
+        if version in applied:
+            continue
+        for step in steps:
+            if callable(step):
+                await step(execute)
+            else:
+                await execute(step)
+        await execute(record_query, (version, description))
+        logging.info("Applied schema migration %s: %s", version, description)
+        new_versions.append(version)
+    return new_versions
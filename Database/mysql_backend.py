@@ -0,0 +1,835 @@
+"""
+MySQL storage backend using aiomysql for asynchronous MySQL operations.
+
+This module provides a MySqlBackend class that manages the connection pool and runs
+the query set of the DbController against a MySQL server.
+"""
+import datetime
+import os
+import time
+from contextlib import asynccontextmanager
+import aiomysql
+from pymysql.constants import CLIENT
+from Database.connection_pool import AdaptivePool, load_pool_config
+from Database.group_commit import GroupCommitter, is_write
+from Database.migrations import run_migrations
+from Database.query_stats import QueryStats
+from Database.storage import StorageBackend, USER_TABLES, EXPORT_COLUMNS, BULK_CHUNK_SIZE, \
+    DAILY_REWARD, daily_bonus, apply_transfers
+
+PROVISION_QUERIES = {
+    "users": 'INSERT INTO users VALUES (%s, "user") '
+             'ON DUPLICATE KEY UPDATE identifier = identifier',
+    "money": "INSERT INTO money (identifier, money) VALUES (%s, 1000) "
+             "ON DUPLICATE KEY UPDATE identifier = identifier",
+    # New daily rows are claimable right away and start without a streak
+    "daily": "INSERT INTO daily (identifier, last_daily, streak) "
+             "VALUES (%s, %s - INTERVAL 2 DAY, 0) "
+             "ON DUPLICATE KEY UPDATE identifier = identifier",
+    "robbing": "INSERT INTO robbing (identifier, next_robbing) VALUES (%s, %s) "
+               "ON DUPLICATE KEY UPDATE identifier = identifier"
+}
+
+
+def provision_params(table, userid, today):
+    """
+    Build the parameters of the provisioning query of a table.
+    Dates are passed from Python, so they follow the same timezone (TZ) as the
+    cooldown cache instead of the timezone of the MySQL server.
+
+    :param table: The table the row is created in.
+    :param userid: The ID of the user.
+    :param today: The current local date.
+    :return: The parameters for PROVISION_QUERIES[table].
+    """
+    return (userid, today) if table in ("daily", "robbing") else (userid,)
+
+MIGRATIONS_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INT UNSIGNED NOT NULL PRIMARY KEY,
+        description VARCHAR(255) NOT NULL,
+        applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+async def add_missing_keys(execute):
+    """
+    Add the primary keys and the money index to tables that were created by hand.
+
+    :param execute: The function executing a query.
+    """
+    index_query = """
+        SELECT COUNT(*) FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+    """
+    for table in USER_TABLES:
+        if not (await execute(index_query, (table, "PRIMARY")))[0][0]:
+            await execute(f"ALTER TABLE {table} ADD PRIMARY KEY (identifier)")
+    if not (await execute(index_query, ("money", "money_desc")))[0][0]:
+        await execute("CREATE INDEX money_desc ON money (money DESC)")
+
+MIGRATIONS = [
+    (1, "Create the user tables with keys, types and the money index", [
+        """
+            CREATE TABLE IF NOT EXISTS users (
+                identifier BIGINT UNSIGNED NOT NULL PRIMARY KEY,
+                role VARCHAR(32) NOT NULL DEFAULT 'user'
+            )
+        """,
+        """
+            CREATE TABLE IF NOT EXISTS money (
+                identifier BIGINT UNSIGNED NOT NULL PRIMARY KEY,
+                money BIGINT NOT NULL DEFAULT 1000
+            )
+        """,
+        """
+            CREATE TABLE IF NOT EXISTS daily (
+                identifier BIGINT UNSIGNED NOT NULL PRIMARY KEY,
+                last_daily DATE NOT NULL,
+                streak INT NOT NULL DEFAULT 0
+            )
+        """,
+        """
+            CREATE TABLE IF NOT EXISTS robbing (
+                identifier BIGINT UNSIGNED NOT NULL PRIMARY KEY,
+                next_robbing DATE NOT NULL
+            )
+        """,
+        # Tables created by hand get the same column types as new ones
+        "ALTER TABLE users MODIFY identifier BIGINT UNSIGNED NOT NULL",
+        "ALTER TABLE money MODIFY identifier BIGINT UNSIGNED NOT NULL, "
+        "MODIFY money BIGINT NOT NULL DEFAULT 1000",
+        "ALTER TABLE daily MODIFY identifier BIGINT UNSIGNED NOT NULL, "
+        "MODIFY last_daily DATE NOT NULL, MODIFY streak INT NOT NULL DEFAULT 0",
+        "ALTER TABLE robbing MODIFY identifier BIGINT UNSIGNED NOT NULL, "
+        "MODIFY next_robbing DATE NOT NULL",
+        add_missing_keys
+    ]),
+    (2, "Create the escrow table", [
+        """
+            CREATE TABLE IF NOT EXISTS escrow (
+                id BIGINT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY,
+                identifier BIGINT UNSIGNED NOT NULL,
+                amount BIGINT UNSIGNED NOT NULL,
+                game VARCHAR(32) NOT NULL,
+                created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                KEY escrow_identifier (identifier)
+            )
+        """
+    ]),
+    (3, "Create the ledger and ledger snapshot tables", [
+        """
+            CREATE TABLE IF NOT EXISTS ledger (
+                id BIGINT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY,
+                identifier BIGINT UNSIGNED NOT NULL,
+                delta BIGINT NOT NULL,
+                balance BIGINT NOT NULL,
+                game VARCHAR(32) NOT NULL,
+                reference VARCHAR(64) NULL,
+                created_at DATETIME NOT NULL,
+                KEY ledger_identifier (identifier, id)
+            )
+        """,
+        """
+            CREATE TABLE IF NOT EXISTS ledger_snapshots (
+                identifier BIGINT UNSIGNED NOT NULL,
+                ledger_id BIGINT UNSIGNED NOT NULL,
+                money BIGINT NOT NULL,
+                created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (identifier, ledger_id)
+            )
+        """
+    ])
+]
+
+def upsert_query(table, rows):
+    """
+    Build a multi-row upsert for a table of EXPORT_COLUMNS.
+
+    :param table: The name of the table.
+    :param rows: The amount of rows.
+    :return: The SQL statement.
+    """
+    identifier, *columns = EXPORT_COLUMNS[table]
+    row = "(" + ", ".join(["%s"] * (len(columns) + 1)) + ")"
+    values = ", ".join([row] * rows)
+    updates = ", ".join(f"{column} = VALUES({column})" for column in columns)
+    return f"""
+        INSERT INTO {table} ({identifier}, {", ".join(columns)}) VALUES {values}
+        ON DUPLICATE KEY UPDATE {updates}
+    """
+
+
+def upsert_money_query(rows):
+    """
+    Build a multi-row upsert for the money table.
+
+    :param rows: The amount of (identifier, money) rows.
+    :return: The SQL statement.
+    """
+    return upsert_query("money", rows)
+
+class MySqlBackend(StorageBackend):
+    """
+        Storage backend for a MySQL server, configured with the DB_* environment variables.
+        Every query is timed, queries slower than DB_SLOW_QUERY_MS (default 200) are logged.
+
+        If DB_REPLICA_HOST is set, reads go to a second pool on that read replica.
+        Reads of users written within the last DB_REPLICA_WINDOW_S seconds (default 2)
+        stay on the primary, so every user reads their own writes.
+    """
+    def __init__(self):
+        """
+        Initialize the backend with the connection pools set to None.
+        """
+        self.pool = None
+        self.replica = None
+        self.group_commit = None
+        self.replica_window = float(os.getenv('DB_REPLICA_WINDOW_S', '2'))
+        self.recent_writes = {}
+        self.last_write = 0.0
+        self.stats = QueryStats(slow_ms=float(os.getenv('DB_SLOW_QUERY_MS', '200')))
+
+    async def open(self):
+        """
+        Initialize and pre-warm the connection pool, sized by the pool settings.
+        If DB_GROUP_COMMIT_MS is set, writes arriving within that window share a commit.
+        """
+        self.pool = AdaptivePool(self.connect, load_pool_config())
+        await self.pool.start()
+        if os.getenv('DB_REPLICA_HOST'):
+            self.replica = AdaptivePool(self.connect_replica, load_pool_config())
+            await self.replica.start()
+        if os.getenv('DB_GROUP_COMMIT_MS'):
+            self.group_commit = GroupCommitter(
+                self.pool, window=float(os.getenv('DB_GROUP_COMMIT_MS')) / 1000)
+
+    @staticmethod
+    async def connect(host=None):
+        """
+        Open a new connection using aiomysql with parameters from environment variables.
+
+        :param host: The host to connect to, DB_HOST if not given.
+        :return: An aiomysql connection.
+        """
+        return await aiomysql.connect(
+            user=os.getenv('DB_USER'),
+            password=os.getenv('DB_PASSWORD'),
+            host=host or os.getenv('DB_HOST'),
+            port=3306,
+            db=os.getenv('DB_NAME'),
+            autocommit=True,
+            client_flag=CLIENT.FOUND_ROWS
+        )
+
+    async def connect_replica(self):
+        """
+        Open a new connection to the read replica.
+
+        :return: An aiomysql connection.
+        """
+        return await self.connect(os.getenv('DB_REPLICA_HOST'))
+
+    def pool_status(self):
+        """
+        Return the counters of the connection pools.
+
+        :return: A dict mapping the pool names to their counters.
+        """
+        status = {"primary": self.pool.status()}
+        if self.replica:
+            status["replica"] = self.replica.status()
+        return status
+
+    def wrote(self, userids=()):
+        """
+        Tag a write, so reads of the given users stay on the primary for a while.
+
+        :param userids: The IDs of the written users.
+        """
+        self.last_write = time.monotonic()
+        if not self.replica:
+            return
+        for userid in userids:
+            self.recent_writes[int(userid)] = self.last_write
+        if len(self.recent_writes) > 1000:
+            deadline = self.last_write - self.replica_window
+            self.recent_writes = {userid: written for userid, written
+                                  in self.recent_writes.items() if written >= deadline}
+
+    def reader(self, userids=None):
+        """
+        Choose the pool for a read of the given users.
+
+        :param userids: The IDs of the read users, None for a read across all users.
+        :return: The replica pool, or the primary pool if the read could miss a recent write.
+        """
+        if not self.replica:
+            return self.pool
+        deadline = time.monotonic() - self.replica_window
+        if userids is None:
+            return self.pool if self.last_write >= deadline else self.replica
+        if any(self.recent_writes.get(int(userid), 0.0) >= deadline for userid in userids):
+            return self.pool
+        return self.replica
+
+    async def migrate(self):
+        """
+        Create or upgrade the schema to the latest migration.
+        """
+        await self.execute_query(MIGRATIONS_TABLE)
+        await run_migrations(
+            self.execute_query, MIGRATIONS,
+            "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)")
+
+    async def close(self):
+        """
+        Commit all grouped writes and close the connection pools.
+        """
+        if self.group_commit:
+            await self.group_commit.close()
+        for pool in (self.pool, self.replica):
+            if pool:
+                pool.close()
+                await pool.wait_closed()
+
+    async def execute_query(self, query, params=None, pool=None):
+        """
+        Execute a SQL query with optional parameters.
+
+        :param query: The SQL query to execute.
+        :param params: Optional parameters for the SQL query.
+        :param pool: The pool to run a read on, the primary if not given.
+        :return: The result of the query.
+        """
+        started = time.perf_counter()
+        if self.group_commit and is_write(query):
+            result = (await self.group_commit.submit(query, params))[0]
+            self.stats.record(query, params, 0, time.perf_counter() - started, len(result))
+            return result
+        pool = pool or self.pool
+        async with pool.acquire() as conn, conn.cursor() as cur:
+            acquired = time.perf_counter()
+            await cur.execute(query, params)
+            result = await cur.fetchall()
+        if pool is self.replica:
+            query = "/* replica */ " + query
+        self.stats.record(query, params, acquired - started, time.perf_counter() - acquired,
+                          len(result))
+        return result
+
+    async def stream_query(self, query, params=None, chunk_size=500):
+        """
+        Execute a SQL query with an unbuffered cursor and yield its result in chunks,
+        so only one chunk is held in memory. The connection stays borrowed until the
+        generator is exhausted or closed. Reads go to the replica if there is one
+        and nothing was written recently.
+
+        :param query: The SQL query to execute.
+        :param params: Optional parameters for the SQL query.
+        :param chunk_size: The maximum amount of rows per chunk.
+        :return: An async generator of lists of rows.
+        """
+        started = time.perf_counter()
+        pool = self.reader()
+        rows = 0
+        async with pool.acquire() as conn, conn.cursor(aiomysql.SSCursor) as cur:
+            acquired = time.perf_counter()
+            await cur.execute(query, params)
+            while chunk := await cur.fetchmany(chunk_size):
+                rows += len(chunk)
+                yield chunk
+        if pool is self.replica:
+            query = "/* replica */ " + query
+        self.stats.record(query, params, acquired - started, time.perf_counter() - acquired,
+                          rows)
+
+    async def execute_update(self, query, params=None):
+        """
+        Execute a data-changing SQL statement with optional parameters.
+
+        :param query: The SQL statement to execute.
+        :param params: Optional parameters for the SQL statement.
+        :return: A tuple (matched_rows, last_insert_id).
+        """
+        started = time.perf_counter()
+        if self.group_commit:
+            _, matched, last_id = await self.group_commit.submit(query, params)
+            self.stats.record(query, params, 0, time.perf_counter() - started)
+            return matched, last_id
+        async with self.pool.acquire() as conn, conn.cursor() as cur:
+            acquired = time.perf_counter()
+            await cur.execute(query, params)
+            matched, last_id = cur.rowcount, cur.lastrowid
+        self.stats.record(query, params, acquired - started, time.perf_counter() - acquired)
+        return matched, last_id
+
+    async def execute_script(self, statements):
+        """
+        Execute several SQL statements in a single round trip.
+
+        :param statements: A list of (query, params) tuples.
+        :return: The result of the last statement.
+        """
+        started = time.perf_counter()
+        async with self.pool.acquire() as conn, conn.cursor() as cur:
+            acquired = time.perf_counter()
+            script = ";\n".join([cur.mogrify(query, params) for query, params in statements])
+            await cur.execute(script)
+            result = await cur.fetchall()
+            while await cur.nextset():
+                result = await cur.fetchall()
+        template = "; ".join(dict.fromkeys(query for query, _ in statements))
+        self.stats.record(template, None, acquired - started,
+                          time.perf_counter() - acquired, len(result))
+        return result
+
+    @asynccontextmanager
+    async def transaction(self, name):
+        """
+        Run several statements on a single connection inside a transaction.
+        The transaction is committed when the block finishes and rolled back on errors.
+
+        :param name: The name the transaction is timed under.
+        :return: A cursor bound to the transaction.
+        """
+        started = time.perf_counter()
+        async with self.pool.acquire() as conn, conn.cursor() as cur:
+            acquired = time.perf_counter()
+            await conn.begin()
+            try:
+                yield cur
+            except BaseException:
+                await conn.rollback()
+                raise
+            await conn.commit()
+        self.stats.record(f"TRANSACTION {name}", None, acquired - started,
+                          time.perf_counter() - acquired)
+
+    async def load_known_users(self):
+        """
+        Load the identifiers of all provisioned users per table with a single query.
+
+        :return: A list of (table, identifier) tuples.
+        """
+        query = " UNION ALL ".join(
+            [f"SELECT '{table}', identifier FROM {table}" for table in USER_TABLES])
+        return await self.execute_query(query)
+
+    async def provision(self, rows):
+        """
+        Create the given rows with their initial values in a single round trip.
+
+        :param rows: A list of (table, identifier) tuples.
+        """
+        self.wrote([userid for _, userid in rows])
+        today = datetime.date.today()
+        if len(rows) > 1:
+            await self.execute_script([(PROVISION_QUERIES[table],
+                                        provision_params(table, userid, today))
+                                       for table, userid in rows])
+        elif rows:
+            table, userid = rows[0]
+            await self.execute_query(PROVISION_QUERIES[table],
+                                     provision_params(table, userid, today))
+
+    async def top_money(self, limit):
+        """
+        Retrieve the richest users ordered by their money in descending order.
+
+        :param limit: The maximum amount of users to retrieve.
+        :return: The result of the query.
+        """
+        query = "SELECT identifier, money FROM `money` ORDER BY money DESC LIMIT %s"
+        return await self.execute_query(query, (limit,), pool=self.reader())
+
+    async def read_money(self, userids):
+        """
+        Read the amount of money for several user IDs with a single query.
+
+        :param userids: The IDs of the users.
+        :return: A dict mapping the found user IDs to the amount of money they have.
+        """
+        placeholders = ", ".join(["%s"] * len(userids))
+        query = f"SELECT identifier, money FROM money WHERE identifier IN ({placeholders})"
+        return {int(identifier): money for identifier, money
+                in await self.execute_query(query, userids, pool=self.reader(userids))}
+
+    async def stream_rows(self, table, chunk_size):
+        """
+        Read all rows of an exported table through an unbuffered server-side cursor.
+
+        :param table: A table of EXPORT_COLUMNS.
+        :param chunk_size: The maximum amount of rows per chunk.
+        :return: An async generator of lists of rows.
+        """
+        query = f"SELECT {', '.join(EXPORT_COLUMNS[table])} FROM {table} ORDER BY identifier"
+        async for chunk in self.stream_query(query, chunk_size=chunk_size):
+            yield chunk
+
+    async def import_rows(self, table, rows):
+        """
+        Write a chunk of rows of an exported table with a single multi-row upsert.
+
+        :param table: A table of EXPORT_COLUMNS.
+        :param rows: A list of rows.
+        """
+        self.wrote([row[0] for row in rows])
+        await self.execute_query(upsert_query(table, len(rows)),
+                                 [value for row in rows for value in row])
+
+    async def set_money(self, userid, money):
+        """
+        Set the amount of money for a given user ID.
+
+        :param userid: The ID of the user.
+        :param money: The amount of money to set.
+        :return: The previous amount of money the user had, or None if the user has no row.
+        """
+        # LAST_INSERT_ID returns the previous balance without changing the new one
+        query = """
+            UPDATE money SET money = %s + 0 * CAST(LAST_INSERT_ID(money) AS SIGNED)
+            WHERE identifier = %s
+        """
+        self.wrote([userid])
+        matched, previous = await self.execute_update(query, (money, userid))
+        return previous if matched else None
+
+    async def write_balances(self, balances):
+        """
+        Write several balances with a single multi-row upsert.
+
+        :param balances: A dict mapping user IDs to their amount of money.
+        """
+        self.wrote(balances)
+        await self.execute_query(upsert_money_query(len(balances)),
+                                 [value for row in balances.items() for value in row])
+
+    async def adjust_money(self, userid, delta, floor):
+        """
+        Atomically add a delta to the money of a given user ID.
+
+        :param userid: The ID of the user.
+        :param delta: The amount to add (negative to subtract).
+        :param floor: The lowest balance the user can end up with.
+        :return: A tuple (previous, money) with the balance before and after the change,
+                 or None if the user has no row.
+        """
+        # LAST_INSERT_ID returns the previous balance, the new one follows from it
+        query = """
+            UPDATE money SET money = GREATEST(CAST(LAST_INSERT_ID(money) AS SIGNED) + %s, %s)
+            WHERE identifier = %s
+        """
+        self.wrote([userid])
+        matched, previous = await self.execute_update(query, (delta, floor, userid))
+        return (previous, max(previous + delta, floor)) if matched else None
+
+    async def debit_money(self, userid, amount):
+        """
+        Atomically withdraw an amount from a given user ID if the user can cover it.
+
+        :param userid: The ID of the user.
+        :param amount: The amount to withdraw.
+        :return: The new amount of money the user has, or None if nothing was withdrawn.
+        """
+        query = """
+            UPDATE money SET money = LAST_INSERT_ID(money - %s)
+            WHERE identifier = %s AND money >= %s
+        """
+        self.wrote([userid])
+        matched, money = await self.execute_update(query, (amount, userid, amount))
+        return money if matched else None
+
+    async def transfer_many(self, userids, transfers):
+        """
+        Settle several transfers in a single transaction.
+        All involved rows are locked at once in the order of their identifier,
+        so concurrent transfers cannot deadlock each other.
+
+        :param userids: The sorted IDs of all involved users.
+        :param transfers: A list of (from_id, to_id, amount) tuples.
+        :return: A tuple (balances, results) as produced by apply_transfers.
+        """
+        placeholders = ", ".join(["%s"] * len(userids))
+        lock_query = f"""
+            SELECT identifier, money FROM money
+            WHERE identifier IN ({placeholders})
+            ORDER BY identifier FOR UPDATE
+        """
+        self.wrote(userids)
+        async with self.transaction("transfer_many") as cur:
+            await cur.execute(lock_query, userids)
+            balances = {int(identifier): money
+                        for identifier, money in await cur.fetchall()}
+            results = apply_transfers(balances, transfers)
+            await cur.execute(upsert_money_query(len(balances)),
+                              [value for row in balances.items() for value in row])
+        return balances, results
+
+    async def reserve_bet(self, userid, amount, game):
+        """
+        Atomically move a bet from the balance of a user ID into the escrow table.
+
+        :param userid: The ID of the user.
+        :param amount: The amount to hold.
+        :param game: The name of the game the bet is placed in.
+        :return: A tuple (hold_id, money), or None if the user cannot cover the bet.
+        """
+        debit_query = """
+            UPDATE money SET money = LAST_INSERT_ID(money - %s)
+            WHERE identifier = %s AND money >= %s
+        """
+        hold_query = "INSERT INTO escrow (identifier, amount, game) VALUES (%s, %s, %s)"
+        self.wrote([userid])
+        async with self.transaction("reserve_bet") as cur:
+            await cur.execute(debit_query, (amount, userid, amount))
+            if not cur.rowcount:
+                return None
+            money = cur.lastrowid
+            await cur.execute(hold_query, (userid, amount, game))
+            return cur.lastrowid, money
+
+    async def settle_bet(self, hold_id, multiplier):
+        """
+        Release a hold and credit the payout to its user in a single transaction.
+
+        :param hold_id: The ID of the hold.
+        :param multiplier: The payout as a multiple of the bet.
+        :return: A tuple (userid, money), or None if the hold is already released.
+        """
+        async with self.transaction("settle_bet") as cur:
+            await cur.execute(
+                "SELECT identifier, amount FROM escrow WHERE id = %s FOR UPDATE", (hold_id,))
+            hold = await cur.fetchone()
+            if hold is None:
+                return None
+            userid, amount = hold
+            self.wrote([userid])
+            await cur.execute("DELETE FROM escrow WHERE id = %s", (hold_id,))
+            await cur.execute(
+                "UPDATE money SET money = LAST_INSERT_ID(money + %s) WHERE identifier = %s",
+                (int(amount * multiplier), userid))
+            return userid, cur.lastrowid
+
+    async def sweep_bets(self):
+        """
+        Refund and remove all holds in a single transaction.
+
+        :return: The amount of refunded holds.
+        """
+        refund_query = """
+            UPDATE money JOIN (
+                SELECT identifier, SUM(amount) AS held FROM escrow GROUP BY identifier
+            ) AS holds ON money.identifier = holds.identifier
+            SET money.money = money.money + holds.held
+        """
+        self.wrote()
+        async with self.transaction("sweep_bets") as cur:
+            await cur.execute("SELECT COUNT(*) FROM escrow FOR UPDATE")
+            (orphaned,) = await cur.fetchone()
+            if orphaned:
+                await cur.execute(refund_query)
+                await cur.execute("DELETE FROM escrow")
+        return orphaned
+
+    async def update_in_chunks(self, table, assignments, condition, params, dry_run):
+        """
+        Run a set-based UPDATE in chunks of BULK_CHUNK_SIZE identifiers, so no statement
+        locks more rows than a chunk and other queries can run in between.
+
+        :param table: The table to update.
+        :param assignments: A tuple (SET clause, parameters).
+        :param condition: The WHERE clause selecting the rows to change.
+        :param params: The parameters of the WHERE clause.
+        :param dry_run: Whether to only count the matching rows.
+        :return: The amount of matched rows.
+        """
+        if dry_run:
+            (count,), = await self.execute_query(
+                f"SELECT COUNT(*) FROM {table} WHERE {condition}", params)
+            return count
+        self.wrote()
+        bound_query = f"""
+            SELECT MAX(identifier) FROM (
+                SELECT identifier FROM {table} WHERE identifier > %s
+                ORDER BY identifier LIMIT %s
+            ) AS chunk
+        """
+        assignments, assignment_params = assignments
+        update_query = f"""
+            UPDATE {table} SET {assignments}
+            WHERE identifier > %s AND identifier <= %s AND {condition}
+        """
+        matched, last = 0, -1
+        while True:
+            (upper,), = await self.execute_query(bound_query, (last, BULK_CHUNK_SIZE))
+            if upper is None:
+                return matched
+            matched += (await self.execute_update(
+                update_query, (*assignment_params, last, upper, *params)))[0]
+            last = upper
+
+    async def scale_money(self, above, factor, dry_run):
+        """
+        Multiply every balance above a threshold by a factor with chunked UPDATEs.
+
+        :param above: Only balances greater than this are changed.
+        :param factor: The factor.
+        :param dry_run: Whether to only count the rows that would change.
+        :return: The amount of matched rows.
+        """
+        return await self.update_in_chunks("money", ("money = FLOOR(money * %s)", (factor,)),
+                                           "money > %s", (above,), dry_run)
+
+    async def cap_money(self, cap, dry_run):
+        """
+        Lower every balance above a cap to the cap with chunked UPDATEs.
+
+        :param cap: The highest balance a user can have.
+        :param dry_run: Whether to only count the rows that would change.
+        :return: The amount of matched rows.
+        """
+        return await self.update_in_chunks("money", ("money = %s", (cap,)),
+                                           "money > %s", (cap,), dry_run)
+
+    async def credit_money(self, userids, amount, dry_run):
+        """
+        Add an amount to the balances of several user IDs,
+        with one UPDATE per BULK_CHUNK_SIZE users.
+
+        :param userids: The IDs of the users.
+        :param amount: The amount to add.
+        :param dry_run: Whether to only count the rows that would change.
+        :return: The amount of matched rows.
+        """
+        if not dry_run:
+            self.wrote(userids)
+        matched = 0
+        for start in range(0, len(userids), BULK_CHUNK_SIZE):
+            chunk = userids[start:start + BULK_CHUNK_SIZE]
+            placeholders = ", ".join(["%s"] * len(chunk))
+            if dry_run:
+                (count,), = await self.execute_query(
+                    f"SELECT COUNT(*) FROM money WHERE identifier IN ({placeholders})", chunk)
+                matched += count
+            else:
+                matched += (await self.execute_update(
+                    f"UPDATE money SET money = money + %s WHERE identifier IN ({placeholders})",
+                    (amount, *chunk)))[0]
+        return matched
+
+    async def reset_streaks(self, dry_run):
+        """
+        Reset every daily streak to zero with chunked UPDATEs.
+
+        :param dry_run: Whether to only count the rows that would change.
+        :return: The amount of matched rows.
+        """
+        return await self.update_in_chunks("daily", ("streak = 0", ()),
+                                           "streak > 0", (), dry_run)
+
+    async def append_ledger(self, entries):
+        """
+        Append entries to the ledger with a single multi-row insert.
+
+        :param entries: A list of (identifier, delta, balance, game, reference, created_at)
+            tuples.
+        """
+        self.wrote([entry[0] for entry in entries])
+        values = ", ".join(["(%s, %s, %s, %s, %s, %s)"] * len(entries))
+        await self.execute_query(
+            "INSERT INTO ledger (identifier, delta, balance, game, reference, created_at) "
+            f"VALUES {values}", [value for entry in entries for value in entry])
+
+    async def snapshot_ledger(self, userids):
+        """
+        Record the current balances of several user IDs with a single INSERT ... SELECT.
+
+        :param userids: The IDs of the users.
+        """
+        placeholders = ", ".join(["%s"] * len(userids))
+        await self.execute_query(f"""
+            INSERT INTO ledger_snapshots (identifier, ledger_id, money)
+            SELECT money.identifier, MAX(ledger.id), money.money
+            FROM money JOIN ledger ON ledger.identifier = money.identifier
+            WHERE money.identifier IN ({placeholders})
+            GROUP BY money.identifier, money.money
+            ON DUPLICATE KEY UPDATE money = VALUES(money)
+        """, userids)
+
+    async def read_ledger(self, userid, before, limit):
+        """
+        Read a page of the ledger of a given user ID by keyset pagination
+        on the (identifier, id) index.
+
+        :param userid: The ID of the user.
+        :param before: Only entries with a smaller ID are read, None to start at the newest.
+        :param limit: The maximum amount of entries.
+        :return: A list of (id, delta, balance, game, reference, created_at) tuples.
+        """
+        query = """
+            SELECT id, delta, balance, game, reference, created_at FROM ledger
+            WHERE identifier = %s AND id < %s ORDER BY id DESC LIMIT %s
+        """
+        return await self.execute_query(
+            query, (userid, before or 2 ** 64 - 1, limit), pool=self.reader([userid]))
+
+    async def read_daily(self, userid):
+        """
+        Read the date of the last daily claim of a given user ID.
+
+        :param userid: The ID of the user.
+        :return: The date, or None if the user has no row.
+        """
+        query = "SELECT last_daily FROM daily WHERE identifier = %s"
+        result = await self.execute_query(query, (userid,), pool=self.reader([userid]))
+        return result[0][0] if result else None
+
+    async def claim_daily(self, userid, credit):
+        """
+        Claim the daily reward for a given user ID in a single transaction.
+
+        :param userid: The ID of the user.
+        :param credit: Whether the reward is credited to the money row as well.
+        :return: A tuple (streak, money), or None if already claimed.
+        """
+        # The date comes from Python, so it agrees with the cooldown cache around midnight
+        streak_query = """
+            UPDATE daily SET streak = LAST_INSERT_ID(
+                IF(last_daily + INTERVAL 1 DAY = %(today)s, LEAST(streak + 1, 61), 0)
+            ), last_daily = %(today)s
+            WHERE identifier = %(userid)s AND last_daily < %(today)s
+        """
+        money_query = "UPDATE money SET money = LAST_INSERT_ID(money + %s) WHERE identifier = %s"
+        self.wrote([userid])
+        async with self.transaction("claim_daily") as cur:
+            await cur.execute(streak_query, {"today": datetime.date.today(), "userid": userid})
+            if not cur.rowcount:
+                return None
+            streak = cur.lastrowid
+            if not credit:
+                return streak, None
+            await cur.execute(money_query, (DAILY_REWARD + daily_bonus(streak), userid))
+            return streak, cur.lastrowid
+
+    async def read_robbing(self, userid):
+        """
+        Read the next robbing date of a given user ID.
+
+        :param userid: The ID of the user.
+        :return: The date, or None if the user has no row.
+        """
+        query = "SELECT next_robbing FROM robbing WHERE identifier = %s"
+        result = await self.execute_query(query, (userid,), pool=self.reader([userid]))
+        return result[0][0] if result else None
+
+    async def write_robbing(self, userid, next_robbing):
+        """
+        Set the next robbing date of a given user ID.
+
+        :param userid: The ID of the user.
+        :param next_robbing: The next robbing date.
+        """
+        self.wrote([userid])
+        query = "UPDATE robbing SET next_robbing = %s WHERE identifier = %s"
+        await self.execute_query(query, (next_robbing.strftime('%Y-%m-%d'), userid))
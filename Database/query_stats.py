@@ -0,0 +1,148 @@
+"""
+Latency statistics for database queries.
+
+This module provides a QueryStats class that keeps latency histograms per normalised
+query template, tracks the time spent waiting for a connection separately from the
+execution time and logs slow queries without their parameters.
+"""
+import bisect
+import logging
+import re
+from functools import lru_cache
+
+# Upper bounds of the histogram buckets in milliseconds, the last bucket is unbounded
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+LITERALS = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|\b\d+\b|%s|:\w+")
+PLACEHOLDER_LISTS = re.compile(r"\?(?:\s*,\s*\?)+")
+REPEATED_GROUPS = re.compile(r"(\([^()]*\))(?:\s*,\s*\1)+")
+
+
+@lru_cache(maxsize=1024)
+def normalize(query):
+    """
+    Reduce a SQL statement to its template: whitespace is collapsed, literals and
+    parameters become ? and lists of them (IN lists, multi-row VALUES) are folded.
+
+    :param query: The SQL statement.
+    :return: The query template.
+    """
+    template = LITERALS.sub("?", " ".join(query.split()))
+    template = PLACEHOLDER_LISTS.sub("?, ...", template)
+    return REPEATED_GROUPS.sub(r"\1, ...", template)
+
+
+class Histogram:
+    """
+        Latency histogram with fixed millisecond buckets.
+    """
+    def __init__(self):
+        """
+        Initialize an empty histogram.
+        """
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, millis):
+        """
+        Record a measurement.
+
+        :param millis: The duration in milliseconds.
+        """
+        self.buckets[bisect.bisect_left(BUCKETS_MS, millis)] += 1
+        self.count += 1
+        self.total += millis
+        self.max = max(self.max, millis)
+
+    def mean(self):
+        """
+        Calculate the average of all measurements.
+
+        :return: The average duration in milliseconds.
+        """
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, fraction):
+        """
+        Estimate a percentile by the upper bound of the bucket it falls into.
+
+        :param fraction: The percentile as a fraction, e.g. 0.95.
+        :return: The estimated duration in milliseconds.
+        """
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                return BUCKETS_MS[index] if index < len(BUCKETS_MS) else self.max
+        return 0.0
+
+
+class QueryTiming:
+    """
+        Statistics of a single query template.
+    """
+    def __init__(self):
+        """
+        Initialize empty statistics.
+        """
+        self.acquire = Histogram()
+        self.execute = Histogram()
+        self.rows = 0
+
+
+class QueryStats:
+    """
+        Latency statistics of all queries of a storage backend.
+    """
+    def __init__(self, slow_ms=None):
+        """
+        Initialize empty statistics.
+
+        :param slow_ms: Execution time in milliseconds from which a query is logged
+            as slow, None disables the slow-query log.
+        """
+        self.slow_ms = slow_ms
+        self.templates = {}
+        self.acquire = Histogram()
+
+    def record(self, query, params, acquire, execute, rows=0):
+        """
+        Record a finished query.
+
+        :param query: The SQL statement, or a label such as a transaction name.
+        :param params: The parameters of the statement, only their amount is logged.
+        :param acquire: Seconds spent waiting for a connection.
+        :param execute: Seconds spent executing the statement.
+        :param rows: The amount of rows returned.
+        """
+        template = normalize(query)
+        timing = self.templates.get(template)
+        if timing is None:
+            timing = self.templates[template] = QueryTiming()
+        timing.acquire.add(acquire * 1000)
+        timing.execute.add(execute * 1000)
+        timing.rows += rows
+        self.acquire.add(acquire * 1000)
+        if self.slow_ms is not None and execute * 1000 >= self.slow_ms:
+            logging.warning("Slow query (%.1f ms, %s rows, %s parameters redacted): %s",
+                            execute * 1000, rows, len(params) if params else 0, template)
+
+    def reset(self):
+        """
+        Drop all recorded statistics.
+        """
+        self.templates.clear()
+        self.acquire = Histogram()
+
+    def top(self, limit=10):
+        """
+        Return the templates that took the most execution time in total.
+
+        :param limit: The maximum amount of templates.
+        :return: A list of (template, QueryTiming) tuples.
+        """
+        return sorted(self.templates.items(), key=lambda item: item[1].execute.total,
+                      reverse=True)[:limit]
@@ -0,0 +1,624 @@
+"""
+SQLite storage backend using aiosqlite for small deployments and local load tests.
+
+This module provides a SqliteBackend class that runs the query set of the DbController
+against a single SQLite database file in WAL mode.
+"""
+import asyncio
+import datetime
+import os
+import time
+from contextlib import asynccontextmanager
+import aiosqlite
+from Database.migrations import run_migrations
+from Database.query_stats import QueryStats
+from Database.storage import StorageBackend, USER_TABLES, EXPORT_COLUMNS, BULK_CHUNK_SIZE, \
+    INITIAL_MONEY, DAILY_REWARD, daily_bonus, apply_transfers
+
+MIGRATIONS_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INTEGER NOT NULL PRIMARY KEY,
+        description TEXT NOT NULL,
+        applied_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+MIGRATIONS = [
+    (1, "Create the user tables with keys, types and the money index", [
+        """
+            CREATE TABLE IF NOT EXISTS users (
+                identifier INTEGER NOT NULL PRIMARY KEY,
+                role TEXT NOT NULL DEFAULT 'user'
+            )
+        """,
+        """
+            CREATE TABLE IF NOT EXISTS money (
+                identifier INTEGER NOT NULL PRIMARY KEY,
+                money INTEGER NOT NULL DEFAULT 1000
+            )
+        """,
+        """
+            CREATE TABLE IF NOT EXISTS daily (
+                identifier INTEGER NOT NULL PRIMARY KEY,
+                last_daily TEXT NOT NULL,
+                streak INTEGER NOT NULL DEFAULT 0
+            )
+        """,
+        """
+            CREATE TABLE IF NOT EXISTS robbing (
+                identifier INTEGER NOT NULL PRIMARY KEY,
+                next_robbing TEXT NOT NULL
+            )
+        """,
+        "CREATE INDEX IF NOT EXISTS money_desc ON money (money DESC)"
+    ]),
+    (2, "Create the escrow table", [
+        """
+            CREATE TABLE IF NOT EXISTS escrow (
+                id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+                identifier INTEGER NOT NULL,
+                amount INTEGER NOT NULL,
+                game TEXT NOT NULL,
+                created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        """,
+        "CREATE INDEX IF NOT EXISTS escrow_identifier ON escrow (identifier)"
+    ]),
+    (3, "Create the ledger and ledger snapshot tables", [
+        """
+            CREATE TABLE IF NOT EXISTS ledger (
+                id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+                identifier INTEGER NOT NULL,
+                delta INTEGER NOT NULL,
+                balance INTEGER NOT NULL,
+                game TEXT NOT NULL,
+                reference TEXT,
+                created_at TEXT NOT NULL
+            )
+        """,
+        "CREATE INDEX IF NOT EXISTS ledger_identifier ON ledger (identifier, id)",
+        """
+            CREATE TABLE IF NOT EXISTS ledger_snapshots (
+                identifier INTEGER NOT NULL,
+                ledger_id INTEGER NOT NULL,
+                money INTEGER NOT NULL,
+                created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (identifier, ledger_id)
+            )
+        """
+    ])
+]
+
+PROVISION_QUERIES = {
+    "users": "INSERT OR IGNORE INTO users (identifier) VALUES (?)",
+    "money": f"INSERT OR IGNORE INTO money (identifier, money) VALUES (?, {INITIAL_MONEY})",
+    # New daily rows are claimable right away and start without a streak
+    "daily": "INSERT OR IGNORE INTO daily (identifier, last_daily, streak) "
+             "VALUES (?, date(?, '-2 days'), 0)",
+    "robbing": "INSERT OR IGNORE INTO robbing (identifier, next_robbing) VALUES (?, ?)"
+}
+
+
+# Columns stored as ISO strings
+DATE_COLUMNS = ("last_daily", "next_robbing")
+
+
+def today():
+    """
+    Return the current local date in the format SQLite stores dates in.
+
+    :return: The date as YYYY-MM-DD string.
+    """
+    return datetime.date.today().isoformat()
+
+
+class SqliteBackend(StorageBackend):
+    """
+        Storage backend for a SQLite database file.
+
+        All statements share one connection, a lock keeps transactions from interleaving.
+        Dates are stored as ISO strings and follow the local timezone (TZ).
+        The time spent waiting for the lock is tracked as connection wait.
+    """
+    def __init__(self, path):
+        """
+        Initialize the backend for a given database file.
+
+        :param path: The path of the database file, ":memory:" for a private database.
+        """
+        self.path = path
+        self.conn = None
+        self.lock = asyncio.Lock()
+        self.stats = QueryStats(slow_ms=float(os.getenv('DB_SLOW_QUERY_MS', '200')))
+
+    async def open(self):
+        """
+        Open the database in WAL mode.
+        """
+        self.conn = await aiosqlite.connect(self.path, isolation_level=None)
+        await self.conn.execute("PRAGMA journal_mode = WAL")
+        await self.conn.execute("PRAGMA synchronous = NORMAL")
+        await self.conn.execute("PRAGMA busy_timeout = 5000")
+
+    async def migrate(self):
+        """
+        Create or upgrade the schema to the latest migration.
+        """
+        await self.execute_query(MIGRATIONS_TABLE)
+        await run_migrations(
+            self.execute_query, MIGRATIONS,
+            "INSERT INTO schema_migrations (version, description) VALUES (?, ?)")
+
+    async def close(self):
+        """
+        Close the database connection.
+        """
+        await self.conn.close()
+
+    async def execute_query(self, query, params=()):
+        """
+        Execute a single SQL statement outside of any running transaction.
+
+        :param query: The SQL statement to execute.
+        :param params: Optional parameters for the SQL statement.
+        :return: The result of the statement.
+        """
+        started = time.perf_counter()
+        async with self.lock:
+            acquired = time.perf_counter()
+            result = await self.conn.execute_fetchall(query, params)
+        self.stats.record(query, params, acquired - started, time.perf_counter() - acquired,
+                          len(result))
+        return result
+
+    @asynccontextmanager
+    async def transaction(self, name):
+        """
+        Run several statements inside a write transaction.
+        The transaction is committed when the block finishes and rolled back on errors.
+
+        :param name: The name the transaction is timed under.
+        :return: The connection bound to the transaction.
+        """
+        started = time.perf_counter()
+        async with self.lock:
+            acquired = time.perf_counter()
+            await self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except BaseException:
+                await self.conn.rollback()
+                raise
+            await self.conn.commit()
+        self.stats.record(f"TRANSACTION {name}", None, acquired - started,
+                          time.perf_counter() - acquired)
+
+    async def load_known_users(self):
+        """
+        Load the identifiers of all provisioned users per table with a single query.
+
+        :return: A list of (table, identifier) tuples.
+        """
+        query = " UNION ALL ".join(
+            [f"SELECT '{table}', identifier FROM {table}" for table in USER_TABLES])
+        return await self.execute_query(query)
+
+    async def provision(self, rows):
+        """
+        Create the given rows with their initial values in a single transaction.
+
+        :param rows: A list of (table, identifier) tuples.
+        """
+        date = today()
+        async with self.transaction("provision") as conn:
+            for table, userid in rows:
+                params = (userid,) if table in ("users", "money") else (userid, date)
+                await conn.execute(PROVISION_QUERIES[table], params)
+
+    async def top_money(self, limit):
+        """
+        Retrieve the richest users ordered by their money in descending order.
+
+        :param limit: The maximum amount of users to retrieve.
+        :return: A list of (identifier, money) rows.
+        """
+        query = "SELECT identifier, money FROM money ORDER BY money DESC LIMIT ?"
+        return await self.execute_query(query, (limit,))
+
+    async def read_money(self, userids):
+        """
+        Read the amount of money for several user IDs with a single query.
+
+        :param userids: The IDs of the users.
+        :return: A dict mapping the found user IDs to the amount of money they have.
+        """
+        placeholders = ", ".join(["?"] * len(userids))
+        query = f"SELECT identifier, money FROM money WHERE identifier IN ({placeholders})"
+        return dict(await self.execute_query(query, list(userids)))
+
+    async def stream_rows(self, table, chunk_size):
+        """
+        Read all rows of an exported table with keyset pagination.
+        Every chunk is a separate query, so the shared connection is only locked
+        while a chunk is read and not while the caller processes it.
+
+        :param table: A table of EXPORT_COLUMNS.
+        :param chunk_size: The maximum amount of rows per chunk.
+        :return: An async generator of lists of rows.
+        """
+        columns = EXPORT_COLUMNS[table]
+        query = (f"SELECT {', '.join(columns)} FROM {table} "
+                 "WHERE identifier > ? ORDER BY identifier LIMIT ?")
+        dates = [index for index, column in enumerate(columns) if column in DATE_COLUMNS]
+        last = -1
+        while chunk := await self.execute_query(query, (last, chunk_size)):
+            last = chunk[-1][0]
+            yield [tuple(datetime.date.fromisoformat(value) if index in dates else value
+                         for index, value in enumerate(row)) for row in chunk]
+
+    async def import_rows(self, table, rows):
+        """
+        Write a chunk of rows of an exported table with a single multi-row upsert.
+
+        :param table: A table of EXPORT_COLUMNS.
+        :param rows: A list of rows.
+        """
+        identifier, *columns = EXPORT_COLUMNS[table]
+        row = "(" + ", ".join(["?"] * (len(columns) + 1)) + ")"
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns)
+        await self.execute_query(
+            f"INSERT INTO {table} ({identifier}, {', '.join(columns)}) "
+            f"VALUES {', '.join([row] * len(rows))} "
+            f"ON CONFLICT (identifier) DO UPDATE SET {updates}",
+            [value.isoformat() if isinstance(value, datetime.date) else value
+             for row in rows for value in row])
+
+    async def set_money(self, userid, money):
+        """
+        Set the amount of money for a given user ID.
+
+        :param userid: The ID of the user.
+        :param money: The amount of money to set.
+        :return: The previous amount of money the user had, or None if the user has no row.
+        """
+        async with self.transaction("set_money") as conn:
+            rows = await conn.execute_fetchall(
+                "SELECT money FROM money WHERE identifier = ?", (userid,))
+            if not rows:
+                return None
+            await conn.execute("UPDATE money SET money = ? WHERE identifier = ?",
+                               (money, userid))
+        return rows[0][0]
+
+    async def write_balances(self, balances):
+        """
+        Write several balances with a single multi-row upsert.
+
+        :param balances: A dict mapping user IDs to their amount of money.
+        """
+        async with self.transaction("write_balances"):
+            await self._upsert_money(balances)
+
+    async def _upsert_money(self, balances):
+        """
+        Upsert balances on the shared connection. The caller has to run it in a transaction.
+
+        :param balances: A dict mapping user IDs to their amount of money.
+        """
+        values = ", ".join(["(?, ?)"] * len(balances))
+        await self.conn.execute(
+            f"INSERT INTO money (identifier, money) VALUES {values} "
+            "ON CONFLICT (identifier) DO UPDATE SET money = excluded.money",
+            [value for row in balances.items() for value in row])
+
+    async def adjust_money(self, userid, delta, floor):
+        """
+        Atomically add a delta to the money of a given user ID.
+
+        :param userid: The ID of the user.
+        :param delta: The amount to add (negative to subtract).
+        :param floor: The lowest balance the user can end up with.
+        :return: A tuple (previous, money) with the balance before and after the change,
+                 or None if the user has no row.
+        """
+        async with self.transaction("adjust_money") as conn:
+            rows = await conn.execute_fetchall(
+                "SELECT money FROM money WHERE identifier = ?", (userid,))
+            if not rows:
+                return None
+            previous = rows[0][0]
+            money = max(previous + delta, floor)
+            await conn.execute("UPDATE money SET money = ? WHERE identifier = ?",
+                               (money, userid))
+        return previous, money
+
+    async def debit_money(self, userid, amount):
+        """
+        Atomically withdraw an amount from a given user ID if the user can cover it.
+
+        :param userid: The ID of the user.
+        :param amount: The amount to withdraw.
+        :return: The new amount of money the user has, or None if nothing was withdrawn.
+        """
+        query = """
+            UPDATE money SET money = money - ?
+            WHERE identifier = ? AND money >= ? RETURNING money
+        """
+        result = await self.execute_query(query, (amount, userid, amount))
+        return result[0][0] if result else None
+
+    async def transfer_many(self, userids, transfers):
+        """
+        Settle several transfers in a single write transaction.
+
+        :param userids: The sorted IDs of all involved users.
+        :param transfers: A list of (from_id, to_id, amount) tuples.
+        :return: A tuple (balances, results) as produced by apply_transfers.
+        """
+        placeholders = ", ".join(["?"] * len(userids))
+        query = f"SELECT identifier, money FROM money WHERE identifier IN ({placeholders})"
+        async with self.transaction("transfer_many") as conn:
+            balances = dict(await conn.execute_fetchall(query, userids))
+            results = apply_transfers(balances, transfers)
+            await self._upsert_money(balances)
+        return balances, results
+
+    async def reserve_bet(self, userid, amount, game):
+        """
+        Atomically move a bet from the balance of a user ID into the escrow table.
+
+        :param userid: The ID of the user.
+        :param amount: The amount to hold.
+        :param game: The name of the game the bet is placed in.
+        :return: A tuple (hold_id, money), or None if the user cannot cover the bet.
+        """
+        debit_query = """
+            UPDATE money SET money = money - ?
+            WHERE identifier = ? AND money >= ? RETURNING money
+        """
+        hold_query = "INSERT INTO escrow (identifier, amount, game) VALUES (?, ?, ?)"
+        async with self.transaction("reserve_bet") as conn:
+            result = await conn.execute_fetchall(debit_query, (amount, userid, amount))
+            if not result:
+                return None
+            cursor = await conn.execute(hold_query, (userid, amount, game))
+            return cursor.lastrowid, result[0][0]
+
+    async def settle_bet(self, hold_id, multiplier):
+        """
+        Release a hold and credit the payout to its user in a single transaction.
+
+        :param hold_id: The ID of the hold.
+        :param multiplier: The payout as a multiple of the bet.
+        :return: A tuple (userid, money), or None if the hold is already released.
+        """
+        async with self.transaction("settle_bet") as conn:
+            hold = await conn.execute_fetchall(
+                "DELETE FROM escrow WHERE id = ? RETURNING identifier, amount", (hold_id,))
+            if not hold:
+                return None
+            userid, amount = hold[0]
+            result = await conn.execute_fetchall(
+                "UPDATE money SET money = money + ? WHERE identifier = ? RETURNING money",
+                (int(amount * multiplier), userid))
+            return userid, result[0][0]
+
+    async def sweep_bets(self):
+        """
+        Refund and remove all holds in a single transaction.
+
+        :return: The amount of refunded holds.
+        """
+        refund_query = """
+            UPDATE money SET money = money + (
+                SELECT SUM(amount) FROM escrow WHERE escrow.identifier = money.identifier
+            ) WHERE identifier IN (SELECT identifier FROM escrow)
+        """
+        async with self.transaction("sweep_bets") as conn:
+            ((orphaned,),) = await conn.execute_fetchall("SELECT COUNT(*) FROM escrow")
+            if orphaned:
+                await conn.execute(refund_query)
+                await conn.execute("DELETE FROM escrow")
+        return orphaned
+
+    async def update_in_chunks(self, table, assignments, condition, params, dry_run):
+        """
+        Run a set-based UPDATE in chunks of BULK_CHUNK_SIZE identifiers, so the shared
+        connection is released between the chunks and other queries can run in between.
+
+        :param table: The table to update.
+        :param assignments: A tuple (SET clause, parameters).
+        :param condition: The WHERE clause selecting the rows to change.
+        :param params: The parameters of the WHERE clause.
+        :param dry_run: Whether to only count the matching rows.
+        :return: The amount of matched rows.
+        """
+        if dry_run:
+            (count,), = await self.execute_query(
+                f"SELECT COUNT(*) FROM {table} WHERE {condition}", params)
+            return count
+        bound_query = f"""
+            SELECT MAX(identifier) FROM (
+                SELECT identifier FROM {table} WHERE identifier > ?
+                ORDER BY identifier LIMIT ?
+            )
+        """
+        assignments, assignment_params = assignments
+        update_query = f"""
+            UPDATE {table} SET {assignments}
+            WHERE identifier > ? AND identifier <= ? AND {condition}
+            RETURNING identifier
+        """
+        matched, last = 0, -1
+        while True:
+            (upper,), = await self.execute_query(bound_query, (last, BULK_CHUNK_SIZE))
+            if upper is None:
+                return matched
+            matched += len(await self.execute_query(
+                update_query, (*assignment_params, last, upper, *params)))
+            last = upper
+
+    async def scale_money(self, above, factor, dry_run):
+        """
+        Multiply every balance above a threshold by a factor with chunked UPDATEs.
+
+        :param above: Only balances greater than this are changed.
+        :param factor: The factor.
+        :param dry_run: Whether to only count the rows that would change.
+        :return: The amount of matched rows.
+        """
+        return await self.update_in_chunks("money", ("money = CAST(money * ? AS INTEGER)",
+                                                     (factor,)),
+                                           "money > ?", (above,), dry_run)
+
+    async def cap_money(self, cap, dry_run):
+        """
+        Lower every balance above a cap to the cap with chunked UPDATEs.
+
+        :param cap: The highest balance a user can have.
+        :param dry_run: Whether to only count the rows that would change.
+        :return: The amount of matched rows.
+        """
+        return await self.update_in_chunks("money", ("money = ?", (cap,)),
+                                           "money > ?", (cap,), dry_run)
+
+    async def credit_money(self, userids, amount, dry_run):
+        """
+        Add an amount to the balances of several user IDs,
+        with one UPDATE per BULK_CHUNK_SIZE users.
+
+        :param userids: The IDs of the users.
+        :param amount: The amount to add.
+        :param dry_run: Whether to only count the rows that would change.
+        :return: The amount of matched rows.
+        """
+        matched = 0
+        for start in range(0, len(userids), BULK_CHUNK_SIZE):
+            chunk = userids[start:start + BULK_CHUNK_SIZE]
+            placeholders = ", ".join(["?"] * len(chunk))
+            if dry_run:
+                (count,), = await self.execute_query(
+                    f"SELECT COUNT(*) FROM money WHERE identifier IN ({placeholders})", chunk)
+                matched += count
+            else:
+                matched += len(await self.execute_query(
+                    f"UPDATE money SET money = money + ? WHERE identifier IN ({placeholders}) "
+                    "RETURNING identifier", (amount, *chunk)))
+        return matched
+
+    async def reset_streaks(self, dry_run):
+        """
+        Reset every daily streak to zero with chunked UPDATEs.
+
+        :param dry_run: Whether to only count the rows that would change.
+        :return: The amount of matched rows.
+        """
+        return await self.update_in_chunks("daily", ("streak = 0", ()),
+                                           "streak > 0", (), dry_run)
+
+    async def append_ledger(self, entries):
+        """
+        Append entries to the ledger with a single multi-row insert.
+
+        :param entries: A list of (identifier, delta, balance, game, reference, created_at)
+            tuples.
+        """
+        values = ", ".join(["(?, ?, ?, ?, ?, ?)"] * len(entries))
+        await self.execute_query(
+            "INSERT INTO ledger (identifier, delta, balance, game, reference, created_at) "
+            f"VALUES {values}",
+            [value.isoformat(" ") if isinstance(value, datetime.datetime) else value
+             for entry in entries for value in entry])
+
+    async def snapshot_ledger(self, userids):
+        """
+        Record the current balances of several user IDs with a single INSERT ... SELECT.
+
+        :param userids: The IDs of the users.
+        """
+        placeholders = ", ".join(["?"] * len(userids))
+        await self.execute_query(f"""
+            INSERT INTO ledger_snapshots (identifier, ledger_id, money)
+            SELECT money.identifier, MAX(ledger.id), money.money
+            FROM money JOIN ledger ON ledger.identifier = money.identifier
+            WHERE money.identifier IN ({placeholders})
+            GROUP BY money.identifier
+            ON CONFLICT (identifier, ledger_id) DO UPDATE SET money = excluded.money
+        """, list(userids))
+
+    async def read_ledger(self, userid, before, limit):
+        """
+        Read a page of the ledger of a given user ID by keyset pagination
+        on the (identifier, id) index.
+
+        :param userid: The ID of the user.
+        :param before: Only entries with a smaller ID are read, None to start at the newest.
+        :param limit: The maximum amount of entries.
+        :return: A list of (id, delta, balance, game, reference, created_at) tuples.
+        """
+        query = """
+            SELECT id, delta, balance, game, reference, created_at FROM ledger
+            WHERE identifier = ? AND id < ? ORDER BY id DESC LIMIT ?
+        """
+        return [(*row[:5], datetime.datetime.fromisoformat(row[5])) for row in
+                await self.execute_query(query, (userid, before or 2 ** 63 - 1, limit))]
+
+    async def read_daily(self, userid):
+        """
+        Read the date of the last daily claim of a given user ID.
+
+        :param userid: The ID of the user.
+        :return: The date, or None if the user has no row.
+        """
+        query = "SELECT last_daily FROM daily WHERE identifier = ?"
+        result = await self.execute_query(query, (userid,))
+        return datetime.date.fromisoformat(result[0][0]) if result else None
+
+    async def claim_daily(self, userid, credit):
+        """
+        Claim the daily reward for a given user ID in a single transaction.
+
+        :param userid: The ID of the user.
+        :param credit: Whether the reward is credited to the money row as well.
+        :return: A tuple (streak, money), or None if already claimed.
+        """
+        streak_query = """
+            UPDATE daily SET streak = CASE
+                WHEN last_daily = date(:today, '-1 day') THEN MIN(streak + 1, 61) ELSE 0 END,
+                last_daily = :today
+            WHERE identifier = :userid AND last_daily < :today
+            RETURNING streak
+        """
+        money_query = "UPDATE money SET money = money + ? WHERE identifier = ? RETURNING money"
+        async with self.transaction("claim_daily") as conn:
+            result = await conn.execute_fetchall(streak_query,
+                                                 {"today": today(), "userid": userid})
+            if not result:
+                return None
+            streak = result[0][0]
+            if not credit:
+                return streak, None
+            result = await conn.execute_fetchall(
+                money_query, (DAILY_REWARD + daily_bonus(streak), userid))
+            return streak, result[0][0]
+
+    async def read_robbing(self, userid):
+        """
+        Read the next robbing date of a given user ID.
+
+        :param userid: The ID of the user.
+        :return: The date, or None if the user has no row.
+        """
+        query = "SELECT next_robbing FROM robbing WHERE identifier = ?"
+        result = await self.execute_query(query, (userid,))
+        return datetime.date.fromisoformat(result[0][0]) if result else None
+
+    async def write_robbing(self, userid, next_robbing):
+        """
+        Set the next robbing date of a given user ID.
+
+        :param userid: The ID of the user.
+        :param next_robbing: The next robbing date.
+        """
+        await self.execute_query("UPDATE robbing SET next_robbing = ? WHERE identifier = ?",
+                                 (next_robbing.isoformat(), userid))
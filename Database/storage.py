@@ -0,0 +1,331 @@
+"""
+Storage backend interface.
+
+This module defines the StorageBackend class every storage engine behind the
+DbController implements, together with the rules shared by all engines.
+"""
+
+USER_TABLES = ("users", "money", "daily", "robbing")
+INITIAL_MONEY = 1000
+DAILY_REWARD = 300
+# Maximum amount of rows a bulk update changes per statement
+BULK_CHUNK_SIZE = 1000
+# Columns of the tables in the economy export, the identifier always comes first
+EXPORT_COLUMNS = {
+    "money": ("identifier", "money"),
+    "daily": ("identifier", "last_daily", "streak"),
+    "robbing": ("identifier", "next_robbing")
+}
+
+
+def daily_bonus(streak):
+    """
+    Calculate the bonus of a daily reward for a given streak.
+
+    :param streak: The amount of days claimed in a row.
+    :return: The bonus in coins (at most 300).
+    """
+    return min(streak * 5, 300)
+
+
+def apply_transfers(balances, transfers):
+    """
+    Apply transfers in order to a dict of balances, skipping those the payer cannot cover.
+
+    :param balances: A dict mapping user IDs to their amount of money, changed in place.
+    :param transfers: A list of (from_id, to_id, amount) tuples.
+    :return: A list with a tuple (from_money, to_money) or None per transfer.
+    """
+    results = []
+    for from_id, to_id, amount in transfers:
+        from_id, to_id = int(from_id), int(to_id)
+        if balances[from_id] < amount:
+            results.append(None)
+            continue
+        balances[from_id] -= amount
+        balances[to_id] += amount
+        results.append((balances[from_id], balances[to_id]))
+    return results
+
+
+class StorageBackend:
+    """
+        Query set of the money, daily, robbing and users tables.
+
+        Every method is atomic on its own. Caching and the index of provisioned users
+        are handled by the DbController, so a backend only talks to its storage.
+    """
+    # QueryStats of the backend, None if it runs no SQL
+    stats = None
+
+    async def open(self):
+        """
+        Connect to the storage.
+        """
+        raise NotImplementedError
+
+    def pool_status(self):
+        """
+        Return the counters of the connection pools.
+
+        :return: A dict mapping the pool names to dicts with the in-use, idle, waiter,
+            size and limit counts, or None if the backend has no pool.
+        """
+        return None
+
+    async def migrate(self):
+        """
+        Create or upgrade the schema to the latest migration, recording applied versions.
+        """
+        raise NotImplementedError
+
+    async def close(self):
+        """
+        Write everything pending and release the connections.
+        """
+        raise NotImplementedError
+
+    async def load_known_users(self):
+        """
+        Load the identifiers of all provisioned users per table.
+
+        :return: A list of (table, identifier) tuples.
+        """
+        raise NotImplementedError
+
+    async def provision(self, rows):
+        """
+        Create the given rows with their initial values, existing rows are left untouched.
+        New daily rows are claimable right away, new robbing rows allow robbing today.
+
+        :param rows: A list of (table, identifier) tuples.
+        """
+        raise NotImplementedError
+
+    async def top_money(self, limit):
+        """
+        Retrieve the richest users ordered by their money in descending order.
+
+        :param limit: The maximum amount of users to retrieve.
+        :return: A list of (identifier, money) tuples.
+        """
+        raise NotImplementedError
+
+    async def read_money(self, userids):
+        """
+        Read the amount of money for several user IDs.
+
+        :param userids: The IDs of the users.
+        :return: A dict mapping the found user IDs to the amount of money they have.
+        """
+        raise NotImplementedError
+
+    def stream_rows(self, table, chunk_size):
+        """
+        Read all rows of an exported table ordered by their identifier, chunk by chunk,
+        without loading the whole table into memory.
+
+        :param table: A table of EXPORT_COLUMNS.
+        :param chunk_size: The maximum amount of rows per chunk.
+        :return: An async generator of lists of rows with the columns of EXPORT_COLUMNS.
+            Dates are returned as datetime.date.
+        """
+        raise NotImplementedError
+
+    async def import_rows(self, table, rows):
+        """
+        Write a chunk of rows of an exported table at once, replacing existing rows.
+
+        :param table: A table of EXPORT_COLUMNS.
+        :param rows: A list of rows with the columns of EXPORT_COLUMNS.
+        """
+        raise NotImplementedError
+
+    async def set_money(self, userid, money):
+        """
+        Set the amount of money for a given user ID.
+
+        :param userid: The ID of the user.
+        :param money: The amount of money to set.
+        :return: The previous amount of money the user had, or None if the user has no row.
+        """
+        raise NotImplementedError
+
+    async def write_balances(self, balances):
+        """
+        Write several balances at once, creating missing rows.
+
+        :param balances: A dict mapping user IDs to their amount of money.
+        """
+        raise NotImplementedError
+
+    async def adjust_money(self, userid, delta, floor):
+        """
+        Add a delta to the money of a given user ID without dropping below the floor.
+
+        :param userid: The ID of the user.
+        :param delta: The amount to add (negative to subtract).
+        :param floor: The lowest balance the user can end up with.
+        :return: A tuple (previous, money) with the balance before and after the change,
+                 or None if the user has no row.
+        """
+        raise NotImplementedError
+
+    async def debit_money(self, userid, amount):
+        """
+        Withdraw an amount from a given user ID if the user can cover it.
+
+        :param userid: The ID of the user.
+        :param amount: The amount to withdraw.
+        :return: The new amount of money the user has, or None if nothing was withdrawn.
+        """
+        raise NotImplementedError
+
+    async def transfer_many(self, userids, transfers):
+        """
+        Settle several transfers between provisioned users at once.
+
+        :param userids: The sorted IDs of all involved users.
+        :param transfers: A list of (from_id, to_id, amount) tuples.
+        :return: A tuple (balances, results) as produced by apply_transfers.
+        """
+        raise NotImplementedError
+
+    async def reserve_bet(self, userid, amount, game):
+        """
+        Move a bet from the balance of a given user ID into escrow.
+
+        :param userid: The ID of the user.
+        :param amount: The amount to hold.
+        :param game: The name of the game the bet is placed in.
+        :return: A tuple (hold_id, money), or None if the user cannot cover the bet.
+        """
+        raise NotImplementedError
+
+    async def settle_bet(self, hold_id, multiplier):
+        """
+        Release a hold and credit the payout to its user.
+
+        :param hold_id: The ID of the hold.
+        :param multiplier: The payout as a multiple of the bet.
+        :return: A tuple (userid, money), or None if the hold is already released.
+        """
+        raise NotImplementedError
+
+    async def sweep_bets(self):
+        """
+        Refund and remove all holds.
+
+        :return: The amount of refunded holds.
+        """
+        raise NotImplementedError
+
+    async def scale_money(self, above, factor, dry_run):
+        """
+        Multiply every balance above a threshold by a factor, rounding down.
+
+        :param above: Only balances greater than this are changed.
+        :param factor: The factor, e.g. 0.9 for a tax of 10 percent.
+        :param dry_run: Whether to only count the rows that would change.
+        :return: The amount of matched rows.
+        """
+        raise NotImplementedError
+
+    async def cap_money(self, cap, dry_run):
+        """
+        Lower every balance above a cap to the cap.
+
+        :param cap: The highest balance a user can have.
+        :param dry_run: Whether to only count the rows that would change.
+        :return: The amount of matched rows.
+        """
+        raise NotImplementedError
+
+    async def credit_money(self, userids, amount, dry_run):
+        """
+        Add an amount to the balances of several provisioned user IDs.
+
+        :param userids: The IDs of the users.
+        :param amount: The amount to add.
+        :param dry_run: Whether to only count the rows that would change.
+        :return: The amount of matched rows.
+        """
+        raise NotImplementedError
+
+    async def reset_streaks(self, dry_run):
+        """
+        Reset every daily streak to zero.
+
+        :param dry_run: Whether to only count the rows that would change.
+        :return: The amount of matched rows.
+        """
+        raise NotImplementedError
+
+    async def append_ledger(self, entries):
+        """
+        Append entries to the ledger.
+
+        :param entries: A list of (identifier, delta, balance, game, reference, created_at)
+            tuples, created_at being a datetime.datetime.
+        """
+        raise NotImplementedError
+
+    async def snapshot_ledger(self, userids):
+        """
+        Record the current balances of several user IDs together with the ID of their
+        latest ledger entry.
+
+        :param userids: The IDs of the users.
+        """
+        raise NotImplementedError
+
+    async def read_ledger(self, userid, before, limit):
+        """
+        Read the latest ledger entries of a given user ID older than a given entry.
+
+        :param userid: The ID of the user.
+        :param before: Only entries with a smaller ID are read, None to start at the newest.
+        :param limit: The maximum amount of entries.
+        :return: A list of (id, delta, balance, game, reference, created_at) tuples ordered
+            by ID in descending order, created_at being a datetime.datetime.
+        """
+        raise NotImplementedError
+
+    async def read_daily(self, userid):
+        """
+        Read the date of the last daily claim of a given user ID.
+
+        :param userid: The ID of the user.
+        :return: A datetime.date, or None if the user has no row.
+        """
+        raise NotImplementedError
+
+    async def claim_daily(self, userid, credit):
+        """
+        Claim the daily reward if it was not claimed today and advance or reset the streak
+        (at most 61). The reward is DAILY_REWARD plus the bonus of the new streak.
+
+        :param userid: The ID of the user.
+        :param credit: Whether the reward is credited to the money row as well.
+        :return: A tuple (streak, money), or None if already claimed.
+            The money is None if the reward was not credited.
+        """
+        raise NotImplementedError
+
+    async def read_robbing(self, userid):
+        """
+        Read the next robbing date of a given user ID.
+
+        :param userid: The ID of the user.
+        :return: A datetime.date, or None if the user has no row.
+        """
+        raise NotImplementedError
+
+    async def write_robbing(self, userid, next_robbing):
+        """
+        Set the next robbing date of a given user ID.
+
+        :param userid: The ID of the user.
+        :param next_robbing: A datetime.date.
+        """
+        raise NotImplementedError
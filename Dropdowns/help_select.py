@@ -5,7 +5,43 @@ die für die Erstellung und Verwaltung von Dropdown-Menüs in einem Discord-Bot
 
 import discord
 from discord import Member
-from Dropdowns.universal_select import UniversalSelect
+from Dropdowns.universal_select import UniversalSelect, SelectCatalog
+
+_options = [
+    discord.SelectOption(label="Allgemein",
+                         description="Allgemeine Commands für den Bot",
+                         emoji="📖"),
+    discord.SelectOption(label="Games",
+                         description="Commands für die Games",
+                         emoji="🎮"),
+    discord.SelectOption(label="Quotes",
+                         description="Zitate aus verschiedenen Bereichen",
+                         emoji="📒")
+]
+_response = { "Allgemein": [
+    [".help", "Zeigt diese Hilfe an", True],
+    [".invite", "Sendet den Inivtelink", True],
+    [".stream", "Zeigt die Streaming-Url an", True],
+    [".alias", "Zeigt die Aliasliste an", True],
+    [".ping", "Pong", True]
+],
+    "Games": [
+        [".scoreboard", "Zeigt das Scoreboard an", True],
+        [".daily", "Claim der daily Coins", True],
+        [".money (user)", "Zeigt dein Aktuelles Guthaben (oder eines Users)", True],
+        [".send <user> <money>", "Sendet den Betrag an den Ausgewählten User", True],
+        [".blackjack <einsatz>", "Startet ein Blackjack Spiel mit gegeben Einsatz", True],
+        [".higherlow <einsatz>", "Startet ein Higher-Lower Game von 1 bis 100", True],
+        [".roulette <einsatz> <wettstein>",
+         "Startet ein Roulette Spiel mit gegeben Einsatz auf den gesetzten Wert", True],
+        [".rob (player)", "Raube die Bank aus (oder einen User)", True]
+    ],
+    "Quotes": [
+        [".quote", "Gibt ein Zufälliges Anime Zitat aus", True],
+        [".qotd", "Gibt das Zitat des Tages aus", True]
+    ]}
+HELP_CATALOG = SelectCatalog(_options, _response)
+
 
 class HelpSelect(UniversalSelect):
     """
@@ -24,40 +60,7 @@ class HelpSelect(UniversalSelect):
             user (Member): Der Benutzer, der das Dropdown-Menü verwendet.
             view (discord.ui.View): Die Ansicht, die das Dropdown-Menü enthält.
         """
-        options = [
-            discord.SelectOption(label="Allgemein",
-                                 description="Allgemeine Commands für den Bot",
-                                 emoji="📖"),
-            discord.SelectOption(label="Games",
-                                 description="Commands für die Games",
-                                 emoji="🎮"),
-            discord.SelectOption(label="Quotes",
-                                 description="Zitate aus verschiedenen Bereichen",
-                                 emoji="📒")
-        ]
-        response = { "Allgemein": [
-            [".help", "Zeigt diese Hilfe an", True],
-            [".invite", "Sendet den Inivtelink", True],
-            [".stream", "Zeigt die Streaming-Url an", True],
-            [".alias", "Zeigt die Aliasliste an", True],
-            [".ping", "Pong", True]
-        ],
-            "Games": [
-                [".scoreboard", "Zeigt das Scoreboard an", True],
-                [".daily", "Claim der daily Coins", True],
-                [".money (user)", "Zeigt dein Aktuelles Guthaben (oder eines Users)", True],
-                [".send <user> <money>", "Sendet den Betrag an den Ausgewählten User", True],
-                [".blackjack <einsatz>", "Startet ein Blackjack Spiel mit gegeben Einsatz", True],
-                [".higherlow <einsatz>", "Startet ein Higher-Lower Game von 1 bis 100", True],
-                [".roulette <einsatz> <wettstein>",
-                 "Startet ein Roulette Spiel mit gegeben Einsatz auf den gesetzten Wert", True],
-                [".rob (player)", "Raube die Bank aus (oder einen User)", True]
-            ],
-            "Quotes": [
-                [".quote", "Gibt ein Zufälliges Anime Zitat aus", True],
-                [".qotd", "Gibt das Zitat des Tages aus", True]
-            ]}
-        super().__init__(user, options, response, view)
+        super().__init__(user, HELP_CATALOG, view)
 
 class HelpSelectView(discord.ui.View):
     """
@@ -1,12 +1,33 @@
 """
 Dieses Modul enthält die UniversalSelect-Klasse,
-die eine benutzerdefinierte Auswahlkomponente für Discord-Bots darstellt.
+die eine benutzerdefinierte Auswahlkomponente für Discord-Bots darstellt,
+und die SelectCatalog-Klasse mit den unveränderlichen Daten eines Menüs.
 """
+from types import MappingProxyType
 from discord import Interaction, SelectOption, Member
 from discord.ui import Select
-from Util.variables import OWNER
 from Util.util_commands import create_select_embed
-from config_loader import Loader
+
+
+class SelectCatalog:
+    """
+    Die Optionen und vorbereiteten Felder eines Menüs. Ein Katalog wird einmal beim Import
+    erstellt und von allen Menüs geteilt.
+    """
+    __slots__ = ("options", "fields")
+
+    def __init__(self, options: list[SelectOption], response: dict):
+        """
+        Initialisiert einen Katalog.
+
+        :param options: Eine Liste von Auswahloptionen.
+        :param response: Ein Wörterbuch mit den Feldern [Name, Wert, Inline]
+                         für jede Auswahloption.
+        """
+        self.options = tuple(options)
+        self.fields = MappingProxyType({label: tuple((name, value, inline)
+                                                     for name, value, inline in fields)
+                                        for label, fields in response.items()})
 
 class UniversalSelect(Select):
     """
@@ -28,25 +49,22 @@ class UniversalSelect(Select):
         """
         self._view = value
 
-    def __init__(self, user: Member, options: list[SelectOption], response: dict, view):
+    def __init__(self, user: Member, catalog: SelectCatalog, view):
         """
         Initialisiert eine neue Instanz der UniversalSelect-Klasse.
 
         :param user: Der Benutzer, der die Auswahl trifft.
-        :param options: Eine Liste von Auswahloptionen.
-        :param response: Ein Wörterbuch mit den Antworten für jede Auswahloption.
+        :param catalog: Der Katalog mit den Optionen und Feldern des Menüs.
         :param view: Die Ansicht, die aktualisiert werden soll.
         """
         self.user = user
-        self.response = response
+        self.response = catalog.fields
         self.embed = create_select_embed(user)
         self.view = view
-        self.loaded_config = Loader(OWNER).load_config("embed")
-        self.embed.set_thumbnail(url=self.loaded_config["embeds_thumbnail"])
         super().__init__(placeholder="Wähle eine Category",
                          max_values=1,
                          min_values=1,
-                         options=options)
+                         options=list(catalog.options))
 
     async def callback(self, interaction: Interaction):
         """
@@ -1,5 +1,7 @@
 import random
 
+CARD_ICONS = {"König": "K", "Bube": "B", "Dame": "D", "Ass": "A"}
+
 
 class Blackjack:
     def __init__(self, bet):
@@ -23,6 +25,9 @@ class Blackjack:
         self.playerdrawn = []
         self.natural_player = False
         self.dealerdrawn = []
+        # Die Karten als Text, bei jedem Ziehen fortgeschrieben
+        self.playercards = ""
+        self.dealercards = ""
         self.playerstand = False
         self.dealerstand = False
 
@@ -57,10 +62,13 @@ class Blackjack:
         if len(self.kinds[drawnnum]) - 1 == 0:
             self.cards.pop(drawnnum)
         self.kinds[drawnnum].pop(kindnum)
+        icon = CARD_ICONS.get(drawn, drawn)
         if who == "dealer":
             self.dealerdrawn.append([drawn, kind])
+            self.dealercards = f"{self.dealercards}, {icon}" if self.dealercards else icon
         elif who == "player":
             self.playerdrawn.append([drawn, kind])
+            self.playercards = f"{self.playercards}, {icon}" if self.playercards else icon
         self.recalc(who)
 
     def recalc(self, who):
@@ -160,8 +168,8 @@ class Blackjack:
             return "player"
         return "draw"
 
-    def get_money(self):
-        winner = self.won()
+    def get_money(self, winner=None):
+        winner = winner or self.won()
         if winner == "player":
             return int(self.bet) * 2
         if winner == "dealer":
@@ -5,7 +5,7 @@ die Funktionen zum Ausrauben von Spielern und Banken in einem Discord-Bot implem
 import random
 import discord
 from discord.ext.commands import Context
-from Util.variables import currentlyGaming
+from Util.variables import game_sessions
 from Util.util_commands import send_message, return_author, get_money_for_user, db
 
 
@@ -60,23 +60,24 @@ class Rob:
         """
         # TODO UPDATE: implement Gun-Item from Shop
         author = return_author(ctx)
-        user_money = await get_money_for_user(author)
-        currentlyGaming.append(str(author.id))
-        if player is not None:
-            auszeit = 2
-            await self.rob_player(player, ctx, author, user_money)
+        async with game_sessions.session("rob", author.id) as session:
+            if session is None:
+                await send_message(ctx, f"{author.mention}. Du bist beschäftigt mit etwas "
+                                        f"anderem!!!", delete_after=5)
+                return
+            if player is not None:
+                auszeit = 2
+                await self.rob_player(player, ctx, author, session)
+
+            else:
+                auszeit = 5
+                await self.rob_bank(ctx, author, await get_money_for_user(author))
 
-        else:
-            auszeit = 5
-            await self.rob_bank(ctx, author, user_money)
-
-        currentlyGaming.remove(str(author.id))
-        currentlyGaming.remove(str(player.id))
         await self.set_robbing_stop(auszeit, author.id)
 
     @staticmethod
     async def rob_player(player: discord.Member, ctx: discord.Interaction | Context,
-                     user, user_money):
+                     user, session):
         """
         Attempts to rob another player.
 
@@ -84,7 +85,7 @@ class Rob:
             player (discord.Member): The player to rob.
             ctx (discord.Interaction | Context): The context of the command.
             user: The user initiating the robbing action.
-            user_money: The amount of money the user has.
+            session: The game session of the user, the player joins it while being robbed.
 
         Returns:
             None
@@ -93,12 +94,13 @@ class Rob:
             await send_message(ctx, msg="Please stop pinging the Bots!!", delete_after=10)
             return
 
-        if str(player.id) in currentlyGaming:
+        if not await game_sessions.join(session, player.id):
             await send_message(ctx, "Der User ist beschäftigt, bitte warten.", delete_after=10)
             return
 
-        currentlyGaming.append(str(player.id))
-        robbing_money = await db.get_money_for_user(player.id)
+        balances = await db.get_money_for_users([user.id, player.id])
+        user_money = balances[user.id]
+        robbing_money = balances[player.id]
 
         if user_money < 250:
             await send_message(msg="Du hast nichtmal Geld für die Mindeststrafe. "
@@ -115,12 +117,13 @@ class Rob:
 
         chance = random.randint(0, 10)
         if chance < 3:
+            if await db.transfer(player.id, user.id, worth, game="rob") is None:
+                await send_message(msg=player.mention + " hat das Geld rechtzeitig in Sicherheit "
+                                       "gebracht. Du gehst leer aus.", ctx=ctx)
+                return
             await send_message(msg="Du hast " + player.mention + f" um {worth} :coin: beraubt. \n"
                                  f"\nDu beschließt für ein paar Tage niemanden mehr zu berauben. "
                                  f"Aber vielleicht ja in 2 Tagen wieder.", ctx=ctx)
-            new_money = user_money + worth
-            new_robbing_money = robbing_money - worth
-            await db.set_money_for_user(player.id, new_robbing_money)
         else:
             penalty = int(user_money * 0.1)
             penalty = min(penalty, 4000)
@@ -128,9 +131,7 @@ class Rob:
                                  "als Strafe zahlen. \n\nDu beschließt für ein paar Tage "
                                  "niemanden mehr zu berauben. Aber vielleicht ja in 2 Tagen wieder."
                                , ctx=ctx)
-            new_money = user_money - penalty
-
-        await db.set_money_for_user(user.id, new_money)
+            await db.adjust_money(user.id, -penalty, game="rob")
 
     async def rob_bank(self, ctx: discord.Interaction | Context, user, user_money):
         """
@@ -154,13 +155,12 @@ class Rob:
             await send_message(ctx, "Du hast die Bank erfolgreich ausgeraubt. "
                                     "Die hast 7000 :coin: erhalten. Musst aber für 5 Tage "
                                     "untertauchen\n(Darfst niemanden ausrauben)")
-            await db.set_money_for_user(user.id, user_money + 7000)
+            await db.adjust_money(user.id, 7000, game="rob")
         else:
             penalty = max(300, int(user_money * 0.075))
             penalty = min(penalty, 5000)
             reason: str = random.choice(self.bank_caught)
-            new_money = user_money - penalty
-            await db.set_money_for_user(user.id, new_money)
+            await db.adjust_money(user.id, -penalty, game="rob")
             await send_message(ctx, reason.replace("{money}", str(penalty)) +
                                "\nDu musst für 5 Tage untertauchen (Darfst niemanden ausrauben)")
 
@@ -3,11 +3,11 @@ Dieses Modul enthält Funktionen zur Simulation eines Roulette-Spiels
 unter Verwendung der Discord-Bibliothek.
 """
 
-import asyncio
 import random
 from discord import Interaction
 from discord.ext.commands import Context
 from Util.util_commands import send_message
+from Util.variables import animations
 
 # Liste der Roulette-Zahlen und ihrer Farben
 ROULETTE_NUMBERS = [
@@ -20,27 +20,27 @@ ROULETTE_NUMBERS = [
     (29, "black"), (7, "red"), (28, "black"), (12, "red"), (35, "black"),
     (3, "red"), (26, "black"), (0, "green")
 ]
+COLOR_ICONS = {"green": ":green_square:", "red": ":red_square:", "black": ":black_large_square:"}
+# Sekunden zwischen zwei Zwischenergebnissen des Drehs
+SPIN_DELAY = 0.5
+SPIN_FRAMES = 4
 
-async def play_roulette(entry, bet_type: str, msg) -> bool:
+async def play_roulette(entry, bet_type: str, animation) -> bool:
     """
-    Simuliert ein Roulette-Spiel und aktualisiert die Nachricht mit dem Ergebnis.
+    Simuliert ein Roulette-Spiel und zeigt das Ergebnis als letzten Frame der Animation.
 
     Args:
         entry: Die Wette des Spielers (Zahl oder Farbe).
         bet_type (str): Der Typ der Wette ("number" oder "color").
-        msg: Die Nachricht, die aktualisiert werden soll.
+        animation (Animation): Die Animation des Drehs aus `spinning`.
 
     Returns:
         bool: True, wenn die Wette gewonnen wurde, sonst False.
     """
     random.shuffle(ROULETTE_NUMBERS)
     winning = random.choice(ROULETTE_NUMBERS)
-    if winning[1] == "green":
-        await msg.edit(content=f"Landed: **{winning[0]}** :green_square:")
-    elif winning[1] == "red":
-        await msg.edit(content=f"Landed: **{winning[0]}** :red_square:")
-    elif winning[1] == "black":
-        await msg.edit(content=f"Landed: **{winning[0]}** :black_large_square:")
+    await animation.finish(SPIN_DELAY,
+                           content=f"Landed: **{winning[0]}** {COLOR_ICONS[winning[1]]}")
     if bet_type == "number":
         entry = int(entry)
         return entry == winning[0]
@@ -65,30 +65,20 @@ def validate_entry(entry: str):
 
 async def spinning(ctx: Context | Interaction):
     """
-    Simuliert das Drehen des Roulette-Rads und sendet die Zwischenergebnisse.
+    Sendet das erste Zwischenergebnis des Roulette-Rads und plant die weiteren
+    als Animation, ohne auf sie zu warten.
 
     Args:
         ctx (Context | Interaction): Der Kontext der Discord-Nachricht.
 
     Returns:
-        msg: Die Nachricht mit dem Endergebnis des Drehs.
+        Animation: Die Animation des Drehs, die `play_roulette` mit dem Ergebnis beendet.
     """
-    msg = None
-    for _ in range(4):
+    spin_number, spin_color = random.choice(ROULETTE_NUMBERS)
+    msg = await send_message(ctx, f"Spinning... **{spin_number}**  {COLOR_ICONS[spin_color]}")
+    animation = animations.animate(msg)
+    for _ in range(SPIN_FRAMES - 1):
         spin_number, spin_color = random.choice(ROULETTE_NUMBERS)
-        if msg is None:
-            if spin_color == "green":
-                msg = await send_message(ctx, f"Spinning... "
-                                              f"**{spin_number}**  :green_square:")
-            elif spin_color == "red":
-                msg = await send_message(ctx, f"Spinning... "
-                                              f"**{spin_number}**  :red_square:")
-            elif spin_color == "black":
-                msg = await send_message(ctx, f"Spinning... "
-                                              f"**{spin_number}**  :black_large_square:")
-        else:
-            await msg.edit(content=f"Spinning... **{spin_number}** "
-                                   f"""{':red_square:' if spin_color == 'red'
-                                   else ':black_large_square:'}""")
-        await asyncio.sleep(0.5)
-    return msg
+        animation.frame(SPIN_DELAY,
+                        content=f"Spinning... **{spin_number}** {COLOR_ICONS[spin_color]}")
+    return animation
@@ -0,0 +1,158 @@
+"""
+Dieses Modul enthält den Scheduler für Animationen aus mehreren Nachrichten-Bearbeitungen.
+
+Eine Animation spielt ihre Frames zeitversetzt in einem eigenen Task ab, sodass das Spiel
+nicht blockiert. Würde ein Zwischen-Frame das Rate-Limit des Kanals überschreiten, wird
+er mit dem nächsten Frame zusammengefasst. Der letzte Frame wird nie übersprungen.
+Mit einem `GameRenderer` werden die Frames erst beim Abspielen auf die Änderungen
+gegenüber dem zuletzt zugestellten Stand reduziert.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from discord import HTTPException, Message
+
+# Discord erlaubt ungefähr 5 Bearbeitungen pro 5 Sekunden und Kanal
+EDIT_RATE = 5
+EDIT_PER = 5.0
+
+
+class RouteLimit:
+    """
+    Merkt sich die letzten Bearbeitungen eines Kanals, um dessen Rate-Limit einzuhalten.
+    """
+    def __init__(self, rate, per):
+        """
+        Args:
+            rate (int): Die Anzahl der erlaubten Bearbeitungen pro Zeitraum.
+            per (float): Der Zeitraum in Sekunden.
+        """
+        self.per = per
+        self.sent = deque(maxlen=rate)
+
+    def ready_at(self):
+        """
+        Returns:
+            float: Der Zeitpunkt (time.monotonic), ab dem die nächste Bearbeitung erlaubt ist.
+        """
+        if len(self.sent) < self.sent.maxlen:
+            return 0.0
+        return self.sent[0] + self.per
+
+    def hit(self):
+        """
+        Vermerkt eine Bearbeitung.
+        """
+        self.sent.append(time.monotonic())
+
+
+class Animation:
+    """
+    Eine Folge von Bearbeitungen einer Nachricht, die nacheinander abgespielt werden.
+    """
+    def __init__(self, message: Message, limit: RouteLimit, renderer=None):
+        """
+        Args:
+            message (Message): Die Nachricht, die bearbeitet wird.
+            limit (RouteLimit): Das Rate-Limit des Kanals der Nachricht.
+            renderer (GameRenderer | None): Reduziert die Frames auf die Änderungen und
+                merkt sich erst zugestellte Frames.
+        """
+        self.message = message
+        self.limit = limit
+        self.renderer = renderer
+        self.frames = deque()
+        self.due = time.monotonic()
+        self._task = None
+
+    def frame(self, delay=0.0, **changes):
+        """
+        Plant einen Zwischen-Frame, ohne auf ihn zu warten. Ein Frame ohne Änderungen
+        sendet nichts, hält aber seine Verzögerung ein.
+
+        Args:
+            delay (float): Sekunden nach dem vorherigen Frame.
+            **changes: Die Argumente für `Message.edit`.
+        """
+        self._schedule(delay, changes, False)
+
+    async def finish(self, delay=0.0, **changes):
+        """
+        Plant den letzten Frame und wartet, bis alle Frames abgespielt sind.
+
+        Args:
+            delay (float): Sekunden nach dem vorherigen Frame.
+            **changes: Die Argumente für `Message.edit`.
+        """
+        self._schedule(delay, changes, True)
+        await self._task
+
+    def _schedule(self, delay, changes, final):
+        """
+        Hängt einen Frame an und startet bei Bedarf den Task, der die Frames abspielt.
+        """
+        self.due = max(self.due, time.monotonic()) + delay
+        self.frames.append((self.due, changes, final))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        """
+        Spielt die geplanten Frames ab und fasst Zwischen-Frames zusammen,
+        die vor dem nächsten Frame nicht mehr gesendet werden dürften.
+        """
+        while self.frames:
+            due, changes, final = self.frames.popleft()
+            await asyncio.sleep(max(due - time.monotonic(), 0))
+            if self.renderer is not None:
+                changes = self.renderer.changes(**changes)
+            if not changes:
+                continue
+            if not final:
+                if self.frames and self.limit.ready_at() >= self.frames[0][0]:
+                    next_due, next_changes, next_final = self.frames.popleft()
+                    self.frames.appendleft((next_due, {**changes, **next_changes}, next_final))
+                    continue
+                await asyncio.sleep(max(self.limit.ready_at() - time.monotonic(), 0))
+            self.limit.hit()
+            try:
+                await self.message.edit(**changes)
+            except HTTPException as e:
+                if final:
+                    raise
+                logging.warning("Skipped an animation frame: %s", e)
+            else:
+                if self.renderer is not None:
+                    self.renderer.commit(changes)
+
+
+class AnimationScheduler:
+    """
+    Erstellt Animationen und teilt das Rate-Limit zwischen allen Animationen eines Kanals.
+    """
+    def __init__(self, rate=EDIT_RATE, per=EDIT_PER):
+        """
+        Args:
+            rate (int): Die Anzahl der erlaubten Bearbeitungen pro Zeitraum und Kanal.
+            per (float): Der Zeitraum in Sekunden.
+        """
+        self.rate = rate
+        self.per = per
+        self.routes = {}
+
+    def animate(self, message: Message, renderer=None):
+        """
+        Erstellt eine Animation für eine Nachricht.
+
+        Args:
+            message (Message): Die Nachricht, die bearbeitet wird.
+            renderer (GameRenderer | None): Der Renderer der Nachricht, falls vorhanden.
+
+        Returns:
+            Animation: Die Animation der Nachricht.
+        """
+        limit = self.routes.get(message.channel.id)
+        if limit is None:
+            limit = self.routes[message.channel.id] = RouteLimit(self.rate, self.per)
+        return Animation(message, limit, renderer)
@@ -0,0 +1,216 @@
+"""
+Dieses Modul enthält die Registry der laufenden Spielsitzungen.
+
+Jeder Benutzer kann zur selben Zeit nur in einer Sitzung sein. Sitzungen werden über
+einen asynchronen Kontextmanager belegt und auch bei Fehlern oder Abbrüchen wieder
+freigegeben. Sitzungen, die älter als ihre TTL sind, gelten als abgelaufen.
+"""
+import asyncio
+import time
+import weakref
+from collections import Counter
+from contextlib import asynccontextmanager
+
+
+class GameSession:
+    """
+    Eine laufende Spielsitzung eines oder mehrerer Benutzer.
+    """
+    __slots__ = ("game", "members", "started", "expires")
+
+    def __init__(self, game, ttl):
+        """
+        Args:
+            game (str): Der Name des Spiels.
+            ttl (float): Sekunden, nach denen die Sitzung abläuft.
+        """
+        self.game = game
+        self.members = []
+        self.started = time.monotonic()
+        self.expires = self.started + ttl
+
+    @property
+    def userids(self):
+        """
+        Returns:
+            list[int]: Die IDs der Benutzer der Sitzung.
+        """
+        return [userid for userid, _ in self.members]
+
+    @property
+    def age(self):
+        """
+        Returns:
+            float: Die Laufzeit der Sitzung in Sekunden.
+        """
+        return time.monotonic() - self.started
+
+
+class SessionRegistry:
+    """
+    Registry der laufenden Spielsitzungen, indiziert nach Benutzer-ID.
+
+    Jede Sitzung hält die asyncio-Locks ihrer Benutzer, sodass anderer Code mit
+    `async with registry.lock(userid)` warten kann, bis ein Benutzer frei ist.
+    """
+    def __init__(self, ttl=600.0):
+        """
+        Args:
+            ttl (float): Sekunden, nach denen eine Sitzung abläuft. Standardmäßig 600.
+        """
+        self.ttl = ttl
+        self.sessions = {}
+        self.locks = weakref.WeakValueDictionary()
+
+    def lock(self, userid):
+        """
+        Gibt das Lock eines Benutzers zurück. Es ist belegt, solange der Benutzer spielt.
+
+        Args:
+            userid (int | str): Die ID des Benutzers.
+
+        Returns:
+            asyncio.Lock: Das Lock des Benutzers.
+        """
+        userid = int(userid)
+        lock = self.locks.get(userid)
+        if lock is None:
+            lock = self.locks[userid] = asyncio.Lock()
+        return lock
+
+    def get(self, userid):
+        """
+        Gibt die laufende Sitzung eines Benutzers zurück und gibt abgelaufene Sitzungen frei.
+
+        Args:
+            userid (int | str): Die ID des Benutzers.
+
+        Returns:
+            GameSession | None: Die Sitzung oder None, wenn der Benutzer frei ist.
+        """
+        session = self.sessions.get(int(userid))
+        if session is not None and session.expires <= time.monotonic():
+            self.release(session)
+            return None
+        return session
+
+    def is_busy(self, userid):
+        """
+        Prüft, ob ein Benutzer gerade spielt.
+
+        Args:
+            userid (int | str): Die ID des Benutzers.
+
+        Returns:
+            bool: True, wenn der Benutzer in einer Sitzung ist.
+        """
+        return self.get(userid) is not None
+
+    async def claim(self, game, *userids):
+        """
+        Belegt eine neue Sitzung für alle angegebenen Benutzer, wenn keiner von ihnen
+        beschäftigt ist. Prüfen und Belegen geschieht ohne Unterbrechung.
+
+        Args:
+            game (str): Der Name des Spiels.
+            *userids (int | str): Die IDs der Benutzer.
+
+        Returns:
+            GameSession | None: Die Sitzung oder None, wenn ein Benutzer beschäftigt ist.
+        """
+        session = GameSession(game, self.ttl)
+        if not await self.join(session, *userids):
+            return None
+        return session
+
+    async def join(self, session, *userids):
+        """
+        Fügt einer laufenden Sitzung weitere Benutzer hinzu, z.B. das Opfer eines Raubs.
+
+        Args:
+            session (GameSession): Die Sitzung.
+            *userids (int | str): Die IDs der Benutzer.
+
+        Returns:
+            bool: True, wenn alle Benutzer frei waren und hinzugefügt wurden.
+        """
+        userids = list(dict.fromkeys(int(userid) for userid in userids))
+        if any(self.is_busy(userid) or self.lock(userid).locked() for userid in userids):
+            return False
+        for userid in userids:
+            # Ein freies Lock wird ohne Unterbrechung belegt, dazwischen läuft kein anderer Task
+            lock = self.lock(userid)
+            await lock.acquire()
+            session.members.append((userid, lock))
+            self.sessions[userid] = session
+        return True
+
+    def release(self, session):
+        """
+        Gibt eine Sitzung und die Locks ihrer Benutzer frei. Mehrfaches Freigeben ist erlaubt.
+
+        Args:
+            session (GameSession): Die Sitzung.
+        """
+        while session.members:
+            userid, lock = session.members.pop()
+            if self.sessions.get(userid) is session:
+                del self.sessions[userid]
+            lock.release()
+
+    @asynccontextmanager
+    async def session(self, game, *userids):
+        """
+        Belegt eine Sitzung für die Dauer des Blocks und gibt sie danach in jedem Fall frei.
+
+        Args:
+            game (str): Der Name des Spiels.
+            *userids (int | str): Die IDs der Benutzer.
+
+        Returns:
+            GameSession | None: Die Sitzung oder None, wenn ein Benutzer beschäftigt ist.
+        """
+        session = await self.claim(game, *userids)
+        try:
+            yield session
+        finally:
+            if session is not None:
+                self.release(session)
+
+    def expire(self):
+        """
+        Gibt alle abgelaufenen Sitzungen frei.
+        """
+        now = time.monotonic()
+        for session in {id(session): session for session in self.sessions.values()
+                        if session.expires <= now}.values():
+            self.release(session)
+
+    def active(self):
+        """
+        Returns:
+            list[GameSession]: Alle laufenden Sitzungen, jede nur einmal.
+        """
+        self.expire()
+        return list({id(session): session for session in self.sessions.values()}.values())
+
+    def active_count(self):
+        """
+        Returns:
+            int: Die Anzahl der laufenden Sitzungen.
+        """
+        return len(self.active())
+
+    def per_game(self):
+        """
+        Returns:
+            Counter: Die Anzahl der laufenden Sitzungen pro Spiel.
+        """
+        return Counter(session.game for session in self.active())
+
+    def oldest(self):
+        """
+        Returns:
+            GameSession | None: Die älteste laufende Sitzung oder None.
+        """
+        return min(self.active(), key=lambda session: session.started, default=None)
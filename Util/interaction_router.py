@@ -0,0 +1,119 @@
+"""
+Dieses Modul enthält den Router für Button-Interaktionen und Nachrichten.
+
+Statt für jedes laufende Spiel `bot.wait_for` mit einer Prüf-Funktion aufzurufen, die
+bei jedem Ereignis für alle Spiele ausgeführt wird, registrieren Sitzungen ihre
+`custom_id`s bzw. ihren Kanal. Eingehende Ereignisse werden über ein Dictionary direkt
+in die Warteschlange der zugehörigen Sitzung gelegt.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from discord import Interaction, InteractionType, Message
+
+
+class InteractionRouter:
+    """
+    Ordnet Button-Interaktionen über ihre `custom_id` und Nachrichten über Kanal und
+    Autor der Warteschlange der Sitzung zu, die sie erwartet.
+    """
+    def __init__(self):
+        self.interactions = {}
+        self.messages = {}
+
+    def register(self, userid, *custom_ids):
+        """
+        Registriert die `custom_id`s einer Sitzung. Nur Klicks des Benutzers werden zugestellt.
+
+        Args:
+            userid (int | str): Die ID des Benutzers, dem die Buttons gehören.
+            *custom_ids (str): Die `custom_id`s der Buttons.
+
+        Returns:
+            asyncio.Queue: Die Warteschlange, in die die Interaktionen gelegt werden.
+        """
+        queue = asyncio.Queue()
+        for custom_id in custom_ids:
+            self.interactions[custom_id] = (int(userid), queue)
+        return queue
+
+    def unregister(self, *custom_ids):
+        """
+        Entfernt die `custom_id`s einer Sitzung.
+
+        Args:
+            *custom_ids (str): Die `custom_id`s der Buttons.
+        """
+        for custom_id in custom_ids:
+            self.interactions.pop(custom_id, None)
+
+    @asynccontextmanager
+    async def buttons(self, userid, *custom_ids):
+        """
+        Registriert die `custom_id`s für die Dauer des Blocks.
+
+        Args:
+            userid (int | str): Die ID des Benutzers, dem die Buttons gehören.
+            *custom_ids (str): Die `custom_id`s der Buttons.
+
+        Returns:
+            asyncio.Queue: Die Warteschlange, in die die Interaktionen gelegt werden.
+        """
+        queue = self.register(userid, *custom_ids)
+        try:
+            yield queue
+        finally:
+            self.unregister(*custom_ids)
+
+    def dispatch(self, interaction: Interaction):
+        """
+        Legt eine Button-Interaktion in die Warteschlange der Sitzung, der ihre `custom_id` gehört.
+
+        Args:
+            interaction (Interaction): Die eingehende Interaktion.
+
+        Returns:
+            bool: True, wenn die Interaktion zugestellt wurde.
+        """
+        if interaction.type != InteractionType.component or not interaction.data:
+            return False
+        route = self.interactions.get(interaction.data.get("custom_id"))
+        if route is None or route[0] != interaction.user.id:
+            return False
+        route[1].put_nowait(interaction)
+        return True
+
+    @asynccontextmanager
+    async def conversation(self, channel, userid):
+        """
+        Stellt für die Dauer des Blocks die Nachrichten eines Benutzers in einem Kanal zu.
+
+        Args:
+            channel (int): Die ID des Kanals.
+            userid (int | str): Die ID des Benutzers.
+
+        Returns:
+            asyncio.Queue: Die Warteschlange, in die die Nachrichten gelegt werden.
+        """
+        key = (channel, int(userid))
+        queue = self.messages[key] = asyncio.Queue()
+        try:
+            yield queue
+        finally:
+            if self.messages.get(key) is queue:
+                del self.messages[key]
+
+    def dispatch_message(self, message: Message):
+        """
+        Legt eine Nachricht in die Warteschlange der Unterhaltung ihres Kanals und Autors.
+
+        Args:
+            message (Message): Die eingehende Nachricht.
+
+        Returns:
+            bool: True, wenn die Nachricht zugestellt wurde.
+        """
+        queue = self.messages.get((message.channel.id, message.author.id))
+        if queue is None:
+            return False
+        queue.put_nowait(message)
+        return True
@@ -0,0 +1,169 @@
+"""
+Dieses Modul enthält die Antwort-Strategie für Interaktionen.
+
+Discord erwartet die erste Antwort auf eine Interaktion innerhalb von drei Sekunden.
+Statt jede Interaktion sofort zurückzustellen (`defer`) und danach eine Folgenachricht zu
+senden, wird direkt mit `response.send_message` geantwortet. Nur wenn bis kurz vor Ablauf
+der Frist keine Antwort gesendet wurde, wird die Interaktion automatisch zurückgestellt.
+Endet ein zurückgestellter Befehl ohne Antwort, räumt `release` den Zustand wieder auf.
+"""
+import asyncio
+import logging
+import time
+from discord import HTTPException, Interaction, InteractionResponded, InteractionType, Object, \
+    utils
+
+# Frist von Discord für die erste Antwort in Sekunden
+RESPONSE_WINDOW = 3.0
+
+
+class OriginalResponse:
+    """
+    Die direkte Antwort auf eine Interaktion. Sie wird wie eine Nachricht über den
+    Webhook der Interaktion bearbeitet, ohne sie vorher abzurufen.
+    """
+    def __init__(self, interaction: Interaction):
+        """
+        Args:
+            interaction (Interaction): Die beantwortete Interaktion.
+        """
+        self.interaction = interaction
+
+    @property
+    def channel(self):
+        """
+        Returns:
+            Der Kanal der Antwort.
+        """
+        return self.interaction.channel or Object(id=self.interaction.channel_id)
+
+    async def edit(self, **kwargs):
+        """
+        Bearbeitet die Antwort.
+
+        Args:
+            **kwargs: Die Argumente für `Interaction.edit_original_response`.
+
+        Returns:
+            InteractionMessage: Die bearbeitete Nachricht.
+        """
+        return await self.interaction.edit_original_response(**kwargs)
+
+    async def delete(self):
+        """
+        Löscht die Antwort.
+        """
+        await self.interaction.delete_original_response()
+
+
+class ResponsePolicy:
+    """
+    Merkt sich, welche Interaktionen noch unbeantwortet sind, und stellt sie zurück,
+    wenn die Antwort voraussichtlich nicht mehr rechtzeitig gesendet werden kann.
+    """
+    def __init__(self, window=RESPONSE_WINDOW, margin=0.5, latency=0.3):
+        """
+        Args:
+            window (float): Die Frist für die erste Antwort in Sekunden.
+            margin (float): Sicherheitsabstand zur Frist in Sekunden.
+            latency (float): Anfangsschätzung der Dauer einer Antwort in Sekunden.
+        """
+        self.window = window
+        self.margin = margin
+        self.latency = latency
+        self.pending = {}
+        # Zurückgestellte Interaktionen, auf die noch keine Folgenachricht gesendet wurde
+        self.deferred = set()
+
+    def arm(self, interaction: Interaction):
+        """
+        Plant das Zurückstellen eines Befehls für den Zeitpunkt, ab dem eine direkte
+        Antwort die Frist voraussichtlich verpassen würde.
+
+        Args:
+            interaction (Interaction): Die eingehende Interaktion.
+        """
+        if interaction.type != InteractionType.application_command:
+            return
+        elapsed = max((utils.utcnow() - interaction.created_at).total_seconds(), 0.0)
+        delay = max(self.window - self.margin - self.latency - elapsed, 0.0)
+        self.pending[interaction.id] = asyncio.get_running_loop().call_later(
+            delay, self._expire, interaction)
+
+    def _expire(self, interaction: Interaction):
+        """
+        Startet das Zurückstellen einer noch unbeantworteten Interaktion.
+        """
+        self.pending[interaction.id] = asyncio.create_task(self._defer(interaction))
+
+    async def _defer(self, interaction: Interaction):
+        """
+        Stellt eine Interaktion zurück, wenn sie noch nicht beantwortet wurde.
+        """
+        try:
+            if not interaction.response.is_done():
+                await interaction.response.defer()
+                self.deferred.add(interaction.id)
+        except (InteractionResponded, HTTPException) as e:
+            logging.debug("Deferring interaction %s failed: %s", interaction.id, e)
+        finally:
+            if self.pending.get(interaction.id) is asyncio.current_task():
+                del self.pending[interaction.id]
+
+    async def send(self, interaction: Interaction, **kwargs):
+        """
+        Sendet eine Nachricht als direkte Antwort oder, wenn die Interaktion schon
+        beantwortet oder zurückgestellt wurde, als Folgenachricht.
+
+        Args:
+            interaction (Interaction): Die Interaktion.
+            **kwargs: content, embed, view und ephemeral der Nachricht.
+
+        Returns:
+            OriginalResponse | WebhookMessage: Die gesendete Nachricht.
+        """
+        await self._disarm(interaction)
+        if interaction.response.is_done():
+            message = await interaction.followup.send(**kwargs)
+            self.deferred.discard(interaction.id)
+            return message
+        started = time.perf_counter()
+        await interaction.response.send_message(**kwargs)
+        self.latency = 0.8 * self.latency + 0.2 * (time.perf_counter() - started)
+        return OriginalResponse(interaction)
+
+    async def release(self, interaction: Interaction, content: str = None):
+        """
+        Beendet die Überwachung eines Befehls, nachdem er abgeschlossen oder
+        fehlgeschlagen ist. Ist der Befehl ohne Antwort geblieben, wird `content` gesendet.
+        Ohne `content` wird ein zurückgestellter Zustand ("Bot denkt nach…") gelöscht,
+        damit er nicht dauerhaft stehen bleibt.
+
+        Args:
+            interaction (Interaction): Die Interaktion des Befehls.
+            content (str): Die Nachricht für einen Befehl ohne Antwort, z.B. ein Fehler.
+        """
+        await self._disarm(interaction)
+        try:
+            if not interaction.response.is_done():
+                if content:
+                    await interaction.response.send_message(content, ephemeral=True)
+            elif interaction.id in self.deferred:
+                if content:
+                    await interaction.followup.send(content)
+                else:
+                    await interaction.delete_original_response()
+        except HTTPException as e:
+            logging.debug("Releasing interaction %s failed: %s", interaction.id, e)
+        finally:
+            self.deferred.discard(interaction.id)
+
+    async def _disarm(self, interaction: Interaction):
+        """
+        Bricht das geplante Zurückstellen ab oder wartet auf ein bereits laufendes.
+        """
+        pending = self.pending.pop(interaction.id, None)
+        if isinstance(pending, asyncio.TimerHandle):
+            pending.cancel()
+        elif pending is not None:
+            await pending
@@ -1,38 +1,36 @@
 import asyncio
-import json
-from http.client import HTTPException
 from discord import Interaction, Member, Embed, Colour, ui
 from discord.ext.commands import Context
 from Database.db_access import DbController
-from Util.variables import botRole, currentlyGaming, OWNER
-from config_loader import Loader
+from Util.variables import response_policy
+from config_loader import config
 
 db = DbController()
+# Basis-Embed der Auswahlmenüs, wird beim ersten Öffnen eines Menüs erstellt
+select_embed_cache = {"embed": None}
 
 #region Utility
-def load_config(name):
-    with open("jsons/config.json") as f:
-        json_file = json.load(f)
-    try:
-        json_file["embed"]["embeds_footerpic"] = OWNER.avatar
-    except KeyError:
-        pass
-    return json_file[name]
+@config.subscribe
+def invalidate_select_embed(old, new):
+    if old.embed != new.embed:
+        select_embed_cache["embed"] = None
 
 
 def check_admin(ctx: Context | Interaction):
-    if botRole in [y.name.lower() for y in return_author(ctx).roles]:
+    if config.current.bot_role in [y.name.lower() for y in return_author(ctx).roles]:
         return True
     return False
 
 
 def create_select_embed(user):
-    embed = Embed(title="Eine kleine Hilfe zu den alias Commands",
-                          colour=Colour(0x0446b0),
-                          description="hier erfährst du mehr zu "
-                                      "den einzelnen alias Commands")
-    loaded_config = Loader(user).load_config("embed")
-    embed.set_thumbnail(url=loaded_config["embeds_thumbnail"])
+    if select_embed_cache["embed"] is None:
+        embed = Embed(title="Eine kleine Hilfe zu den alias Commands",
+                      colour=Colour(0x0446b0),
+                      description="hier erfährst du mehr zu "
+                                  "den einzelnen alias Commands")
+        embed.set_thumbnail(url=config.current.embed.thumbnail)
+        select_embed_cache["embed"] = embed
+    embed = select_embed_cache["embed"].copy()
     embed.set_footer(text="Asked by " + user.name,
                      icon_url=user.avatar)
     return embed
@@ -50,18 +48,12 @@ async def send_message(ctx: Context | Interaction, msg: str = None, view: ui.Vie
         return await ctx.channel.send(content=msg, embed=embed,
                                       view=view)
     if isinstance(ctx, Interaction):
-        try:
-            await ctx.response.defer()
-        except HTTPException:
-            pass
+        kwargs = {"content": msg, "embed": embed}
         if view is not None:
-            if ephemeral:
-                return await ctx.followup.send(content=msg, embed=embed,
-                                               view=view, ephemeral=ephemeral)
-            return await ctx.followup.send(content=msg, embed=embed, view=view)
+            kwargs["view"] = view
         if ephemeral:
-            return await ctx.followup.send(content=msg, embed=embed, ephemeral=ephemeral)
-        return await ctx.followup.send(content=msg, embed=embed)
+            kwargs["ephemeral"] = ephemeral
+        return await response_policy.send(ctx, **kwargs)
 
 
 def return_author(ctx: Context | Interaction):
@@ -85,8 +77,9 @@ async def execute_gaming_with_timeout(ctx: Context | Interaction, befehl,
         else:
             await asyncio.wait_for(befehl(ctx, param_one, param_two), timeout=300)
     except asyncio.TimeoutError:
-        currentlyGaming.remove(str(return_author(ctx).id))
         await send_message(ctx, "Du hast zu lange gebraucht. Deine Runde endet.")
+    finally:
+        await db.refund_open_bets(return_author(ctx).id)
 
 async def get_money_for_user(user: Member):
     money_user = await db.get_money_for_user(user.id)
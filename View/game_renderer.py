@@ -0,0 +1,118 @@
+"""
+Dieses Modul enthält die Definition der `GameRenderer`-Klasse,
+die nur die tatsächlich geänderten Teile einer Spielnachricht sendet.
+"""
+import discord
+from discord.ui import View
+from discord.utils import MISSING
+
+
+def view_state(view: View | None) -> tuple:
+    """
+    Describe the visible state of a view.
+
+    :param view: The view or None.
+    :return: A tuple describing every item, an empty tuple for no view.
+    """
+    if view is None:
+        return ()
+    return tuple((type(item).__name__, getattr(item, "custom_id", None),
+                  getattr(item, "label", None), str(getattr(item, "style", None)),
+                  getattr(item, "disabled", None))
+                 for item in view.children)
+
+
+class GameRenderer:
+    """
+    Keeps the last delivered embed and view of a game message and reduces every update
+    to the parts that changed. The state is only stored once an update reached Discord,
+    so a failed edit is sent again with the next one.
+    """
+
+    def __init__(self):
+        """
+        Initialize the renderer of a message that was not sent yet.
+        """
+        self.embed = None
+        self.view = None
+        # The latest requested embed and view, they differ from the above until delivered
+        self.wanted = {}
+
+    def changes(self, embed: discord.Embed = None, view: View | None = MISSING) -> dict:
+        """
+        Compute the minimal update from the last delivered to the requested state.
+        Parts of earlier requests that were never delivered are included again.
+
+        :param embed: The embed to show, None keeps the current one.
+        :param view: The view to show, None removes the current one, omitted keeps it.
+        :return: The keyword arguments for `send`/`edit`, empty if nothing changed.
+        """
+        if embed is not None:
+            self.wanted["embed"] = embed
+        if view is not MISSING:
+            self.wanted["view"] = view
+        update = {}
+        if "embed" in self.wanted and self.wanted["embed"].to_dict() != self.embed:
+            update["embed"] = self.wanted["embed"]
+        if "view" in self.wanted and view_state(self.wanted["view"]) != self.view:
+            update["view"] = self.wanted["view"]
+        return update
+
+    def commit(self, update: dict):
+        """
+        Remember an update as delivered.
+
+        :param update: The keyword arguments returned by `changes`.
+        """
+        if "embed" in update:
+            self.embed = update["embed"].to_dict()
+        if "view" in update:
+            self.view = view_state(update["view"])
+
+    async def edit(self, message: discord.Message, **payload):
+        """
+        Edit a message, skipping the request if nothing changed.
+
+        :param message: The message to edit.
+        :param payload: The embed and view to show.
+        """
+        update = self.changes(**payload)
+        if update:
+            await message.edit(**update)
+            self.commit(update)
+
+    async def respond(self, interaction: discord.Interaction, **payload):
+        """
+        Answer a button click by editing its message. If nothing changed the click
+        is only acknowledged, as every interaction has to be answered.
+
+        :param interaction: The interaction to answer.
+        :param payload: The embed and view to show.
+        """
+        update = self.changes(**payload)
+        if update:
+            await interaction.response.edit_message(**update)
+            self.commit(update)
+        else:
+            await interaction.response.defer()
+
+    def frame(self, animation, delay=0.0, **payload):
+        """
+        Schedule an animation frame. The animation reduces it to the changed parts
+        when it is played, a frame without changes still keeps its delay.
+
+        :param animation: The animation of the message, created with this renderer.
+        :param delay: Seconds after the previous frame.
+        :param payload: The embed and view to show.
+        """
+        animation.frame(delay, **payload)
+
+    async def finish(self, animation, delay=0.0, **payload):
+        """
+        Schedule the last frame and wait until the animation is played.
+
+        :param animation: The animation of the message, created with this renderer.
+        :param delay: Seconds after the previous frame.
+        :param payload: The embed and view to show.
+        """
+        await animation.finish(delay, **payload)
@@ -1,53 +1,270 @@
 """
 config_loader.py
-This module contains the Loader class
-which is responsible for loading and modifying configuration files.
+This module contains the ConfigService which parses jsons/config.json once into an
+immutable Config object and reloads it when the file changes.
 """
 
+import asyncio
 import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
 
-class Loader:
+CONFIG_PATH = "jsons/config.json"
+
+
+def freeze(value):
+    """
+    Converts parsed JSON into read-only containers.
+
+    Parameters
+    ----------
+    value : object
+        A value parsed by json.load.
+
+    Returns
+    -------
+    object
+        Dicts as MappingProxyType and lists as tuples, all other values unchanged.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+@dataclass(frozen=True)
+class EmbedConfig:
+    """
+    The "embed" section of the configuration.
+    """
+    thumbnail: str
+    footer_text: str
+
+
+@dataclass(frozen=True)
+class Config:
     """
-    A class used to load and modify configuration files.
+    An immutable snapshot of jsons/config.json.
 
     Attributes
     ----------
-    owner : object
-        The owner object which contains the avatar attribute.
+    stream_url : str
+        The URL shown as the streaming status.
+    invite_link : str
+        The invite link of the support server.
+    bot_role : str
+        The name of the role allowed to run admin commands.
+    owner_id : int | None
+        The ID of the owner of the bot.
+    embed : EmbedConfig
+        The settings shared by all embeds.
+    sections : MappingProxyType
+        The whole file as read-only mappings.
+    mtime : int
+        The modification time of the file in nanoseconds.
+    """
+    stream_url: str
+    invite_link: str
+    bot_role: str
+    owner_id: int | None
+    embed: EmbedConfig
+    sections: MappingProxyType
+    mtime: int
+
+    @classmethod
+    def parse(cls, raw, mtime):
+        """
+        Builds a Config from the parsed file.
+
+        Parameters
+        ----------
+        raw : dict
+            The parsed content of the file.
+        mtime : int
+            The modification time of the file in nanoseconds.
+
+        Returns
+        -------
+        Config
+            The new configuration.
+
+        Raises
+        ------
+        KeyError
+            If a required setting is missing.
+        """
+        embed = raw.get("embed", {})
+        return cls(stream_url=raw["streamURL"],
+                   invite_link=raw["inviteLink"],
+                   bot_role=raw["botrole"],
+                   owner_id=raw.get("ownerId"),
+                   embed=EmbedConfig(thumbnail=embed.get("embeds_thumbnail"),
+                                     footer_text=embed.get("embeds_footertext")),
+                   sections=freeze(raw),
+                   mtime=mtime)
+
+
+class ConfigService:
+    """
+    Holds the current Config and replaces it when the file changes.
+
+    The modification time of the file is checked at most once per check interval
+    when the configuration is read, and by the optional watch task. A changed file is
+    parsed completely before it replaces the current Config, a file that fails to
+    parse is logged and the previous Config stays in use.
 
     Methods
     -------
-    load_config(name)
-        Loads the configuration file and modifies it with the owner's avatar.
+    current
+        The current Config, reloaded first if the file changed.
+    section(name)
+        A read-only section of the current Config.
+    subscribe(callback)
+        Calls callback(old, new) after every reload.
+    start(interval)
+        Starts a task that checks the file periodically, so subscribers react without a read.
     """
 
-    def __init__(self, owner):
+    def __init__(self, path=CONFIG_PATH, check_interval=1.0):
         """
         Parameters
         ----------
-        owner : object
-            The owner object which contains the avatar attribute.
+        path : str
+            The path of the configuration file.
+        check_interval : float
+            Seconds between two checks of the modification time.
+        """
+        self.path = path
+        self.check_interval = check_interval
+        self.subscribers = []
+        self._config = None
+        self._checked = 0.0
+        # Modification time of the last file that failed to load, -1 if none did
+        self._failed_mtime = -1
+        self._task = None
+
+    @property
+    def current(self):
         """
-        self.owner = owner
+        Returns
+        -------
+        Config
+            The current configuration.
 
-    def load_config(self, name):
+        Raises
+        ------
+        OSError, json.JSONDecodeError, KeyError
+            If the file cannot be loaded the first time.
         """
-        Loads the configuration file and modifies it with the owner's avatar.
+        if self._config is None or time.monotonic() - self._checked >= self.check_interval:
+            self.refresh()
+        return self._config
 
+    def section(self, name):
+        """
         Parameters
         ----------
         name : str
-            The name of the configuration to be loaded.
+            The name of a top-level setting.
 
         Returns
         -------
-        dict
-            The modified configuration dictionary.
+        object
+            The read-only value of the setting.
         """
-        with open("jsons/config.json") as f:
-            json_file = json.load(f)
+        return self.current.sections[name]
+
+    def subscribe(self, callback):
+        """
+        Registers a function that is called with the old and new Config after a reload.
+
+        Parameters
+        ----------
+        callback : callable
+            The function to call.
+
+        Returns
+        -------
+        callable
+            The function, so this can be used as a decorator.
+        """
+        self.subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        """
+        Parameters
+        ----------
+        callback : callable
+            A function registered with subscribe.
+        """
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def refresh(self):
+        """
+        Reloads the file if its modification time changed.
+
+        Returns
+        -------
+        bool
+            True if a new Config was loaded.
+        """
+        self._checked = time.monotonic()
+        mtime = None
         try:
-            json_file["embed"]["embeds_footerpic"] = self.owner.avatar
-        except:
-            pass
-        return json_file[name]
+            mtime = os.stat(self.path).st_mtime_ns
+            if self._config is not None and mtime in (self._config.mtime, self._failed_mtime):
+                return False
+            with open(self.path, encoding="utf-8") as f:
+                loaded = Config.parse(json.load(f), mtime)
+        except (OSError, ValueError, KeyError, AttributeError) as e:
+            if self._config is None:
+                raise
+            if mtime != self._failed_mtime:
+                logging.error("Reloading %s failed, keeping the previous config: %s",
+                              self.path, e)
+            self._failed_mtime = mtime
+            return False
+        old, self._config = self._config, loaded
+        if old is not None:
+            logging.info("Reloaded %s", self.path)
+            for callback in list(self.subscribers):
+                try:
+                    callback(old, loaded)
+                except Exception as e:
+                    logging.error("Config subscriber %s failed: %s", callback, e)
+        return True
+
+    def start(self, interval=None):
+        """
+        Starts the task checking the file, unless it is already running.
+
+        Parameters
+        ----------
+        interval : float
+            Seconds between two checks, defaults to the check interval.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._watch(interval or self.check_interval))
+
+    async def _watch(self, interval):
+        """
+        Checks the file every interval until cancelled.
+
+        Parameters
+        ----------
+        interval : float
+            Seconds between two checks.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            self.refresh()
+
+
+config = ConfigService()
+
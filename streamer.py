@@ -19,6 +19,9 @@ Konstanten:
 
 Funktionen:
 - on_ready: Wird aufgerufen, wenn der Bot bereit ist.
+- route_interaction: Überwacht die Antwortfrist von Slash-Befehlen und stellt Button-Klicks
+  dem laufenden Spiel zu.
+- route_message: Stellt Nachrichten einer laufenden Unterhaltung zu.
 - on_command_error: Wird aufgerufen, wenn ein Fehler bei der Befehlsausführung auftritt.
 - clear_commands: Löscht alle Befehle aus dem Befehlsbaum.
 - load_commands: Synchronisiert die Befehle mit dem Befehlsbaum.
@@ -26,6 +29,14 @@ Funktionen:
 - _shutdown: Fährt den Bot herunter.
 - _reset: Setzt den Status des Bots zurück.
 - _setStatus: Setzt den Status des Bots.
+- _dbStats: Zeigt die Latenzen der Datenbankabfragen an.
+- _sessions: Zeigt die laufenden Spielsitzungen an.
+- _export: Exportiert die Wirtschaftstabellen.
+- _import: Importiert eine exportierte Datei.
+- _scale: Multipliziert alle Kontostände über einer Grenze mit einem Faktor.
+- _cap: Begrenzt alle Kontostände auf eine Obergrenze.
+- _bonus: Schreibt allen Mitgliedern einer Rolle einen Betrag gut.
+- _resetStreaks: Setzt alle Daily-Streaks zurück.
 - _help: Zeigt das Hilfemenü an.
 - _rules: Zeigt die Regeln an.
 - _aliases: Zeigt die Aliasliste der Befehle an.
@@ -36,6 +47,7 @@ Funktionen:
 - _daily: Führt den täglichen Befehl aus.
 - _send: Sendet Geld an einen anderen Benutzer.
 - _money: Zeigt das Geld eines Benutzers an.
+- _history: Zeigt die Kontobewegungen eines Benutzers an.
 - _robbing: Führt den Raubbefehl aus.
 - _blackjack: Spielt eine Runde Blackjack.
 - _roulette: Spielt eine Runde Roulette.
@@ -51,6 +63,7 @@ Funktionen:
 - daily: Führt den täglichen Befehl aus.
 - send: Sendet Geld an einen anderen Benutzer.
 - money: Zeigt das Geld eines Benutzers an.
+- history: Zeigt die Kontobewegungen eines Benutzers an.
 - blackjack: Spielt eine Runde Blackjack.
 - roulette: Spielt eine Runde Roulette.
 - higher_lower: Spielt eine Runde Higher/Lower.
@@ -59,25 +72,30 @@ Funktionen:
 - qotd: Gibt das Zitat des Tages aus.
 """
 import os
+import asyncio
 import logging
 
-from discord import Streaming, Member
+import discord
+from discord import Streaming, Member, Role, Message
 from discord import app_commands, Interaction
-from discord.app_commands import CommandInvokeError, CommandOnCooldown
+from discord.app_commands import AppCommandError, CommandInvokeError, CommandOnCooldown
 from discord.ext.commands import Context, is_owner, BadArgument, MissingRequiredArgument, \
     CheckFailure, NotOwner
 from Commands.admin_commands import (set_money_command, shutdown_command, reset_status_command,
-                                     set_status_command)
+                                     set_status_command, db_stats_command, export_command,
+                                     import_command, scale_money_command, cap_money_command,
+                                     role_bonus_command, reset_streaks_command,
+                                     sessions_command)
 from Commands.game_commands import (scoreboard_command, daily_command, send_command, money_command,
-                                    rob_command, blackjack_command,
+                                    history_command, rob_command, blackjack_command,
                                     roulette_command, higher_lower_command)
 from Commands.main_commands import (help_command, rules_command, alias_command, ping_command,
                                     invite_command, stream_command)
 from Commands.social_commands import anime_quote, qotd_command
 from Util import variables
-from Util.variables import streamURL
+from config_loader import config
 from Util.util_commands import db, execute_gaming_with_timeout, send_message
-from Util.variables import bot
+from Util.variables import bot, interaction_router, response_policy
 
 
 @bot.event
@@ -89,17 +107,83 @@ async def on_ready():
 
     Aktionen:
     - Initialisiert den Datenbank-Pool.
+    - Startet die Überwachung der Konfigurationsdatei.
     - Konfiguriert das Logging mit einem bestimmten Format und speichert die Logs in einer Datei.
     - Synchronisiert die Befehle des Bots.
     - Setzt den Besitzer des Bots.
     - Ändert die Präsenz des Bots zu einem Streaming-Status mit einem bestimmten Namen und URL.
     """
     await db.init_pool()
+    config.start()
     logging.basicConfig(level=logging.INFO,
                         format='%(asctime)s:%(levelname)s:%(message)s')
     await bot.tree.sync()
     logging.info("Sync gestartet (1h)")
-    await bot.change_presence(activity=Streaming(name=".help", url=streamURL))
+    await bot.change_presence(activity=Streaming(name=".help", url=config.current.stream_url))
+
+@bot.listen("on_interaction")
+async def route_interaction(interaction: Interaction):
+    """
+    Diese Funktion wird bei jeder Interaktion aufgerufen.
+
+    Parameter:
+    - interaction (Interaction): Die eingehende Interaktion.
+
+    Aktionen:
+    - Plant für Slash-Befehle das Zurückstellen, falls die Antwort zu lange dauert.
+    - Stellt Button-Klicks über ihre `custom_id` dem laufenden Spiel zu.
+    """
+    response_policy.arm(interaction)
+    interaction_router.dispatch(interaction)
+
+
+@bot.listen("on_message")
+async def route_message(message: Message):
+    """
+    Diese Funktion wird bei jeder Nachricht aufgerufen.
+
+    Parameter:
+    - message (Message): Die eingehende Nachricht.
+
+    Aktionen:
+    - Stellt die Nachricht einer laufenden Unterhaltung ihres Kanals und Autors zu.
+    """
+    if not message.author.bot:
+        interaction_router.dispatch_message(message)
+
+@bot.event
+async def on_app_command_completion(interaction: Interaction, command):
+    """
+    Diese Funktion wird aufgerufen, wenn ein Slash-Befehl abgeschlossen wurde.
+
+    Parameter:
+    - interaction (Interaction): Die Interaktion des Befehls.
+    - command (Command | ContextMenu): Der ausgeführte Befehl.
+
+    Aktionen:
+    - Beendet die Überwachung der Antwortfrist und löscht ein unbeantwortetes Zurückstellen.
+    """
+    await response_policy.release(interaction)
+
+
+@bot.tree.error
+async def on_app_command_error(interaction: Interaction, error: AppCommandError):
+    """
+    Diese Funktion wird aufgerufen, wenn ein Slash-Befehl fehlschlägt.
+
+    Parameter:
+    - interaction (Interaction): Die Interaktion des Befehls.
+    - error (AppCommandError): Der aufgetretene Fehler.
+
+    Aktionen:
+    - Protokolliert den Fehler.
+    - Sendet eine Fehlermeldung, falls der Befehl noch nicht geantwortet hat,
+      statt ein zurückgestelltes "Bot denkt nach…" stehen zu lassen.
+    """
+    logging.error("Error: %s (caused by %s)", error, interaction.user.global_name,
+                  exc_info=error)
+    await response_policy.release(interaction,
+                                  "Ein Fehler ist bei der Ausführung des Befehls aufgetreten")
 
 @bot.event
 async def on_command_error(ctx: Context, error):
@@ -231,6 +315,150 @@ async def set_status(ctx: Context | Interaction):
     await set_status_command(ctx)
 
 
+@bot.command(name="dbstats")
+@is_owner()
+async def db_stats(ctx: Context | Interaction, action: str = None):
+    """
+    Diese Funktion wird aufgerufen, um die Latenzen der Datenbankabfragen anzuzeigen.
+    Nur der Besitzer des Bots kann diesen Befehl ausführen.
+
+    Parameter:
+    - ctx (Context | Interaction): Der Kontext, in dem der Befehl ausgeführt wurde.
+    - action (str, optional): "reset" setzt die Statistiken zurück. Standardmäßig None.
+
+    Aktionen:
+    - Ruft die Funktion `db_stats_command` auf, um die Statistiken anzuzeigen.
+    """
+    await db_stats_command(ctx, action)
+
+
+@bot.command(name="sessions")
+@is_owner()
+async def sessions(ctx: Context | Interaction):
+    """
+    Diese Funktion wird aufgerufen, um die laufenden Spielsitzungen anzuzeigen.
+    Nur der Besitzer des Bots kann diesen Befehl ausführen.
+
+    Parameter:
+    - ctx (Context | Interaction): Der Kontext, in dem der Befehl ausgeführt wurde.
+
+    Aktionen:
+    - Ruft die Funktion `sessions_command` auf, um die Sitzungen anzuzeigen.
+    """
+    await sessions_command(ctx)
+
+
+@bot.command(name="export")
+@is_owner()
+async def export_economy(ctx: Context, fmt: str = "jsonl"):
+    """
+    Diese Funktion wird aufgerufen, um Geld, Dailys und Raubzeiten zu exportieren.
+    Nur der Besitzer des Bots kann diesen Befehl ausführen.
+
+    Parameter:
+    - ctx (Context): Der Kontext, in dem der Befehl ausgeführt wurde.
+    - fmt (str, optional): "csv" oder "jsonl". Standardmäßig "jsonl".
+
+    Aktionen:
+    - Ruft die Funktion `export_command` auf, um die Datei zu senden.
+    """
+    await export_command(ctx, fmt)
+
+
+@bot.command(name="import")
+@is_owner()
+async def import_economy(ctx: Context):
+    """
+    Diese Funktion wird aufgerufen, um eine exportierte Datei zu importieren.
+    Nur der Besitzer des Bots kann diesen Befehl ausführen.
+
+    Parameter:
+    - ctx (Context): Der Kontext, in dem der Befehl ausgeführt wurde.
+      Die Datei muss an die Nachricht angehängt sein.
+
+    Aktionen:
+    - Ruft die Funktion `import_command` auf, um die Datei zu importieren.
+    """
+    await import_command(ctx)
+
+
+@bot.command(name="scale")
+@is_owner()
+async def scale_money(ctx: Context, above: int, factor: float, confirm: str = None):
+    """
+    Diese Funktion wird aufgerufen, um alle Kontostände über einer Grenze mit einem
+    Faktor zu multiplizieren. Ohne "confirm" wird nur die Anzahl der Konten angezeigt.
+    Nur der Besitzer des Bots kann diesen Befehl ausführen.
+
+    Parameter:
+    - ctx (Context): Der Kontext, in dem der Befehl ausgeführt wurde.
+    - above (int): Nur Kontostände über diesem Wert werden geändert.
+    - factor (float): Der Faktor, z.B. 0.9 für eine Steuer von 10 Prozent.
+    - confirm (str, optional): "confirm" führt die Änderung aus.
+
+    Aktionen:
+    - Ruft die Funktion `scale_money_command` auf.
+    """
+    await scale_money_command(ctx, above, factor, confirm)
+
+
+@bot.command(name="cap")
+@is_owner()
+async def cap_money(ctx: Context, cap: int, confirm: str = None):
+    """
+    Diese Funktion wird aufgerufen, um alle Kontostände auf eine Obergrenze zu senken.
+    Ohne "confirm" wird nur die Anzahl der Konten angezeigt.
+    Nur der Besitzer des Bots kann diesen Befehl ausführen.
+
+    Parameter:
+    - ctx (Context): Der Kontext, in dem der Befehl ausgeführt wurde.
+    - cap (int): Der höchste erlaubte Kontostand.
+    - confirm (str, optional): "confirm" führt die Änderung aus.
+
+    Aktionen:
+    - Ruft die Funktion `cap_money_command` auf.
+    """
+    await cap_money_command(ctx, cap, confirm)
+
+
+@bot.command(name="bonus")
+@is_owner()
+async def role_bonus(ctx: Context, role: Role, amount: int, confirm: str = None):
+    """
+    Diese Funktion wird aufgerufen, um allen Mitgliedern einer Rolle einen Betrag
+    gutzuschreiben. Ohne "confirm" wird nur die Anzahl der Konten angezeigt.
+    Nur der Besitzer des Bots kann diesen Befehl ausführen.
+
+    Parameter:
+    - ctx (Context): Der Kontext, in dem der Befehl ausgeführt wurde.
+    - role (Role): Die Rolle, deren Mitglieder den Betrag erhalten.
+    - amount (int): Der Betrag, der gutgeschrieben wird.
+    - confirm (str, optional): "confirm" führt die Änderung aus.
+
+    Aktionen:
+    - Ruft die Funktion `role_bonus_command` auf.
+    """
+    await role_bonus_command(ctx, role, amount, confirm)
+
+
+@bot.command(name="resetstreaks")
+@is_owner()
+async def reset_streaks(ctx: Context, confirm: str = None):
+    """
+    Diese Funktion wird aufgerufen, um alle Daily-Streaks zurückzusetzen.
+    Ohne "confirm" wird nur die Anzahl der Konten angezeigt.
+    Nur der Besitzer des Bots kann diesen Befehl ausführen.
+
+    Parameter:
+    - ctx (Context): Der Kontext, in dem der Befehl ausgeführt wurde.
+    - confirm (str, optional): "confirm" führt die Änderung aus.
+
+    Aktionen:
+    - Ruft die Funktion `reset_streaks_command` auf.
+    """
+    await reset_streaks_command(ctx, confirm)
+
+
 @bot.tree.command(name="help", description="Gives you the Help-Menu")
 async def help_menu_slash(ctx: Context | Interaction):
     """
@@ -388,6 +616,23 @@ async def money(ctx: Context | Interaction, may_member: Member = None):
     """
     await money_command(ctx, may_member)
 
+@bot.command(name="history", aliases=["verlauf"])
+async def history(ctx: Context | Interaction, may_member: Member = None, before: int = None):
+    """
+    Diese Funktion wird aufgerufen, um die Kontobewegungen eines Benutzers anzuzeigen.
+
+    Parameter:
+    - ctx (Context | Interaction): Der Kontext, in dem der Befehl ausgeführt wurde.
+    - may_member (Member, optional): Der Benutzer, dessen Verlauf angezeigt werden soll.
+    Standardmäßig der Autor.
+    - before (int, optional): Die Nummer des letzten Eintrags der vorherigen Seite.
+    Standardmäßig None (neueste Einträge).
+
+    Aktionen:
+    - Ruft die Funktion `history_command` auf, um den Verlauf anzuzeigen.
+    """
+    await history_command(ctx, may_member, before)
+
 @bot.command(name="rob")
 async def robbing(ctx: Context | Interaction, may_member: Member = None):
     """
@@ -611,6 +856,28 @@ async def money_slash(ctx: Context | Interaction, may_member: Member = None):
     await money_command(ctx, may_member)
 
 
+@bot.tree.command(name="history", description="Zeigt die Kontobewegungen")
+@app_commands.describe(may_member="Person deren Verlauf du sehen möchtest",
+                       before="Nummer des letzten Eintrags der vorherigen Seite")
+@app_commands.rename(may_member="person", before="vor")
+async def history_slash(ctx: Context | Interaction, may_member: Member = None,
+                        before: int = None):
+    """
+    Diese Funktion wird aufgerufen, um die Kontobewegungen eines Benutzers anzuzeigen.
+
+    Parameter:
+    - ctx (Context | Interaction): Der Kontext, in dem der Befehl ausgeführt wurde.
+    - may_member (Member, optional): Der Benutzer, dessen Verlauf angezeigt werden soll.
+    Standardmäßig der Autor.
+    - before (int, optional): Die Nummer des letzten Eintrags der vorherigen Seite.
+    Standardmäßig None (neueste Einträge).
+
+    Aktionen:
+    - Ruft die Funktion `history_command` auf, um den Verlauf anzuzeigen.
+    """
+    await history_command(ctx, may_member, before)
+
+
 @bot.tree.command(name="blackjack", description="Play a game of blackjack")
 @app_commands.describe(bet="Wieviel du setzen möchtest")
 @app_commands.rename(bet="einsatz")
@@ -708,17 +975,29 @@ async def qotd_slash(ctx: Context | Interaction):
     await qotd_command(ctx)
 #endregion
 
+async def main():
+    """
+    Startet den Bot und fährt ihn beim Beenden sauber herunter.
+    Der Shutdown läuft noch in der Event-Loop des Bots, damit
+    zwischengespeicherte Kontostände sicher geschrieben werden.
+    """
+    try:
+        async with bot:
+            await bot.start(os.environ["token"])
+    finally:
+        if not variables.SHUTDOWN_INITIATED:
+            # Protokolliert, dass der Shutdown-Prozess gestartet wird
+            logging.info("Shutting down")
+            # Schreibt zwischengespeicherte Kontostände und schließt den Datenbank-Pool
+            await db.close_pool()
+            # Protokolliert, dass der Shutdown-Prozess abgeschlossen ist
+            logging.info("Shutdown complete")
+
 try:
-    bot.run(os.environ["token"])
+    discord.utils.setup_logging()
+    asyncio.run(main())
+except KeyboardInterrupt:
+    pass
 finally:
-    if not variables.SHUTDOWN_INITIATED:
-        # Protokolliert, dass der Shutdown-Prozess gestartet wird
-        logging.info("Shutting down")
-        # Schließt den Datenbank-Pool
-        db.close_pool()
-        # Schließt den Bot
-        bot.close()
-        # Protokolliert, dass der Shutdown-Prozess abgeschlossen ist
-        logging.info("Shutdown complete")
     # Beendet das Logging
     logging.shutdown()